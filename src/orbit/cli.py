@@ -186,7 +186,7 @@ def cmd_ingest_news_backfill(symbols=None, start_date=None, end_date=None, multi
         return 1
 
 
-def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None, reset=False):
+def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None, reset=False, concurrency=None):
     """CLI command for backfilling historical Reddit posts from Arctic Shift API.
     
     Args:
@@ -194,6 +194,7 @@ def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None,
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         reset: If True, re-fetch all dates; if False, skip already-ingested dates
+        concurrency: Fetches in flight under the shared rate limit (default: social_arctic.DEFAULT_CONCURRENCY)
     """
     from orbit.ingest import social_arctic
     from orbit import io
@@ -221,10 +222,12 @@ def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None,
     # Default subreddits
     if not subreddits:
         subreddits = social_arctic.DEFAULT_SUBREDDITS
+    if concurrency is None:
+        concurrency = social_arctic.DEFAULT_CONCURRENCY
 
     print(f"Subreddits: {', '.join(subreddits)}")
     print(f"Date range: {start_date} to {end_date}")
-    print(f"Target rate: {social_arctic.TARGET_RPS} requests/second")
+    print(f"Target rate: {social_arctic.TARGET_RPS} requests/second ({concurrency} in flight)")
     print()
 
     try:
@@ -236,6 +239,7 @@ def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None,
             data_dir=data_dir,
             resume=True,
             reset=reset,
+            concurrency=concurrency,
         )
 
         print(f"\n✓ Social backfill completed successfully!")
@@ -248,6 +252,66 @@ def cmd_ingest_social_backfill(subreddits=None, start_date=None, end_date=None,
         return 1
 
 
+def cmd_ingest_social_dump(paths=None, subreddits=None, start_date=None, end_date=None, workers=None):
+    """CLI command for ingesting Reddit submission dump files (.zst/.zst_blocks/.jsonl).
+
+    Args:
+        paths: Dump files and/or directories of dump files
+        subreddits: List of subreddits to keep
+        start_date: First date to keep (YYYY-MM-DD), optional
+        end_date: Last date to keep (YYYY-MM-DD), optional
+        workers: Worker processes (default: CPU count)
+    """
+    from orbit.ingest import social_arctic, social_dump
+    from orbit import io
+
+    print("Running social ingest from Reddit dump files...")
+
+    # Show data directory being used
+    data_dir = io.get_data_dir()
+    print(f"Data directory: {data_dir}")
+
+    # Warn if using default ./data location
+    if str(data_dir) == "data" or data_dir == Path("data"):
+        print("\n" + "="*70)
+        print("WARNING: Using default ./data directory")
+        print("For production, set ORBIT_DATA_DIR in your .env file:")
+        print("  echo 'ORBIT_DATA_DIR=/srv/orbit/data' >> .env")
+        print("="*70 + "\n")
+
+    # Default subreddits
+    if not subreddits:
+        subreddits = social_arctic.DEFAULT_SUBREDDITS
+
+    print(f"Subreddits: {', '.join(subreddits)}")
+    print(f"Date range: {start_date or 'all'} to {end_date or 'all'}")
+    print()
+
+    try:
+        result = social_dump.ingest_social_dumps(
+            paths=paths,
+            data_dir=data_dir,
+            subreddits=subreddits,
+            start_date=start_date,
+            end_date=end_date,
+            workers=workers,
+        )
+
+        print(f"\n✓ Social dump ingest completed successfully!")
+        print(f"  Run ID: {result['run_id']}")
+        return 0
+
+    except ImportError as e:
+        print(f"\n✗ Missing dependency: {e}", file=sys.stderr)
+        print("Install dump readers with: pip install -e '.[reddit]'", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"\n✗ Error during social dump ingest: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
 def cmd_ingest_local_sample():
     """Run ingestion on local sample data (M0 deliverable).
 
@@ -284,11 +348,12 @@ def cmd_ingest_local_sample():
         return 1
 
 
-def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_window_days=7, safety_lag_minutes=30, training=True):
+def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_window_days=7, safety_lag_minutes=30, training=True, hash_mode="fast", workers=1, force=False):
     """Run preprocessing pipeline (M1 deliverable).
 
     Applies cutoff enforcement, deduplication, and novelty scoring.
     Processes raw data from data/raw/ and writes to data/curated/.
+    Days that are up to date in the preprocess manifest are skipped unless force.
     """
     from orbit.preprocess import pipeline
     from orbit import io
@@ -314,6 +379,9 @@ def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_windo
     print(f"Reference window: {reference_window_days} days")
     print(f"Safety lag: {safety_lag_minutes} minutes")
     print(f"Training mode: {training}")
+    print(f"Simhash mode: {hash_mode}")
+    print(f"Workers: {workers}")
+    print(f"Mode: {'full (--force)' if force else 'incremental'}")
     print()
 
     try:
@@ -325,6 +393,9 @@ def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_windo
             reference_window_days=reference_window_days,
             safety_lag_minutes=safety_lag_minutes,
             training=training,
+            hash_mode=hash_mode,
+            workers=workers,
+            incremental=not force,
         )
 
         print(f"\n✓ Preprocessing completed successfully!")
@@ -333,6 +404,7 @@ def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_windo
         print(f"  Processed social days: {stats['processed_social']}")
         print(f"  Total news items: {stats['total_news_items']}")
         print(f"  Total social items: {stats['total_social_items']}")
+        print(f"  Up-to-date days skipped: news {stats['skipped_news']}, social {stats['skipped_social']}")
         return 0
 
     except Exception as e:
@@ -342,6 +414,44 @@ def cmd_preprocess(start_date=None, end_date=None, sources=None, reference_windo
         return 1
 
 
+def cmd_ops_compact(datasets=None, start_date=None, end_date=None, min_files=2, target_mb=128, watch=None):
+    """Compact small Parquet part files in raw date partitions.
+
+    Merges each partition into size-targeted files sorted by timestamp and
+    deduplicated by id. With watch, repeats every N seconds until interrupted.
+    """
+    from orbit.ops import compact
+    from orbit import io
+
+    datasets = datasets or ["news"]
+    print(f"Compacting: {', '.join(datasets)}")
+    print(f"Data directory: {io.get_data_dir()}")
+
+    options = dict(
+        start_date=start_date,
+        end_date=end_date,
+        target_file_mb=target_mb,
+        min_files=min_files,
+    )
+
+    try:
+        if watch:
+            print(f"Watching: every {watch}s (Ctrl+C to stop)")
+            compact.run_compaction_service(datasets, interval_seconds=watch, **options)
+            return 0
+
+        for dataset in datasets:
+            stats = compact.compact_dataset(dataset, **options)
+            print(f"\n✓ {dataset}: {stats['partitions_compacted']} partitions compacted "
+                  f"({stats['files_in']} → {stats['files_out']} files, "
+                  f"{stats['duplicates_dropped']} duplicates dropped)")
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Error during compaction: {e}", file=sys.stderr)
+        return 1
+
+
 def cmd_features_from_sample():
     """Build features from sample data (M0 deliverable).
 
@@ -390,6 +500,8 @@ def cmd_features_from_sample():
 
 def main(argv=None):
     """Main CLI entrypoint."""
+    from orbit.ingest import social_arctic
+
     argv = argv or sys.argv[1:]
 
     parser = argparse.ArgumentParser(
@@ -500,6 +612,43 @@ def main(argv=None):
         action="store_true",
         help="Re-fetch all dates (default: incremental - skip already-ingested dates)"
     )
+    social_backfill_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=social_arctic.DEFAULT_CONCURRENCY,
+        help=(f"Fetches in flight under the shared {social_arctic.TARGET_RPS} req/s limit "
+              f"(default: {social_arctic.DEFAULT_CONCURRENCY})")
+    )
+
+    # ingest social-dump subcommand
+    social_dump_parser = ingest_subparsers.add_parser(
+        "social-dump",
+        help="Ingest Reddit submission dumps (.zst/.zst_blocks/.jsonl) offline",
+        description="Bootstrap raw/social history from Pushshift/Arctic Shift dump files"
+    )
+    social_dump_parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Dump files or directories containing them"
+    )
+    social_dump_parser.add_argument(
+        "--subreddits",
+        nargs="+",
+        help="Subreddits to keep (default: stocks investing wallstreetbets)"
+    )
+    social_dump_parser.add_argument(
+        "--start",
+        help="First date to keep (YYYY-MM-DD, default: all)"
+    )
+    social_dump_parser.add_argument(
+        "--end",
+        help="Last date to keep (YYYY-MM-DD, default: all)"
+    )
+    social_dump_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: CPU count)"
+    )
 
     # ingest --local-sample flag (M0 backward compatibility)
     ingest_parser.add_argument(
@@ -547,6 +696,70 @@ def main(argv=None):
         action="store_true",
         help="Inference mode (no safety lag)"
     )
+    preprocess_parser.add_argument(
+        "--hash-mode",
+        choices=["fast", "sha256"],
+        default="fast",
+        help="Simhash token hash (default: fast; sha256 reproduces pre-batch hashes)"
+    )
+    preprocess_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for multi-day runs (default: 1, sequential)"
+    )
+    preprocess_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute every day, even those the manifest marks up to date"
+    )
+
+    # ops command with subcommands
+    ops_parser = subparsers.add_parser(
+        "ops",
+        help="Maintenance jobs",
+        description="Storage maintenance jobs"
+    )
+    ops_subparsers = ops_parser.add_subparsers(dest="op", help="Maintenance job")
+
+    compact_parser = ops_subparsers.add_parser(
+        "compact",
+        help="Merge small Parquet part files per date partition",
+        description="Merge part files into size-targeted files sorted by timestamp, deduplicated by id"
+    )
+    compact_parser.add_argument(
+        "--dataset",
+        nargs="+",
+        choices=["news", "social"],
+        default=["news"],
+        help="Raw datasets to compact (default: news)"
+    )
+    compact_parser.add_argument(
+        "--start",
+        help="First partition date (YYYY-MM-DD, default: all)"
+    )
+    compact_parser.add_argument(
+        "--end",
+        help="Last partition date (YYYY-MM-DD, default: all)"
+    )
+    compact_parser.add_argument(
+        "--min-files",
+        type=int,
+        default=2,
+        help="Only compact partitions with at least this many files (default: 2)"
+    )
+    compact_parser.add_argument(
+        "--target-mb",
+        type=float,
+        default=128,
+        help="Approximate size of each compacted file in MB (default: 128)"
+    )
+    compact_parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="Keep running, compacting every SECONDS (background service mode)"
+    )
 
     # features command
     features_parser = subparsers.add_parser(
@@ -589,13 +802,23 @@ def main(argv=None):
                 start_date=getattr(args, 'start', None),
                 end_date=getattr(args, 'end', None),
                 reset=getattr(args, 'reset', False),
+                concurrency=getattr(args, 'concurrency', None),
+            )
+        # ingest social-dump (offline history from Reddit dump files)
+        elif hasattr(args, 'source') and args.source == "social-dump":
+            return cmd_ingest_social_dump(
+                paths=args.paths,
+                subreddits=getattr(args, 'subreddits', None),
+                start_date=getattr(args, 'start', None),
+                end_date=getattr(args, 'end', None),
+                workers=getattr(args, 'workers', None),
             )
         # M0: ingest --local-sample (sample data)
         elif args.local_sample:
             return cmd_ingest_local_sample()
         else:
             ingest_parser.print_help()
-            print("\nAvailable sources: prices, news, news-backfill, social-backfill", file=sys.stderr)
+            print("\nAvailable sources: prices, news, news-backfill, social-backfill, social-dump", file=sys.stderr)
             print("Or use: orbit ingest --local-sample (M0 mode)", file=sys.stderr)
             return 1
 
@@ -608,8 +831,25 @@ def main(argv=None):
             reference_window_days=getattr(args, 'reference_window', 7),
             safety_lag_minutes=getattr(args, 'safety_lag', 30),
             training=not getattr(args, 'inference', False),
+            hash_mode=getattr(args, 'hash_mode', 'fast'),
+            workers=getattr(args, 'workers', 1),
+            force=getattr(args, 'force', False),
         )
 
+    elif args.command == "ops":
+        if getattr(args, 'op', None) == "compact":
+            return cmd_ops_compact(
+                datasets=args.dataset,
+                start_date=args.start,
+                end_date=args.end,
+                min_files=args.min_files,
+                target_mb=args.target_mb,
+                watch=args.watch,
+            )
+        else:
+            ops_parser.print_help()
+            return 1
+
     elif args.command == "features":
         if args.from_sample:
             return cmd_features_from_sample()
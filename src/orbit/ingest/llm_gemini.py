@@ -3,20 +3,35 @@
 Batch scores all news and social items using Gemini 2.5 Flash-Lite with multi-key rotation.
 Implements structured sentiment output: sent_llm, stance, sarcasm, certainty, toxicity.
 
+Items are packed into batches by estimated token count, then sent by an
+asyncio engine: `concurrency_per_key` workers per key pull batches from a
+shared queue and take keys from KeyRotationManager.acquire_async, which
+paces each key by its own sliding-window RPM/TPM budget, so throughput
+scales with the number of keys. Batches that fail
+because of their size or garbled output are bisected and retried. Results
+are reassembled in input order.
+
 Implements M1 deliverable: llm_batching_gemini
 """
 
+import asyncio
 import json
+import math
 import os
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional, Union
 
+import aiohttp
+import numpy as np
 import pandas as pd
 import requests
 
 from orbit import io as orbit_io
+from orbit.ingest.sentiment_cache import SENTIMENT_FIELDS, SentimentCache, cache_key, cache_path
+from orbit.preprocess import dedupe
 from orbit.utils.key_rotation import KeyRotationManager, RotationStrategy
 
 
@@ -24,18 +39,38 @@ from orbit.utils.key_rotation import KeyRotationManager, RotationStrategy
 GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
 DEFAULT_MODEL = "gemini-2.5-flash-lite"
 
+# Bump when the sentiment prompt changes (invalidates cached scores)
+PROMPT_VERSION = 1
 
-def build_sentiment_prompt(items: list[dict]) -> dict:
-    """Build Gemini prompt for batch sentiment analysis.
+# Per-key rate limits of gemini-2.5-flash-lite (free tier)
+DEFAULT_QUOTA_RPM = 15
+DEFAULT_QUOTA_TPM = 250_000
 
-    Args:
-        items: List of text items with fields: id, text, timestamp_utc, context
+# Times a request is moved to another key after a 429
+MAX_RATE_LIMIT_REQUEUES = 5
 
-    Returns:
-        Gemini API request payload
-    """
-    # System instruction
-    system_instruction = """You are a financial sentiment annotator. For each JSON line, read `text` (+ optional `context`). Output **one JSON object per line** with **only** the fields in the response schema. No prose, no extra keys.
+# Times a request is re-queued after a 5xx or network error, and the first backoff (doubles per retry)
+MAX_TRANSIENT_RETRIES = 2
+TRANSIENT_RETRY_BACKOFF = 1.0
+
+# Sentiment used for items whose batch could not be scored
+NEUTRAL_SENTIMENT = {
+    "sent_llm": 0.0,
+    "stance": "neutral",
+    "sarcasm": False,
+    "certainty": 0.0,
+    "toxicity": 0.0,
+}
+
+# Token budget of one request (input: prompt + items; output: one JSON object per item)
+DEFAULT_MAX_INPUT_TOKENS = 32_000
+DEFAULT_MAX_OUTPUT_TOKENS = 8_192
+
+# Estimated output tokens per item ({"id": ..., "sent_llm": ..., ...})
+OUTPUT_TOKENS_PER_ITEM = 40
+
+# System prompt for batch sentiment annotation
+SYSTEM_INSTRUCTION = """You are a financial sentiment annotator. For each JSON line, read `text` (+ optional `context`). Output **one JSON object per line** with **only** the fields in the response schema. No prose, no extra keys.
 
 Response schema per item:
 {
@@ -48,6 +83,83 @@ Response schema per item:
 }
 """
 
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token, rounded up).
+
+    Counts UTF-8 bytes rather than characters so emoji and non-Latin text,
+    which tokenize densely, are not underestimated.
+    """
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def estimate_item_tokens(item: dict) -> int:
+    """Estimated input tokens of one prompt item (its JSON line)."""
+    return estimate_tokens(json.dumps(item)) + 1
+
+
+PROMPT_OVERHEAD_TOKENS = estimate_tokens(SYSTEM_INSTRUCTION)
+
+
+def estimate_batch_tokens(batch: list[dict]) -> int:
+    """Estimated total (input + output) tokens of one request."""
+    return (
+        PROMPT_OVERHEAD_TOKENS
+        + sum(estimate_item_tokens(item) for item in batch)
+        + OUTPUT_TOKENS_PER_ITEM * len(batch)
+    )
+
+
+def pack_batches(
+    items: list[dict],
+    max_items: int = 200,
+    max_input_tokens: int = DEFAULT_MAX_INPUT_TOKENS,
+    max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+) -> list[list[dict]]:
+    """Pack prompt items, in order, into batches that fit a token budget.
+
+    A batch is closed when the next item would exceed max_items, the input
+    budget (system prompt + item lines) or the output budget
+    (OUTPUT_TOKENS_PER_ITEM per item). An item too large for any batch is
+    sent on its own.
+
+    Args:
+        items: Prompt items (id, text, timestamp_utc, context)
+        max_items: Maximum items per batch
+        max_input_tokens: Input token budget per request
+        max_output_tokens: Output token budget per request
+
+    Returns:
+        List of batches (lists of items)
+    """
+    max_items = max(1, min(max_items, max_output_tokens // OUTPUT_TOKENS_PER_ITEM))
+    batches = []
+    batch: list[dict] = []
+    batch_tokens = PROMPT_OVERHEAD_TOKENS
+
+    for item in items:
+        item_tokens = estimate_item_tokens(item)
+        if batch and (len(batch) >= max_items or batch_tokens + item_tokens > max_input_tokens):
+            batches.append(batch)
+            batch, batch_tokens = [], PROMPT_OVERHEAD_TOKENS
+        batch.append(item)
+        batch_tokens += item_tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_sentiment_prompt(items: list[dict]) -> dict:
+    """Build Gemini prompt for batch sentiment analysis.
+
+    Args:
+        items: List of text items with fields: id, text, timestamp_utc, context
+
+    Returns:
+        Gemini API request payload
+    """
+
     # Build user message with JSONL items
     jsonl_lines = [json.dumps(item) for item in items]
     user_message = "\n".join(jsonl_lines)
@@ -55,7 +167,7 @@ Response schema per item:
     # Gemini request payload
     payload = {
         "system_instruction": {
-            "parts": [{"text": system_instruction}]
+            "parts": [{"text": SYSTEM_INSTRUCTION}]
         },
         "contents": [
             {
@@ -72,19 +184,92 @@ Response schema per item:
     return payload
 
 
-def parse_gemini_response(response_text: str, input_items: list[dict]) -> list[dict]:
+def _clean_result(result: dict) -> dict:
+    """Clamp numeric fields to their domains and default invalid stances.
+
+    Raises:
+        ValueError: If a numeric field is not a number
+    """
+    # Clamp sent_llm to [-1, 1]
+    if "sent_llm" in result:
+        result["sent_llm"] = max(-1.0, min(1.0, float(result["sent_llm"])))
+
+    # Clamp certainty to [0, 1]
+    if "certainty" in result:
+        result["certainty"] = max(0.0, min(1.0, float(result["certainty"])))
+
+    # Clamp toxicity to [0, 1]
+    if "toxicity" in result:
+        result["toxicity"] = max(0.0, min(1.0, float(result["toxicity"])))
+
+    # Validate stance
+    if "stance" in result:
+        if result["stance"] not in ["bull", "bear", "neutral"]:
+            result["stance"] = "neutral"  # Default to neutral if invalid
+
+    return result
+
+
+def _iter_json_objects(text: str) -> Iterator[dict]:
+    """Yield every complete JSON object in text, skipping anything unparseable.
+
+    Handles a JSON array, JSONL, and output truncated mid-object (the
+    incomplete tail is dropped). Result objects are flat, so scanning from
+    each '{' finds them all.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return
+        try:
+            obj, pos = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        if isinstance(obj, dict):
+            yield obj
+
+
+def parse_gemini_response(
+    response_text: str,
+    input_items: list[dict],
+    salvage: bool = False,
+) -> Union[list[dict], tuple[list[dict], list[str]]]:
     """Parse Gemini response and validate 1:1 mapping with input.
 
+    In salvage mode a partial response is not an error: every well-formed
+    result for an input ID is kept (the first one if an ID repeats), results
+    for unknown IDs or with non-numeric scores are dropped, and the input IDs
+    left without a result are returned for re-queueing.
+
     Args:
         response_text: Raw response text from Gemini
         input_items: Original input items for validation
+        salvage: Keep valid results instead of raising on a mismatch
 
     Returns:
-        List of parsed sentiment results
+        List of parsed sentiment results, or with salvage=True a tuple of
+        (valid results, missing input IDs in input order)
 
     Raises:
-        ValueError: If response doesn't match input or is invalid
+        ValueError: If response doesn't match input or is invalid (strict mode only)
     """
+    if salvage:
+        input_ids = [str(item["id"]) for item in input_items]
+        expected = set(input_ids)
+        valid = {}
+        for result in _iter_json_objects(response_text):
+            result_id = str(result.get("id"))
+            if result_id not in expected or result_id in valid:
+                continue
+            try:
+                valid[result_id] = _clean_result({**result, "id": result_id})
+            except (TypeError, ValueError):
+                continue
+        return list(valid.values()), [item_id for item_id in input_ids if item_id not in valid]
+
     try:
         # Try parsing as JSON array first
         results = json.loads(response_text)
@@ -103,28 +288,24 @@ def parse_gemini_response(response_text: str, input_items: list[dict]) -> list[d
             raise ValueError(f"ID mismatch: missing={missing}, extra={extra}")
 
         # Validate and clamp values
-        for result in results:
-            # Clamp sent_llm to [-1, 1]
-            if "sent_llm" in result:
-                result["sent_llm"] = max(-1.0, min(1.0, float(result["sent_llm"])))
+        return [_clean_result(result) for result in results]
 
-            # Clamp certainty to [0, 1]
-            if "certainty" in result:
-                result["certainty"] = max(0.0, min(1.0, float(result["certainty"])))
-
-            # Clamp toxicity to [0, 1]
-            if "toxicity" in result:
-                result["toxicity"] = max(0.0, min(1.0, float(result["toxicity"])))
+    except Exception as e:
+        raise ValueError(f"Failed to parse Gemini response: {e}\nResponse: {response_text[:500]}")
 
-            # Validate stance
-            if "stance" in result:
-                if result["stance"] not in ["bull", "bear", "neutral"]:
-                    result["stance"] = "neutral"  # Default to neutral if invalid
 
-        return results
+def _response_text(response_data: dict) -> str:
+    """Text of the first candidate of a generateContent response.
 
-    except Exception as e:
-        raise ValueError(f"Failed to parse Gemini response: {e}\nResponse: {response_text[:500]}")
+    Raises:
+        ValueError: If the response has no candidate text
+    """
+    candidates = response_data.get("candidates") or []
+    if candidates:
+        content = candidates[0].get("content", {})
+        if "parts" in content:
+            return content["parts"][0].get("text", "")
+    raise ValueError("No valid response from Gemini API")
 
 
 def call_gemini_api(
@@ -182,22 +363,12 @@ def call_gemini_api(
 
             # Parse response
             response_data = response.json()
+            results = parse_gemini_response(_response_text(response_data), items)
 
-            # Extract text from response
-            if "candidates" in response_data and len(response_data["candidates"]) > 0:
-                candidate = response_data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    text = candidate["content"]["parts"][0].get("text", "")
-
-                    # Parse sentiment results
-                    results = parse_gemini_response(text, items)
-
-                    return {
-                        "results": results,
-                        "raw_response": response_data,
-                    }
-
-            raise ValueError("No valid response from Gemini API")
+            return {
+                "results": results,
+                "raw_response": response_data,
+            }
 
         except requests.HTTPError as e:
             if attempt < max_retries - 1:
@@ -210,6 +381,310 @@ def call_gemini_api(
     raise RuntimeError("Max retries exceeded")
 
 
+async def call_gemini_api_async(
+    session: aiohttp.ClientSession,
+    items: list[dict],
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    timeout: int = 60,
+) -> dict:
+    """Async variant of call_gemini_api on a shared aiohttp session.
+
+    Unlike call_gemini_api, this makes exactly one request and retries
+    nothing: score_batches_async re-queues failed requests, so every attempt
+    goes through key_manager.acquire_async and counts against the key's
+    RPM/TPM windows and daily quota.
+
+    Args:
+        session: aiohttp session (one per scoring run)
+        items: List of text items to score
+        api_key: Gemini API key
+        model: Model name (default: gemini-2.5-flash-lite)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Dict with 'results' (valid results, salvaged from a partial response),
+        'missing_ids' (input IDs without a valid result), 'raw_response' and
+        'tokens' (total tokens reported by the API, 0 if absent)
+
+    Raises:
+        aiohttp.ClientResponseError: On an HTTP error status
+        aiohttp.ClientConnectionError, asyncio.TimeoutError: On network errors
+        ValueError: If the response has no valid result at all
+    """
+    payload = build_sentiment_prompt(items)
+    url = f"{GEMINI_API_BASE}/models/{model}:generateContent?key={api_key}"
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": os.getenv("ORBIT_USER_AGENT", "ORBIT/1.0"),
+    }
+
+    async with session.post(
+        url,
+        json=payload,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as response:
+        response.raise_for_status()
+        response_data = await response.json(content_type=None)
+
+    response_text = _response_text(response_data)
+    results, missing_ids = parse_gemini_response(response_text, items, salvage=True)
+    if not results:
+        raise ValueError(f"No valid results in Gemini response: {response_text[:500]}")
+    return {
+        "results": results,
+        "missing_ids": missing_ids,
+        "raw_response": response_data,
+        "tokens": response_data.get("usageMetadata", {}).get("totalTokenCount", 0),
+    }
+
+
+@dataclass
+class ScoredBatch:
+    """A request that returned at least one valid result."""
+
+    batch_idx: int  # Index of the packed batch it came from
+    part: tuple  # Path within that batch: 0/1 = bisected halves, 2 = re-queued missing IDs
+    items: list[dict]
+    key_name: str
+    response: dict
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request may succeed unchanged (5xx or network error)."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def _should_bisect(error: Exception) -> bool:
+    """Whether a failed request may succeed as two smaller ones.
+
+    Unparseable or incomplete output (ValueError) and rejected payloads
+    (HTTP 400/413) depend on batch size; other errors (429s, 5xx, network)
+    do not.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in (400, 413)
+    return isinstance(error, ValueError)
+
+
+def _retry_after(error: aiohttp.ClientResponseError) -> Optional[float]:
+    """Retry-After seconds of a 429 response, if the server sent a numeric one."""
+    try:
+        return float((error.headers or {}).get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def score_batches_async(
+    batches: list[list[dict]],
+    key_manager: KeyRotationManager,
+    model: str = DEFAULT_MODEL,
+    concurrency_per_key: int = 1,
+    max_salvage_retries: int = 2,
+) -> list[ScoredBatch]:
+    """Score batches concurrently across all keys.
+
+    `concurrency_per_key` workers per key pull requests from a shared queue
+    and take a key from key_manager.acquire_async, which paces every key by
+    its own sliding-window RPM/TPM budget. A 429 cools its key down and the
+    request is re-queued for another key (up to MAX_RATE_LIMIT_REQUEUES
+    times); a 5xx or network error re-queues it after a backoff (up to
+    MAX_TRANSIENT_RETRIES times). Every attempt acquires a key again, so
+    retries are paced and counted like any other request. When all keys are
+    out of daily quota, the remaining requests are left unscored.
+
+    A multi-item request that fails in a size-dependent way (see
+    _should_bisect) is split in half and both halves are queued again, so one
+    oversized or garbled batch costs a few extra requests instead of all of
+    its items. When a response is only partly valid, its valid results are
+    kept and just the missing items are queued again as a smaller request, at
+    most max_salvage_retries times.
+
+    Args:
+        batches: Batch inputs (lists of prompt items)
+        key_manager: Key manager (quota accounting and RPM/TPM pacing)
+        model: Gemini model name
+        concurrency_per_key: Requests in flight per key
+        max_salvage_retries: Times an item missing from a partial response is re-queued
+
+    Returns:
+        Successfully scored requests ordered by (batch_idx, part). Items not
+        covered by any of them failed or were never sent.
+    """
+    scored: list[ScoredBatch] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for batch_idx, batch in enumerate(batches):
+        queue.put_nowait((batch_idx, (), batch, 0, 0, 0))
+
+    num_workers = len(key_manager.keys) * concurrency_per_key
+    open_requests = len(batches)  # Queued or in flight
+
+    def finish(children: list) -> None:
+        nonlocal open_requests
+        for child in children:
+            queue.put_nowait(child)
+        open_requests += len(children) - 1
+        if open_requests == 0:
+            for _ in range(num_workers):
+                queue.put_nowait(None)  # Wake idle workers so they exit
+
+    async def worker(session):
+        while True:
+            request = await queue.get()
+            if request is None:
+                return
+            batch_idx, part, batch, retries, rate_limited, transient = request
+
+            # Counts the request and its estimated tokens against the key
+            tokens = estimate_batch_tokens(batch)
+            try:
+                key = await key_manager.acquire_async(tokens)
+            except RuntimeError:
+                queue.put_nowait(request)  # All keys out of daily quota
+                return
+
+            label = f"{batch_idx + 1}{'.' + ''.join(map(str, part)) if part else ''}"
+            print(f"  → Batch {label}/{len(batches)} ({len(batch)} items) on {key.key_name}")
+            try:
+                response = await call_gemini_api_async(session, batch, key.key_value, model=model)
+            except aiohttp.ClientResponseError as e:
+                if e.status == 429 and rate_limited < MAX_RATE_LIMIT_REQUEUES:
+                    key_manager.report_rate_limited(key.key_name, _retry_after(e))
+                    finish([(batch_idx, part, batch, retries, rate_limited + 1, transient)])
+                    continue
+                response, error = None, e
+            except Exception as e:
+                response, error = None, e
+
+            if response is None:
+                if _is_transient(error) and transient < MAX_TRANSIENT_RETRIES:
+                    wait_time = TRANSIENT_RETRY_BACKOFF * 2 ** transient
+                    print(f"  ⚠ Batch {label} failed ({error!r}); retrying in {wait_time:g}s")
+                    await asyncio.sleep(wait_time)
+                    finish([(batch_idx, part, batch, retries, rate_limited, transient + 1)])
+                elif len(batch) > 1 and _should_bisect(error):
+                    print(f"  ⚠ Batch {label} failed ({error}); retrying as two halves")
+                    mid = len(batch) // 2
+                    finish([
+                        (batch_idx, part + (0,), batch[:mid], retries, rate_limited, 0),
+                        (batch_idx, part + (1,), batch[mid:], retries, rate_limited, 0),
+                    ])
+                else:
+                    print(f"  ✗ Error processing batch {label}: {error}")
+                    finish([])
+                continue
+
+            if response["tokens"]:
+                # Replace the estimate with the reported usage
+                # (a usage store write, so kept off the event loop)
+                await asyncio.to_thread(
+                    key_manager.record_usage, key_name=key.key_name, requests=0, tokens=response["tokens"] - tokens,
+                )
+            scored.append(ScoredBatch(batch_idx, part, batch, key.key_name, response))
+
+            missing = set(response["missing_ids"])
+            if missing and retries < max_salvage_retries:
+                print(f"  ⚠ Batch {label}: {len(missing)}/{len(batch)} results missing; re-queueing them")
+                missing_items = [item for item in batch if item["id"] in missing]
+                finish([(batch_idx, part + (2,), missing_items, retries + 1, rate_limited, 0)])
+            else:
+                if missing:
+                    print(f"  ✗ Batch {label}: {len(missing)} results still missing after {retries} retries")
+                finish([])
+
+    if batches:
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*(worker(session) for _ in range(num_workers)))
+
+    return sorted(scored, key=lambda batch: (batch.batch_idx, batch.part))
+
+
+def salvage_stats(scored_batches: list[ScoredBatch]) -> dict:
+    """Salvage metrics of a scoring run.
+
+    Args:
+        scored_batches: Output of score_batches_async
+
+    Returns:
+        Dict with partial_responses (responses missing some results),
+        salvaged_items (valid results kept from partial responses),
+        salvage_rate (salvaged_items / items in partial responses),
+        requeued_items (items sent again because they were missing) and
+        recovered_items (valid results from those re-queued requests)
+    """
+    partial = [batch for batch in scored_batches if batch.response["missing_ids"]]
+    salvaged = sum(len(batch.response["results"]) for batch in partial)
+    partial_items = sum(len(batch.items) for batch in partial)
+    retried = [batch for batch in scored_batches if batch.part[-1:] == (2,)]
+    return {
+        "partial_responses": len(partial),
+        "salvaged_items": salvaged,
+        "salvage_rate": salvaged / partial_items if partial_items else 1.0,
+        "requeued_items": sum(len(batch.items) for batch in retried),
+        "recovered_items": sum(len(batch.response["results"]) for batch in retried),
+    }
+
+
+def _batch_input(batch_items: pd.DataFrame, text_column: str, id_column: str) -> list[dict]:
+    """Prompt items of a batch of rows."""
+    return [
+        {
+            "id": str(row[id_column]),
+            "text": str(row[text_column]),
+            "timestamp_utc": str(row.get("timestamp_utc", "")),
+            "context": row.get("context", {}),
+        }
+        for _, row in batch_items.iterrows()
+    ]
+
+
+def _cluster_score_mask(
+    items: pd.DataFrame,
+    id_column: str,
+    member_override_distance: Optional[int] = None,
+) -> np.ndarray:
+    """Rows to send to Gemini when scoring dedupe cluster leaders only.
+
+    Leaders (is_dupe == False) are always scored. A duplicate is scored itself
+    when its leader is not among the items or, with member_override_distance,
+    when its simhash is more than that many bits from its leader's (clusters
+    are transitive, so members can drift far from the leader).
+
+    Args:
+        items: Items with dedupe fields (cluster_id, is_dupe; simhash for overrides)
+        id_column: Name of ID column
+        member_override_distance: Hamming distance above which a member is scored itself
+
+    Returns:
+        Boolean array, True for rows to score
+
+    Raises:
+        ValueError: If the required dedupe columns are missing
+    """
+    required = {"cluster_id", "is_dupe"} | ({"simhash"} if member_override_distance is not None else set())
+    missing = required - set(items.columns)
+    if missing:
+        raise ValueError(f"Leader-only scoring needs dedupe fields; missing columns: {sorted(missing)}")
+
+    positions = {item_id: pos for pos, item_id in enumerate(items[id_column].astype(str))}
+    leader_pos = np.array(
+        [positions.get(cluster_id, -1) for cluster_id in items["cluster_id"].astype(str)],
+        dtype=np.int64,
+    )
+    mask = ~items["is_dupe"].fillna(False).to_numpy(dtype=bool) | (leader_pos < 0)
+
+    if member_override_distance is not None:
+        hashes = items["simhash"].to_numpy(dtype=np.uint64)
+        members = np.flatnonzero(~mask)
+        distance = dedupe.popcount64(hashes[members] ^ hashes[leader_pos[members]])
+        mask[members[distance > member_override_distance]] = True
+
+    return mask
+
+
 def batch_score_gemini(
     items: pd.DataFrame,
     text_column: str = "text",
@@ -220,22 +695,47 @@ def batch_score_gemini(
     quota_rpd: int = 1000,
     run_id: Optional[str] = None,
     write_raw: bool = True,
+    concurrency_per_key: int = 1,
+    quota_rpm: Optional[int] = DEFAULT_QUOTA_RPM,
+    quota_tpm: Optional[int] = DEFAULT_QUOTA_TPM,
+    use_cache: bool = True,
+    leaders_only: bool = False,
+    member_override_distance: Optional[int] = None,
+    max_input_tokens: int = DEFAULT_MAX_INPUT_TOKENS,
+    max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+    max_salvage_retries: int = 2,
 ) -> pd.DataFrame:
     """Batch score text items using Gemini with multi-key rotation.
 
     This is the main entrypoint for LLM batching (M1 deliverable).
     Processes all items through Gemini API with automatic key rotation and quota tracking.
+    Items are packed into batches by estimated tokens (see pack_batches) and
+    sent concurrently (see score_batches_async), so throughput scales with the
+    number of keys; a failed batch is bisected and retried. Texts already in the sentiment cache, and
+    repeats of a text within the run, are not sent. With leaders_only, dedupe
+    cluster members inherit their leader's sentiment instead of being sent.
 
     Args:
         items: DataFrame with text items to score
         text_column: Name of text column
         id_column: Name of ID column
-        batch_size: Batch size (default: 200)
+        batch_size: Maximum items per batch (default: 200)
         model: Gemini model name (default: gemini-2.5-flash-lite)
         strategy: Key rotation strategy ("round_robin" or "least_used")
         quota_rpd: Requests per day per key (default: 1000 for gemini-2.5-flash-lite)
         run_id: Unique run identifier (auto-generated if None)
         write_raw: Whether to write raw req/resp to disk
+        concurrency_per_key: Requests in flight per key (default: 1)
+        quota_rpm: Requests per minute per key (None = unlimited)
+        quota_tpm: Tokens per minute per key (None = unlimited)
+        use_cache: Reuse and store scores in the sentiment cache
+        leaders_only: Send only dedupe cluster leaders (needs cluster_id/is_dupe
+            from dedupe_and_score_novelty) and copy their sentiment to members
+        member_override_distance: With leaders_only, also score members whose
+            simhash is more than this many bits from their leader's
+        max_input_tokens: Estimated input token budget per request
+        max_output_tokens: Estimated output token budget per request
+        max_salvage_retries: Times items missing from a partial response are re-queued
 
     Returns:
         DataFrame with original columns plus sentiment fields:
@@ -248,6 +748,8 @@ def batch_score_gemini(
     Note:
         Requires GEMINI_API_KEY_1 (and optionally _2, _3, _4, _5) in .env
         Raw requests/responses written to ORBIT_DATA_DIR/raw/gemini/
+        Sentiment cache at ORBIT_DATA_DIR/state/sentiment_cache.sqlite
+        Daily key usage shared with other runs at ORBIT_DATA_DIR/state/key_usage.sqlite
     """
     # Generate run_id if not provided
     if run_id is None:
@@ -258,103 +760,124 @@ def batch_score_gemini(
     print(f"Batch size: {batch_size}")
     print(f"Model: {model}")
 
-    # Initialize key rotation manager
-    rotation_strategy = RotationStrategy.ROUND_ROBIN if strategy == "round_robin" else RotationStrategy.LEAST_USED
-
-    key_manager = KeyRotationManager(
-        env_prefix="GEMINI_API_KEY",
-        max_keys=5,
-        strategy=rotation_strategy,
-        quota_rpd=quota_rpd,
+    # Optionally score cluster leaders only; members inherit below
+    all_items = items
+    if leaders_only:
+        score_mask = _cluster_score_mask(items, id_column, member_override_distance)
+        items = items[score_mask]
+        print(f"Leaders only: scoring {len(items)} of {len(all_items)} items")
+
+    # Look up cached scores; send each distinct uncached text once
+    keys = pd.Series(
+        [cache_key(model, PROMPT_VERSION, text) for text in items[text_column].astype(str)],
+        index=items.index,
     )
+    scores: dict[str, dict] = {}
+    cache = None
+    key_manager = None
+    try:
+        if use_cache:
+            cache = SentimentCache(cache_path(orbit_io.get_data_dir()))
+            scores = cache.get_many(keys)
+
+        send_mask = ~keys.isin(scores.keys()) & ~keys.duplicated()
+        to_send = items[send_mask]
+        sent_keys = dict(zip(to_send[id_column].astype(str), keys[send_mask]))
+        print(f"Cache hits: {keys.isin(scores.keys()).sum()}, items to score: {len(to_send)}")
+
+        batches = pack_batches(
+            _batch_input(to_send, text_column, id_column),
+            max_items=batch_size,
+            max_input_tokens=max_input_tokens,
+            max_output_tokens=max_output_tokens,
+        )
 
-    # Process in batches
-    results = []
-    raw_records = []
-
-    total_batches = (len(items) + batch_size - 1) // batch_size
-
-    for batch_idx in range(total_batches):
-        start_idx = batch_idx * batch_size
-        end_idx = min((batch_idx + 1) * batch_size, len(items))
-        batch_items = items.iloc[start_idx:end_idx]
-
-        print(f"\nProcessing batch {batch_idx + 1}/{total_batches} ({len(batch_items)} items)...")
-
-        # Prepare batch input
-        batch_input = []
-        for _, row in batch_items.iterrows():
-            batch_input.append({
-                "id": str(row[id_column]),
-                "text": str(row[text_column]),
-                "timestamp_utc": str(row.get("timestamp_utc", "")),
-                "context": row.get("context", {}),
-            })
+        scored_batches: list[ScoredBatch] = []
+        if batches:
+            # Initialize key rotation manager
+            rotation_strategy = RotationStrategy.ROUND_ROBIN if strategy == "round_robin" else RotationStrategy.LEAST_USED
+
+            key_manager = KeyRotationManager(
+                env_prefix="GEMINI_API_KEY",
+                max_keys=5,
+                strategy=rotation_strategy,
+                quota_rpd=quota_rpd,
+                quota_rpm=quota_rpm,
+                quota_tpm=quota_tpm,
+                persist_usage=True,
+            )
+            print(f"Batches: {len(batches)} across {len(key_manager.keys)} key(s) x {concurrency_per_key} in flight")
 
-        try:
-            # Get next available key
-            key = key_manager.get_next_key()
-            print(f"  Using {key.key_name} (usage: {key.requests_today}/{quota_rpd})")
-
-            # Call Gemini API
-            response = call_gemini_api(
-                items=batch_input,
-                api_key=key.key_value,
+            scored_batches = asyncio.run(score_batches_async(
+                batches,
+                key_manager,
                 model=model,
-            )
+                concurrency_per_key=concurrency_per_key,
+                max_salvage_retries=max_salvage_retries,
+            ))
 
-            # Record usage
-            key_manager.record_usage(
-                key_name=key.key_name,
-                requests=1,
-                tokens=0,  # TODO: Extract token usage from response
-            )
+        # Collect scored requests; items of failed requests stay unscored (neutral below)
+        new_scores = {}
+        raw_records = []
 
-            # Store results
-            results.extend(response["results"])
+        for batch in scored_batches:
+            for result in batch.response["results"]:
+                new_scores[sent_keys[result["id"]]] = {field: result.get(field) for field in SENTIMENT_FIELDS}
 
             # Store raw request/response for audit
             if write_raw:
                 raw_records.append({
                     "run_id": run_id,
-                    "batch_idx": batch_idx,
+                    "batch_idx": batch.batch_idx,
+                    "part": "".join(map(str, batch.part)),
                     "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                    "key_name": key.key_name,
-                    "num_items": len(batch_items),
-                    "request": batch_input,
-                    "response": response["raw_response"],
+                    "key_name": batch.key_name,
+                    "num_items": len(batch.items),
+                    "request": batch.items,
+                    "response": batch.response["raw_response"],
                 })
 
-            print(f"  ✓ Batch {batch_idx + 1} complete")
-
-        except RuntimeError as e:
-            print(f"  ✗ All keys exhausted: {e}")
-            print(f"  Marking remaining items with neutral sentiment...")
-
-            # Fill remaining items with neutral sentiment
-            for _, row in batch_items.iterrows():
-                results.append({
-                    "id": str(row[id_column]),
-                    "sent_llm": 0.0,
-                    "stance": "neutral",
-                    "sarcasm": False,
-                    "certainty": 0.0,
-                    "toxicity": 0.0,
-                })
+        stats = salvage_stats(scored_batches)
+        if stats["partial_responses"]:
+            print(
+                f"\n⚠ {stats['partial_responses']} partial responses: salvaged {stats['salvaged_items']} results "
+                f"({stats['salvage_rate']:.1%}), re-queued {stats['requeued_items']} items, "
+                f"recovered {stats['recovered_items']}"
+            )
 
-        except Exception as e:
-            print(f"  ✗ Error processing batch {batch_idx + 1}: {e}")
-
-            # Fill failed batch with neutral sentiment
-            for _, row in batch_items.iterrows():
-                results.append({
-                    "id": str(row[id_column]),
-                    "sent_llm": 0.0,
-                    "stance": "neutral",
-                    "sarcasm": False,
-                    "certainty": 0.0,
-                    "toxicity": 0.0,
-                })
+        failed_items = len(to_send) - len(new_scores)
+        if failed_items:
+            print(f"\n⚠ {failed_items}/{len(to_send)} items could not be scored; marked with neutral sentiment")
+
+        if cache is not None:
+            cache.put_many(new_scores)
+        if key_manager is not None:
+            key_manager.log_stats()
+    finally:
+        # Release the SQLite connections even if scoring fails
+        if cache is not None:
+            cache.close()
+        if key_manager is not None:
+            key_manager.close()
+
+    scores.update(new_scores)
+
+    # Every item (including cache hits and repeated texts) in input order
+    results = [
+        {"id": str(item_id), **scores.get(key, NEUTRAL_SENTIMENT)}
+        for item_id, key in zip(items[id_column], keys)
+    ]
+
+    # Broadcast leader sentiment to cluster members that were not scored
+    if leaders_only:
+        by_id = {result["id"]: result for result in results}
+        results = [
+            by_id[item_id] if scored else {**by_id[cluster_id], "id": item_id}
+            for item_id, cluster_id, scored in zip(
+                all_items[id_column].astype(str), all_items["cluster_id"].astype(str), score_mask,
+            )
+        ]
+        items = all_items
 
     # Write raw records to disk
     if write_raw and raw_records:
@@ -385,19 +908,18 @@ def batch_score_gemini(
         suffixes=("", "_gemini"),
     )
 
-    # Fill missing values with neutral
+    # Fill missing values with neutral. The columns hold Python objects with
+    # None (e.g. NULL sarcasm from the cache), so fill with typed operations:
+    # fillna's implicit downcast of object columns is deprecated
     for col in ["sent_llm", "certainty", "toxicity"]:
         if col in output_df.columns:
-            output_df[col] = output_df[col].fillna(0.0)
+            output_df[col] = output_df[col].astype(float).fillna(0.0)
 
     if "stance" in output_df.columns:
         output_df["stance"] = output_df["stance"].fillna("neutral")
 
     if "sarcasm" in output_df.columns:
-        output_df["sarcasm"] = output_df["sarcasm"].fillna(False)
-
-    # Log statistics
-    key_manager.log_stats()
+        output_df["sarcasm"] = output_df["sarcasm"].map(lambda value: False if pd.isna(value) else value)
 
     print(f"\n✓ Gemini batch scoring complete!")
     print(f"  Total items: {len(output_df)}")
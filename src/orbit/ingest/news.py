@@ -195,12 +195,20 @@ class NewsBuffer:
         return messages
 
 
-def flush_to_parquet(messages: list[dict], base_dir: str = "raw/news") -> Optional[Path]:
+def flush_to_parquet(
+    messages: list[dict],
+    base_dir: str = "raw/news",
+    run_id: Optional[str] = None,
+) -> Optional[Path]:
     """Flush buffered messages to Parquet file.
 
+    Each flush appends one part file per date (orbit_io.append_partition),
+    so repeated flushes of the same day never collide or rewrite the day.
+
     Args:
         messages: List of normalized message dicts
         base_dir: Base directory for output (relative to ORBIT_DATA_DIR)
+        run_id: Run identifier used in part file names
 
     Returns:
         Path to written file, or None if no messages
@@ -214,14 +222,9 @@ def flush_to_parquet(messages: list[dict], base_dir: str = "raw/news") -> Option
     # Partition by date (from published_at)
     df["date"] = pd.to_datetime(df["published_at"]).dt.date
 
-    # Write partitioned by date
-    # Use append mode to handle multiple flushes per day
+    # Write partitioned by date, one new part file per date
     for date, group in df.groupby("date"):
-        date_str = str(date)
-        path = f"{base_dir}/date={date_str}/news.parquet"
-
-        # Append to existing file if present
-        orbit_io.write_parquet(group.drop(columns=["date"]), path, overwrite=False)
+        orbit_io.append_partition(group.drop(columns=["date"]), base_dir, str(date), run_id=run_id)
 
     return Path(base_dir)
 
@@ -416,7 +419,7 @@ class AlpacaNewsClient:
         messages = self.buffer.get_and_clear()
         if messages:
             print(f"  → Flushing {len(messages)} messages to disk...")
-            flush_to_parquet(messages, base_dir="raw/news")
+            flush_to_parquet(messages, base_dir="raw/news", run_id=self.run_id)
             self.flushes_completed += 1
             print(f"  ✓ Flush complete (total flushes: {self.flushes_completed})")
 
@@ -1,6 +1,6 @@
 """ORBIT News Backfill - Alpaca REST API historical news fetcher.
 
-Fetches historical news from Alpaca's REST API with multi-key rotation support.
+Fetches historical news from Alpaca's REST API with a per-key worker pool over day shards.
 Complements the real-time WebSocket ingestion for backtesting and historical analysis.
 
 Implements bootstrap historical data collection as documented in:
@@ -9,7 +9,11 @@ docs/05-ingestion/bootstrap_historical_data.md
 
 import json
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -19,7 +23,7 @@ import requests
 from tqdm import tqdm
 
 from orbit import io as orbit_io
-from orbit.utils.key_rotation import KeyRotationManager, RotationStrategy
+from orbit.utils.rate_limit import TokenBucket
 
 
 # Alpaca REST API configuration
@@ -28,6 +32,10 @@ DEFAULT_PAGE_SIZE = 50  # Max allowed by Alpaca
 TARGET_RPM = 190  # Target 190 RPM (safety margin below 200 limit)
 CHECKPOINT_INTERVAL = 100  # Save checkpoint every N requests
 MAX_RETRY_ATTEMPTS = 5  # Max retries for 429 errors
+RATE_LIMIT_BACKOFF = 60  # First 429 backoff in seconds (doubles per retry)
+MAX_REST_KEYS = 5  # ALPACA_API_KEY_1..5
+DEFAULT_WORKERS_PER_KEY = 2  # Day shards in flight per key, sharing its rate limiter
+RESULT_POLL_SECONDS = 5.0  # How often the collector checks that workers are still alive
 
 
 def save_checkpoint(checkpoint_file: Path, data: dict) -> None:
@@ -56,9 +64,6 @@ def load_checkpoint(checkpoint_file: Path) -> Optional[dict]:
     return None
 
 
-from orbit.utils.key_rotation import KeyRotationManager, RotationStrategy
-
-
 def scan_existing_news_dates(data_dir: Path) -> set[str]:
     """Scan existing news date partitions to determine what's already ingested.
 
@@ -121,6 +126,7 @@ def fetch_news_page(
     page_token: Optional[str] = None,
     page_size: int = DEFAULT_PAGE_SIZE,
     timeout: int = 30,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """Fetch a single page of news from Alpaca REST API.
 
@@ -133,6 +139,7 @@ def fetch_news_page(
         page_token: Pagination token from previous response (optional)
         page_size: Number of items per page (default: 50)
         timeout: Request timeout in seconds
+        session: HTTP session to reuse connections (default: module-level requests)
 
     Returns:
         Dict with 'news' (list of articles) and 'next_page_token' (optional)
@@ -159,7 +166,8 @@ def fetch_news_page(
         "User-Agent": os.getenv("ORBIT_USER_AGENT", "ORBIT/1.0 (Educational project; +https://github.com/calebyhan/orbit)"),
     }
 
-    response = requests.get(
+    http = session or requests
+    response = http.get(
         ALPACA_NEWS_API_BASE,
         params=params,
         headers=headers,
@@ -211,6 +219,161 @@ def normalize_alpaca_rest_message(article: dict, received_at: datetime, run_id:
     return normalized
 
 
+@dataclass
+class DayShard:
+    """Outcome of fetching one day's next_page_token chain."""
+
+    date: str
+    articles: list[dict] = field(default_factory=list)
+    requests: int = 0
+    error: Optional[str] = None
+
+
+def load_rest_credentials(use_multi_key: bool = True) -> list[tuple[str, str, str]]:
+    """Load Alpaca REST API credentials for the backfill worker pool.
+
+    Multi-key mode discovers ALPACA_API_KEY_1..MAX_REST_KEYS with their
+    matching ALPACA_API_SECRET_N; keys without a secret are skipped. Falls
+    back to the single ALPACA_API_KEY_1 pair when no numbered keys are usable.
+    Pacing is per key (see backfill_news_date_range), so the variables are
+    read directly rather than through a KeyRotationManager.
+
+    Args:
+        use_multi_key: Whether to load every numbered key (default: True)
+
+    Returns:
+        List of (key_name, api_key, api_secret) tuples
+
+    Raises:
+        ValueError: If no credentials are found in environment
+    """
+    if use_multi_key:
+        credentials = []
+        for i in range(1, MAX_REST_KEYS + 1):
+            key_name = f"ALPACA_API_KEY_{i}"
+            api_key = (os.getenv(key_name) or "").strip()
+            if not api_key:
+                continue
+            api_secret = (os.getenv(f"ALPACA_API_SECRET_{i}") or "").strip()
+            if api_secret:
+                credentials.append((key_name, api_key, api_secret))
+            else:
+                print(f"⚠ {key_name} has no matching secret, skipping key")
+        if credentials:
+            return credentials
+        print("⚠ Multi-key mode requested but no usable numbered keys found")
+        print("  Falling back to single key mode")
+
+    api_key, api_secret = get_alpaca_creds_for_rest()
+    return [("ALPACA_API_KEY_1", api_key, api_secret)]
+
+
+def _pause(seconds: float, stop: Optional[threading.Event]) -> bool:
+    """Sleep, waking early when `stop` is set.
+
+    Returns:
+        True if stop was set
+    """
+    if stop is None:
+        time.sleep(seconds)
+        return False
+    return stop.wait(seconds)
+
+
+def fetch_news_day(
+    symbols: list[str],
+    day_start: datetime,
+    day_end: datetime,
+    api_key: str,
+    api_secret: str,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[TokenBucket] = None,
+    stop: Optional[threading.Event] = None,
+) -> DayShard:
+    """Fetch every page of news for one day shard.
+
+    Pages of a day are chained by next_page_token and fetched in order;
+    different days are independent, so the worker pool runs them in
+    parallel across keys. A 429 puts the key's limiter into debt for the
+    backoff, so every worker sharing the key backs off, then retries the
+    page. Any other error, or MAX_RETRY_ATTEMPTS 429s, fails the shard.
+
+    Args:
+        symbols: List of symbols (e.g., ["SPY", "VOO"])
+        day_start: Start of the day window (UTC)
+        day_end: End of the day window (UTC, exclusive)
+        api_key: Alpaca API key
+        api_secret: Alpaca API secret
+        session: HTTP session to reuse connections (default: module-level requests)
+        limiter: Rate limiter of the key; one token is taken per page request
+        stop: Event that aborts the shard (also during rate limit waits) when set
+
+    Returns:
+        DayShard with the raw articles, request count and error (None on success)
+    """
+    shard = DayShard(date=day_start.strftime("%Y-%m-%d"))
+    start_iso = day_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_iso = day_end.strftime("%Y-%m-%dT%H:%M:%SZ")
+    page_token = None
+
+    while True:
+        retry_count = 0
+        retry_delay = RATE_LIMIT_BACKOFF
+
+        while True:
+            if stop is not None and stop.is_set():
+                shard.error = "interrupted"
+                return shard
+
+            if limiter is not None:
+                wait = limiter.reserve()
+                if wait > 0 and _pause(wait, stop):
+                    shard.error = "interrupted"
+                    return shard
+
+            try:
+                response = fetch_news_page(
+                    symbols=symbols,
+                    start=start_iso,
+                    end=end_iso,
+                    api_key=api_key,
+                    api_secret=api_secret,
+                    page_token=page_token,
+                    session=session,
+                )
+                shard.requests += 1
+                break
+
+            except requests.HTTPError as e:
+                shard.requests += 1
+                if e.response is None or e.response.status_code != 429:
+                    shard.error = f"HTTP error: {e}"
+                    return shard
+
+                # Rate limited - exponential backoff
+                retry_count += 1
+                if retry_count >= MAX_RETRY_ATTEMPTS:
+                    shard.error = "max retries reached for 429 errors"
+                    return shard
+                tqdm.write(f"  ⚠ Rate limited (429) on {shard.date}, attempt {retry_count}/{MAX_RETRY_ATTEMPTS}, backing off {retry_delay}s...")
+                wait = limiter.reserve(retry_delay * limiter.rate) if limiter is not None else retry_delay
+                if _pause(wait, stop):
+                    shard.error = "interrupted"
+                    return shard
+                retry_delay *= 2
+
+            except Exception as e:
+                shard.error = f"error fetching page: {e}"
+                return shard
+
+        articles = response.get("news", [])
+        shard.articles.extend(articles)
+
+        page_token = response.get("next_page_token")
+        if not articles or not page_token:
+            return shard
+
+
 def backfill_news_date_range(
     symbols: list[str],
     start_date: str,
@@ -221,10 +384,15 @@ def backfill_news_date_range(
     write_raw: bool = True,
     resume: bool = True,
     reset: bool = False,
+    workers_per_key: int = DEFAULT_WORKERS_PER_KEY,
 ) -> dict:
     """Backfill historical news from Alpaca REST API.
 
-    Optimized for single-key reliability with checkpoint/resume capability.
+    The date range is split into day shards on a shared queue. Each key gets
+    its own TokenBucket at `quota_rpm` and `workers_per_key` worker threads
+    (each with its own HTTP session) that take days off the queue and follow
+    their next_page_token chains, so throughput scales with the number of
+    keys. Finished days are written as they complete, one part file per date.
     By default, scans existing date partitions and skips already-ingested dates.
 
     Args:
@@ -232,11 +400,12 @@ def backfill_news_date_range(
         start_date: Start date in ISO format (e.g., "2020-01-01" or "2020-01-01T00:00:00Z")
         end_date: End date in ISO format
         run_id: Unique run identifier (auto-generated if None)
-        use_multi_key: Whether to use multi-key rotation (default: True)
-        quota_rpm: Target requests per minute for rate limiting (default: 190)
+        use_multi_key: Whether to use every numbered key (default: True)
+        quota_rpm: Target requests per minute per key (default: 190)
         write_raw: Whether to write to disk (default: True)
         resume: Whether to resume from checkpoint if available (default: True)
         reset: If True, re-fetch all dates; if False (default), skip existing dates
+        workers_per_key: Day shards in flight per key (default: 2)
 
     Returns:
         Dict with statistics (articles_fetched, requests_made, elapsed_time, etc.)
@@ -259,7 +428,7 @@ def backfill_news_date_range(
         else:
             print("\nNo existing data found - fetching full date range")
     else:
-        print("\nReset mode: Re-fetching all dates (existing data will be overwritten)")
+        print("\nReset mode: Re-fetching all dates (new part files are appended; compaction and readers dedupe by id)")
 
     # Checkpoint file (still used for mid-run interruption recovery)
     checkpoint_file = Path(f".backfill_checkpoint_{run_id}.json")
@@ -286,205 +455,168 @@ def backfill_news_date_range(
     if end_dt.tzinfo is None:
         end_dt = end_dt.replace(tzinfo=timezone.utc)
 
-    # Resume from checkpoint if available
-    if checkpoint:
-        resume_date = datetime.fromisoformat(checkpoint['last_date'])
+    # Days finished by an interrupted run (days complete out of order)
+    completed_dates = list(checkpoint.get("completed_dates", [])) if checkpoint else []
+
+    # Checkpoints written before day sharding only record the last date
+    if checkpoint and "last_date" in checkpoint:
+        resume_date = datetime.fromisoformat(checkpoint["last_date"])
         if resume_date > start_dt:
             start_dt = resume_date
             print(f"  Resuming from: {start_dt.date()}")
 
-    # Initialize key manager or single key
-    if use_multi_key:
-        try:
-            # Try to load multiple keys
-            key_manager = KeyRotationManager(
-                env_prefix="ALPACA_API_KEY",
-                max_keys=5,
-                strategy=RotationStrategy.ROUND_ROBIN,
-                quota_rpd=None,  # No daily quota tracking for REST API
-                # Could add RPM tracking in future
-            )
-            num_keys = len(key_manager.keys)
-            print(f"✓ Using multi-key mode ({num_keys} keys loaded)")
-            print(f"  Combined throughput: ~{quota_rpm * num_keys} RPM")
-        except ValueError:
-            # Fall back to single key
-            print("⚠ Multi-key mode requested but only single key found")
-            print("  Falling back to single key mode")
-            use_multi_key = False
-
-    if not use_multi_key:
-        # Single key mode
-        api_key, api_secret = get_alpaca_creds_for_rest()
+    # One (name, key, secret) per usable Alpaca key
+    credentials = load_rest_credentials(use_multi_key)
+    num_keys = len(credentials)
+    if num_keys > 1:
+        print(f"✓ Using multi-key mode ({num_keys} keys loaded)")
+        print(f"  Combined throughput: ~{quota_rpm * num_keys} RPM")
+    else:
         print(f"✓ Using single key mode")
         print(f"  Throughput: ~{quota_rpm} RPM")
 
+    # Day shards, minus already-ingested and checkpointed days
+    delta = timedelta(days=1)
+    all_days = []
+    current_date = start_dt
+    while current_date < end_dt:
+        all_days.append(current_date)
+        current_date += delta
+
+    done = set(completed_dates)
+    if not reset:
+        done |= existing_dates
+    days = [day for day in all_days if day.strftime("%Y-%m-%d") not in done]
+
+    shards = queue.Queue()
+    for day in days:
+        shards.put(day)
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def worker(api_key: str, api_secret: str, limiter: TokenBucket) -> None:
+        with requests.Session() as session:
+            while not stop.is_set():
+                try:
+                    day = shards.get_nowait()
+                except queue.Empty:
+                    return
+                results.put(fetch_news_day(
+                    symbols,
+                    day,
+                    min(day + delta, end_dt),
+                    api_key,
+                    api_secret,
+                    session=session,
+                    limiter=limiter,
+                    stop=stop,
+                ))
+
     # Statistics (restore from checkpoint if resuming)
     articles_fetched = checkpoint['articles_fetched'] if checkpoint else 0
     requests_made = checkpoint['requests_made'] if checkpoint else 0
-    current_articles = []
+    next_checkpoint = requests_made + CHECKPOINT_INTERVAL
+    failed_dates = []
     start_time = time.time()
-    last_request_time = 0.0  # For rate limiting
-    request_interval = 60.0 / quota_rpm  # Seconds between requests
-
-    # Iterate through date range (daily chunks to respect pagination)
-    current_date = start_dt
-    delta = timedelta(days=1)
-    total_days = (end_dt - start_dt).days
 
     # Progress bar
     pbar = tqdm(
-        total=total_days,
+        total=len(all_days),
         desc="Backfill progress",
         unit="day",
-        initial=(start_dt - datetime.fromisoformat(start_date.replace("Z", "+00:00")).replace(tzinfo=timezone.utc)).days if checkpoint else 0,
+        initial=len(all_days) - len(days),
     )
 
-    while current_date < end_dt:
-        next_date = min(current_date + delta, end_dt)
-        current_date_str = current_date.strftime("%Y-%m-%d")
-
-        # Skip if this date already exists (unless reset mode)
-        if not reset and current_date_str in existing_dates:
-            current_date = next_date
-            pbar.update(1)
-            continue
-
-        # Format for API
-        start_iso = current_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_iso = next_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Fetch all pages for this day
-        page_token = None
-        page_num = 0
-
-        while True:
-            page_num += 1
-
-            # Retry loop for 429 errors
-            retry_count = 0
-            retry_delay = 60  # Start with 60s backoff
-
-            while retry_count < MAX_RETRY_ATTEMPTS:
-                try:
-                    # Precise rate limiting: ensure we don't exceed quota_rpm
-                    time_since_last = time.time() - last_request_time
-                    if time_since_last < request_interval:
-                        time.sleep(request_interval - time_since_last)
-
-                    # Get API key (rotate if multi-key)
-                    if use_multi_key:
-                        key = key_manager.get_next_key()
-                        api_key = key.key_value
-                        # Extract secret from environment (keys are stored as KEY:SECRET pairs or separate)
-                        api_secret = os.getenv(key.key_name.replace("KEY", "SECRET"))
-                        if not api_secret:
-                            # Try underscore pattern
-                            secret_name = key.key_name.replace("API_KEY", "API_SECRET")
-                            api_secret = os.getenv(secret_name)
-
-                    # Fetch page
-                    last_request_time = time.time()
-                    response = fetch_news_page(
-                        symbols=symbols,
-                        start=start_iso,
-                        end=end_iso,
-                        api_key=api_key,
-                        api_secret=api_secret,
-                        page_token=page_token,
-                    )
-
-                    requests_made += 1
-                    break  # Success, exit retry loop
-
-                except requests.HTTPError as e:
-                    if e.response.status_code == 429:
-                        # Rate limited - exponential backoff
-                        retry_count += 1
-                        if retry_count >= MAX_RETRY_ATTEMPTS:
-                            pbar.write(f"  ✗ Max retries reached for 429 errors, skipping day")
-                            break
-                        pbar.write(f"  ⚠ Rate limited (429), attempt {retry_count}/{MAX_RETRY_ATTEMPTS}, backing off {retry_delay}s...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
+    workers_per_key = max(1, workers_per_key)
+    try:
+        with ThreadPoolExecutor(max_workers=num_keys * workers_per_key) as executor:
+            # Each key gets its own limiter, shared by that key's workers
+            futures = []
+            for _key_name, api_key, api_secret in credentials:
+                limiter = TokenBucket(rate=quota_rpm / 60.0)
+                for _ in range(workers_per_key):
+                    futures.append(executor.submit(worker, api_key, api_secret, limiter))
+
+            try:
+                received = 0
+                while received < len(days):
+                    try:
+                        shard = results.get(timeout=RESULT_POLL_SECONDS)
+                    except queue.Empty:
+                        # A worker that died took its shard with it; don't wait for it forever
+                        for future in futures:
+                            if future.done() and future.exception() is not None:
+                                raise future.exception()
+                        if all(future.done() for future in futures) and results.empty():
+                            raise RuntimeError(f"All backfill workers exited with {len(days) - received} days left")
                         continue
+                    received += 1
+                    requests_made += shard.requests
+
+                    if shard.error:
+                        # Nothing is written, so the next incremental run retries the day
+                        failed_dates.append(shard.date)
+                        pbar.write(f"  ✗ {shard.date}: {shard.error}, skipping day")
                     else:
-                        pbar.write(f"  ✗ HTTP error: {e}")
-                        break
-                except Exception as e:
-                    pbar.write(f"  ✗ Error fetching page: {e}")
-                    break
-
-            # Check if we broke out of retry loop without success
-            if retry_count >= MAX_RETRY_ATTEMPTS:
-                break  # Skip this day
-
-            # Process response (only if we successfully fetched)
-            if retry_count < MAX_RETRY_ATTEMPTS:
-                # Process articles
-                articles = response.get("news", [])
-                if not articles:
-                    break
-
-                # Normalize articles
-                received_at = datetime.now(timezone.utc)
-                for article in articles:
-                    normalized = normalize_alpaca_rest_message(article, received_at, run_id)
-                    current_articles.append(normalized)
-
-                articles_fetched += len(articles)
-
-                # Update progress bar
-                pbar.set_postfix({
-                    'articles': articles_fetched,
-                    'requests': requests_made,
-                    'rpm': f"{requests_made / ((time.time() - start_time) / 60):.1f}",
-                })
-
-                # Check for next page
-                page_token = response.get("next_page_token")
-                if not page_token:
-                    break
-
-                # Save checkpoint periodically
-                if requests_made % CHECKPOINT_INTERVAL == 0:
-                    save_checkpoint(checkpoint_file, {
-                        'run_id': run_id,
-                        'last_date': current_date.isoformat(),
-                        'articles_fetched': articles_fetched,
-                        'requests_made': requests_made,
-                        'symbols': symbols,
+                        articles_fetched += len(shard.articles)
+                        completed_dates.append(shard.date)
+
+                        if write_raw and shard.articles:
+                            received_at = datetime.now(timezone.utc)
+                            df = pd.DataFrame([
+                                normalize_alpaca_rest_message(article, received_at, run_id)
+                                for article in shard.articles
+                            ])
+
+                            # Partition by date (from published_at)
+                            df["date"] = pd.to_datetime(df["published_at"]).dt.date
+
+                            for date, group in df.groupby("date"):
+                                # New part file; may overlap with WebSocket data (readers dedupe on msg_id)
+                                orbit_io.append_partition(group.drop(columns=["date"]), "raw/news", str(date), run_id=run_id)
+
+                    # Update progress bar
+                    elapsed = time.time() - start_time
+                    pbar.set_postfix({
+                        'articles': articles_fetched,
+                        'requests': requests_made,
+                        'rpm': f"{requests_made / (elapsed / 60):.1f}" if elapsed > 0 else "0.0",
                     })
-
-        # Move to next day
-        current_date = next_date
-        pbar.update(1)
-
-    pbar.close()
-
-    # Write collected articles to disk
-    if write_raw and current_articles:
-        print(f"\n✓ Writing {len(current_articles)} articles to disk...")
-
-        df = pd.DataFrame(current_articles)
-
-        # Partition by date (from published_at)
-        df["date"] = pd.to_datetime(df["published_at"]).dt.date
-
-        for date, group in df.groupby("date"):
-            date_str = str(date)
-            path = f"raw/news/date={date_str}/news_backfill.parquet"
-
-            # Append to existing if present (may overlap with WebSocket data)
-            orbit_io.write_parquet(group.drop(columns=["date"]), path, overwrite=False)
-            print(f"  → {date_str}: {len(group)} articles")
+                    pbar.update(1)
+
+                    # Save checkpoint periodically
+                    if requests_made >= next_checkpoint:
+                        save_checkpoint(checkpoint_file, {
+                            'run_id': run_id,
+                            'completed_dates': completed_dates,
+                            'articles_fetched': articles_fetched,
+                            'requests_made': requests_made,
+                            'symbols': symbols,
+                        })
+                        next_checkpoint = requests_made + CHECKPOINT_INTERVAL
+            finally:
+                # Workers stop before their next request (e.g. on Ctrl+C)
+                stop.set()
+    finally:
+        pbar.close()
 
     # Calculate elapsed time
     elapsed_time = time.time() - start_time
     elapsed_str = f"{elapsed_time / 3600:.2f}h" if elapsed_time > 3600 else f"{elapsed_time / 60:.1f}m"
-
-    # Remove checkpoint on successful completion
-    if checkpoint_file.exists():
+    average_rpm = requests_made / (elapsed_time / 60) if elapsed_time > 0 else 0.0
+
+    if failed_dates:
+        # Keep the checkpoint so a resumed run skips finished days and retries only these
+        save_checkpoint(checkpoint_file, {
+            'run_id': run_id,
+            'completed_dates': completed_dates,
+            'failed_dates': sorted(failed_dates),
+            'articles_fetched': articles_fetched,
+            'requests_made': requests_made,
+            'symbols': symbols,
+        })
+    elif checkpoint_file.exists():
+        # Remove checkpoint on successful completion
         checkpoint_file.unlink()
 
     # Summary
@@ -493,8 +625,11 @@ def backfill_news_date_range(
     print(f"  Articles fetched: {articles_fetched}")
     print(f"  API requests: {requests_made}")
     print(f"  Elapsed time: {elapsed_str}")
-    print(f"  Average rate: {requests_made / (elapsed_time / 60):.1f} RPM")
+    print(f"  Average rate: {average_rpm:.1f} RPM ({num_keys} keys)")
     print(f"  Date range: {start_date} to {end_date}")
+    if failed_dates:
+        print(f"  ⚠ Failed days: {len(failed_dates)} (re-run to retry: {', '.join(sorted(failed_dates)[:5])}{', ...' if len(failed_dates) > 5 else ''})")
+        print(f"  Checkpoint kept: {checkpoint_file}")
     print(f"  Run ID: {run_id}")
     print("="*60)
 
@@ -504,6 +639,7 @@ def backfill_news_date_range(
         "elapsed_time": elapsed_time,
         "date_range": f"{start_date} to {end_date}",
         "run_id": run_id,
+        "failed_dates": sorted(failed_dates),
     }
 
 
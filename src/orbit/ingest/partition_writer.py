@@ -0,0 +1,106 @@
+"""Append-only writer for date-partitioned raw datasets.
+
+Used by backfills that add rows to the same date partition many times in one
+run (e.g. one social backfill request per subreddit per day). Instead of
+read-concat-rewrite on every request, each write appends a small part file
+(part-<run_id>-<n>.parquet) and an in-memory id index drops rows that are
+already in the partition. compact() then folds each touched partition into
+its compacted file once, at the end of the run.
+
+Layout:
+    raw/<dataset>/date=YYYY-MM-DD/<dataset>-g<gen>-<n>.parquet  (compacted)
+    raw/<dataset>/date=YYYY-MM-DD/part-<run_id>-<n>.parquet     (pending)
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from orbit import io as orbit_io
+from orbit.ops import compact
+
+
+class PartitionWriter:
+    """Append rows to raw/<dataset>/date=... partitions with id-level dedup.
+
+    Example:
+        >>> writer = PartitionWriter(Path("/srv/orbit/data"), "social", run_id="20241105_backfill")
+        >>> writer.write("2024-11-05", df_stocks)     # part-20241105_backfill-00000.parquet
+        >>> writer.write("2024-11-05", df_investing)  # only ids not seen yet
+        >>> writer.compact()                          # one rewrite per touched partition
+    """
+
+    def __init__(self, data_dir: Path, dataset: str, run_id: str, id_column: str = "id"):
+        """Initialize writer.
+
+        Args:
+            data_dir: Base data directory
+            dataset: Dataset name under raw/ (e.g. "social")
+            run_id: Run identifier used in part file names
+            id_column: Column identifying a row for deduplication
+        """
+        self.data_dir = Path(data_dir)
+        self.dataset = dataset
+        self.run_id = run_id
+        self.id_column = id_column
+
+        self._ids: dict[str, set] = {}  # date -> ids present in the partition
+        self._touched: set[str] = set()  # dates written this run
+
+    def partition_dir(self, date: str) -> Path:
+        """Directory of a date partition."""
+        return self.data_dir / "raw" / self.dataset / f"date={date}"
+
+    def _load_ids(self, date: str) -> set:
+        """Ids already stored in a partition (reads only the id column)."""
+        if date not in self._ids:
+            ids = set()
+            for path in orbit_io.partition_files(self.partition_dir(date)):
+                ids.update(pd.read_parquet(path, columns=[self.id_column])[self.id_column])
+            self._ids[date] = ids
+        return self._ids[date]
+
+    def write(self, date: str, df: pd.DataFrame) -> int:
+        """Append rows whose id is not yet in the partition.
+
+        Args:
+            date: Partition date (YYYY-MM-DD)
+            df: Rows to append
+
+        Returns:
+            Number of rows written
+        """
+        seen = self._load_ids(date)
+        df = df.drop_duplicates(subset=[self.id_column], keep="first")
+        df = df[~df[self.id_column].isin(seen)]
+        if df.empty:
+            return 0
+
+        orbit_io.append_partition(df, self.data_dir / "raw" / self.dataset, date, run_id=self.run_id)
+        self._touched.add(date)
+
+        seen.update(df[self.id_column])
+        return len(df)
+
+    def compact(self) -> int:
+        """Fold every partition written this run into new <dataset>-g<gen>-<n>.parquet files.
+
+        Rows keep the order of orbit.io.partition_files (previously compacted
+        files, then part files in write order; no timestamp sort), and the
+        first copy of each id wins, so the result matches the old per-request
+        read-concat-dedupe-rewrite. See orbit.ops.compact for the protocol that
+        publishes the new generation before deleting its inputs.
+
+        Returns:
+            Number of partitions compacted
+        """
+        compacted = 0
+        for date in sorted(self._touched):
+            partition = self.partition_dir(date)
+            if not any(partition.glob("part-*.parquet")):
+                continue
+            compact.compact_partition(partition, id_column=self.id_column, min_files=1)
+            compacted += 1
+
+        self._touched.clear()
+        return compacted
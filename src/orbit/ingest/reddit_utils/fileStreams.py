@@ -6,67 +6,115 @@ except ImportError:
 	import json
 	print("Recommended to install 'orjson' for faster JSON parsing")
 
-import zstandard
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
 
-from zst_blocks_format.python_cli.ZstBlocksFile import ZstBlocksFile
+try:
+	from zst_blocks_format.python_cli.ZstBlocksFile import ZstBlocksFile
+except ImportError:
+	ZstBlocksFile = None
 
-def getZstFileJsonStream(f: BinaryIO, chunk_size=1024*1024*10) -> Iterator[dict]:
-	decompressor = zstandard.ZstdDecompressor(max_window_size=2**31)
-	currentString = ""
-	def yieldLinesJson():
-		nonlocal currentString
-		lines = currentString.split("\n")
-		currentString = lines[-1]
-		for line in lines[:-1]:
+DEFAULT_CHUNK_SIZE = 1024*1024*10
+
+def iterLineBatches(reader: BinaryIO, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[list[bytes]]:
+	"""Split a binary stream into batches of complete lines (without the newline).
+
+	Bytes are carried between reads in one reusable bytearray; only the
+	trailing partial line is kept, so memory stays at ~chunk_size no matter
+	how large the stream is. Nothing is decoded here.
+	"""
+	buffer = bytearray()
+	while True:
+		chunk = reader.read(chunk_size)
+		if not chunk:
+			break
+		buffer += chunk
+		end = buffer.rfind(b"\n")
+		if end < 0:
+			continue
+		lines = bytes(memoryview(buffer)[:end]).split(b"\n")
+		del buffer[:end + 1]
+		yield lines
+	if buffer.strip():
+		yield [bytes(buffer)]
+
+def parseJsonLines(lines: list[bytes]) -> list[dict]:
+	"""Parse a batch of JSON lines, skipping blank and malformed ones."""
+	records = []
+	for line in lines:
+		if not line.strip():
+			continue
+		try:
+			records.append(json.loads(line))
+		except ValueError:
+			# Invalid UTF-8 or JSON: retry once on the lossy decode before giving up
+			text = line.decode("utf-8", "replace")
 			try:
-				yield json.loads(line)
-			except json.JSONDecodeError:
-				print("Error parsing line: " + line)
+				records.append(json.loads(text))
+			except ValueError:
+				print("Error parsing line: " + text)
 				traceback.print_exc()
-				continue
-	zstReader = decompressor.stream_reader(f)
+	return records
+
+def _openZstReader(f: BinaryIO):
+	if zstandard is None:
+		raise ImportError("Reading .zst dumps requires 'zstandard' (pip install zstandard)")
+	decompressor = zstandard.ZstdDecompressor(max_window_size=2**31)
+	return decompressor.stream_reader(f)
+
+def getZstFileJsonBatches(f: BinaryIO, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[list[dict]]:
+	zstReader = _openZstReader(f)
+	lineBatches = iterLineBatches(zstReader, chunk_size)
 	while True:
 		try:
-			chunk = zstReader.read(chunk_size)
+			lines = next(lineBatches)
+		except StopIteration:
+			break
 		except zstandard.ZstdError:
 			print("Error reading zst chunk")
 			traceback.print_exc()
 			break
-		if not chunk:
-			break
-		currentString += chunk.decode("utf-8", "replace")
-		
-		yield from yieldLinesJson()
-	
-	yield from yieldLinesJson()
-	
-	if len(currentString) > 0:
-		try:
-			yield json.loads(currentString)
-		except json.JSONDecodeError:
-			print("Error parsing line: " + currentString)
-			print(traceback.format_exc())
-			pass
+		yield parseJsonLines(lines)
+
+def getZstFileJsonStream(f: BinaryIO, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+	for batch in getZstFileJsonBatches(f, chunk_size):
+		yield from batch
+
+def getJsonLinesFileJsonBatches(f: BinaryIO, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[list[dict]]:
+	for lines in iterLineBatches(f, chunk_size):
+		yield parseJsonLines(lines)
 
 def getJsonLinesFileJsonStream(f: BinaryIO) -> Iterator[dict]:
-	for line in f:
-		line = line.decode("utf-8", errors="replace")
-		try:
-			yield json.loads(line)
-		except json.JSONDecodeError:
-			print("Error parsing line: " + line)
-			traceback.print_exc()
-			continue
+	for batch in getJsonLinesFileJsonBatches(f):
+		yield from batch
 
-def getZstBlocksFileJsonStream(f: BinaryIO) -> Iterator[dict]:
+def getZstBlocksFileJsonBatches(f: BinaryIO, batch_size=10000) -> Iterator[list[dict]]:
+	if ZstBlocksFile is None:
+		raise ImportError("Reading .zst_blocks dumps requires the 'zst_blocks_format' package")
+	lines = []
 	for row in ZstBlocksFile.streamRows(f):
-		line = row.decode("utf-8", errors="replace")
-		try:
-			yield json.loads(line)
-		except json.JSONDecodeError:
-			print("Error parsing line: " + line)
-			traceback.print_exc()
-			continue
+		lines.append(row)
+		if len(lines) >= batch_size:
+			yield parseJsonLines(lines)
+			lines = []
+	if lines:
+		yield parseJsonLines(lines)
+
+def getZstBlocksFileJsonStream(f: BinaryIO) -> Iterator[dict]:
+	for batch in getZstBlocksFileJsonBatches(f):
+		yield from batch
+
+def getFileJsonBatches(path: str, f: BinaryIO) -> Iterator[list[dict]]|None:
+	if path.endswith(".jsonl"):
+		return getJsonLinesFileJsonBatches(f)
+	elif path.endswith(".zst"):
+		return getZstFileJsonBatches(f)
+	elif path.endswith(".zst_blocks"):
+		return getZstBlocksFileJsonBatches(f)
+	else:
+		return None
 
 def getFileJsonStream(path: str, f: BinaryIO) -> Iterator[dict]|None:
 	if path.endswith(".jsonl"):
@@ -76,4 +124,4 @@ def getFileJsonStream(path: str, f: BinaryIO) -> Iterator[dict]|None:
 	elif path.endswith(".zst_blocks"):
 		return getZstBlocksFileJsonStream(f)
 	else:
-		return None
\ No newline at end of file
+		return None
@@ -0,0 +1,184 @@
+"""ORBIT LLM Batching - Content-addressed sentiment cache.
+
+Stores Gemini sentiment fields (sent_llm, stance, sarcasm, certainty,
+toxicity) keyed by sha256(model | prompt version | normalized text), so
+reruns, reprocessed days and headlines syndicated across sources are scored
+once. Changing the model or PROMPT_VERSION naturally misses the old entries.
+
+Stored in SQLite at ORBIT_DATA_DIR/state/sentiment_cache.sqlite. Size is
+bounded by `max_entries`; the least recently used entries are evicted first.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+# Default size bound (rows of ~100 bytes each)
+DEFAULT_MAX_ENTRIES = 2_000_000
+
+SENTIMENT_FIELDS = ("sent_llm", "stance", "sarcasm", "certainty", "toxicity")
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+def _sarcasm_flag(value) -> Optional[int]:
+    """Parse a sarcasm value strictly into 1/0, or None if it isn't a boolean.
+
+    Accepts bools, the integers 0/1 and the strings "true"/"false" (any case,
+    surrounding whitespace ignored); anything else (e.g. "no", 0.5) is stored
+    as NULL rather than guessed via truthiness.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (int, np.integer)) and value in (0, 1):
+        return int(value)
+    if isinstance(value, str):
+        return {"true": 1, "false": 0}.get(value.strip().lower())
+    return None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment (
+    key TEXT PRIMARY KEY,
+    sent_llm REAL,
+    stance TEXT,
+    sarcasm INTEGER,
+    certainty REAL,
+    toxicity REAL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+def cache_path(data_dir: Path) -> Path:
+    """Location of the sentiment cache inside a data directory."""
+    return Path(data_dir) / "state" / "sentiment_cache.sqlite"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFKC, collapsed whitespace).
+
+    Case and URLs are kept: both can change how the model reads an item.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def cache_key(model: str, prompt_version: int, text: str) -> str:
+    """Cache key of a text scored by a model with a prompt version."""
+    payload = f"{model}|{prompt_version}|{normalize_text(text)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SentimentCache:
+    """SQLite-backed LRU cache of LLM sentiment scores.
+
+    Safe to open from several processes: every write is its own short
+    transaction and the database runs in WAL mode.
+
+    Example:
+        >>> cache = SentimentCache(cache_path(data_dir))
+        >>> key = cache_key("gemini-2.5-flash-lite", 1, "Fed holds rates steady")
+        >>> cache.put_many({key: {"sent_llm": 0.1, "stance": "neutral", ...}})
+        >>> cache.get_many([key])
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: SQLite file path
+            max_entries: Maximum number of cached items
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sentiment_lru ON sentiment (last_used_at)")
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        """Look up cached scores and mark them as recently used.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict of key -> sentiment fields for the keys that are cached
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(SENTIMENT_FIELDS)} FROM sentiment "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, sent_llm, stance, sarcasm, certainty, toxicity in rows:
+                found[key] = {
+                    "sent_llm": sent_llm,
+                    "stance": stance,
+                    "sarcasm": None if sarcasm is None else bool(sarcasm),
+                    "certainty": certainty,
+                    "toxicity": toxicity,
+                }
+
+        if found:
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE sentiment SET last_used_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def put_many(self, scores: dict[str, dict]) -> None:
+        """Insert or replace scores, then evict least recently used entries over the bound.
+
+        Args:
+            scores: Dict of key -> sentiment fields (missing fields stored as NULL)
+        """
+        if not scores:
+            return
+
+        now = time.time()
+        rows = []
+        for key, fields in scores.items():
+            rows.append((
+                key,
+                fields.get("sent_llm"),
+                fields.get("stance"),
+                _sarcasm_flag(fields.get("sarcasm")),
+                fields.get("certainty"),
+                fields.get("toxicity"),
+                now,
+            ))
+
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM sentiment WHERE key IN "
+                    "(SELECT key FROM sentiment ORDER BY last_used_at, rowid LIMIT ?)",
+                    (excess,),
+                )
+
+    def __len__(self) -> int:
+        """Number of cached items."""
+        return self._conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
@@ -12,7 +12,10 @@ import hashlib
 import json
 import os
 import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -22,6 +25,8 @@ import requests
 from tqdm import tqdm
 
 from orbit import io as orbit_io
+from orbit.ingest.partition_writer import PartitionWriter
+from orbit.utils.rate_limit import TokenBucket
 
 
 # Arctic Shift API configuration
@@ -30,6 +35,7 @@ DEFAULT_LIMIT = 25  # API caps at ~25-40 per request
 TARGET_RPS = 3.5  # Target 3.5 requests/second (from empirical testing)
 CHECKPOINT_INTERVAL = 100  # Save checkpoint every N requests
 MAX_RETRY_ATTEMPTS = 5  # Max retries for errors
+DEFAULT_CONCURRENCY = 4  # (date, subreddit) fetches in flight behind the shared limiter
 
 # Default subreddits for ORBIT
 DEFAULT_SUBREDDITS = ["stocks", "investing", "wallstreetbets"]
@@ -244,6 +250,8 @@ def fetch_posts_for_day(
     date: datetime,
     limit: int = DEFAULT_LIMIT,
     timeout: int = 30,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[TokenBucket] = None,
 ) -> list[dict]:
     """Fetch all posts for a specific day from Arctic Shift API.
 
@@ -254,6 +262,8 @@ def fetch_posts_for_day(
         date: Date to fetch posts for
         limit: Max posts per request (default: 25)
         timeout: Request timeout in seconds
+        session: HTTP session to reuse connections (default: module-level requests)
+        limiter: Shared rate limiter; one token is taken per page request
 
     Returns:
         List of raw post dicts from API
@@ -277,13 +287,17 @@ def fetch_posts_for_day(
         "User-Agent": os.getenv("ORBIT_USER_AGENT", "ORBIT/1.0 (Educational project; +https://github.com/calebyhan/orbit)"),
     }
 
+    http = session or requests
+
     all_posts = []
     page = 0
     max_pages = 100  # Safety limit to prevent infinite loops
 
     while page < max_pages:
+        if limiter is not None:
+            limiter.acquire()
         try:
-            response = requests.get(
+            response = http.get(
                 ARCTIC_API_BASE,
                 params=params,
                 headers=headers,
@@ -327,6 +341,7 @@ def backfill_social(
     data_dir: Optional[Path] = None,
     resume: bool = True,
     reset: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> dict:
     """Backfill historical Reddit posts from Arctic Shift API.
 
@@ -334,6 +349,12 @@ def backfill_social(
     Implements checkpoint/resume for reliability.
     By default, scans existing date partitions and skips already-ingested dates.
 
+    Up to `concurrency` (date, subreddit) fetches run on a thread pool, each
+    thread reusing its own HTTP session, behind one TokenBucket at TARGET_RPS.
+    Results are normalized and written in (date, subreddit) order, exactly as
+    in the sequential case. Each write appends a part file to its date
+    partition; partitions are compacted once when the run ends.
+
     Args:
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
@@ -341,6 +362,7 @@ def backfill_social(
         data_dir: Data directory (defaults to ORBIT_DATA_DIR env var)
         resume: Whether to resume from checkpoint if exists
         reset: If True, re-fetch all dates; if False (default), skip existing dates
+        concurrency: Number of (date, subreddit) fetches in flight (default: DEFAULT_CONCURRENCY)
 
     Returns:
         Dict with stats: {
@@ -395,8 +417,8 @@ def backfill_social(
     total_requests = checkpoint["total_requests"] if checkpoint else 0
     start_time = time.time()
 
-    # Calculate request interval (1 / RPS)
-    request_interval = 1.0 / TARGET_RPS
+    # Shared rate limit across all fetch threads
+    limiter = TokenBucket(rate=TARGET_RPS)
 
     # Progress bar
     total_days = len(date_range) * len(subreddits)
@@ -407,29 +429,66 @@ def backfill_social(
         initial=checkpoint["completed_days"] if checkpoint else 0,
     )
 
-    try:
-        for date in date_range:
-            date_str = date.strftime("%Y-%m-%d")
+    completed_dates = list(checkpoint.get("completed_dates", [])) if checkpoint else []
+
+    # Work items in (date, subreddit) order, minus already-ingested pairs
+    work = []
+    for date in date_range:
+        date_str = date.strftime("%Y-%m-%d")
+
+        # Skip if before checkpoint date
+        if checkpoint and date_str < checkpoint["current_date"]:
+            continue
+
+        for subreddit in subreddits:
+            # Skip if already completed (unless reset mode)
+            date_subreddit_key = f"{date_str}_{subreddit}"
+            if not reset and date_subreddit_key in existing_combinations:
+                progress_bar.update(1)
+                continue
 
-            # Skip if before checkpoint date
-            if checkpoint and date_str < checkpoint["current_date"]:
+            # Also skip if in checkpoint (from interrupted run)
+            if date_subreddit_key in completed_dates:
+                progress_bar.update(1)
                 continue
 
-            for subreddit in subreddits:
-                # Skip if already completed (unless reset mode)
-                date_subreddit_key = f"{date_str}_{subreddit}"
-                if not reset and date_subreddit_key in existing_combinations:
-                    progress_bar.update(1)
-                    continue
-
-                # Also skip if in checkpoint (from interrupted run)
-                if checkpoint and date_subreddit_key in checkpoint.get("completed_dates", []):
-                    progress_bar.update(1)
-                    continue
-
-                # Fetch posts for this day/subreddit
-                request_start = time.time()
-                posts = fetch_posts_for_day(subreddit, date)
+            work.append((date, subreddit))
+
+    # Append-only partition writer; compacted once per partition at the end
+    writer = PartitionWriter(data_dir, "social", run_id=run_id)
+
+    # One HTTP session per fetch thread (keeps connections to the host alive)
+    thread_state = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def fetch(date: datetime, subreddit: str) -> list[dict]:
+        if not hasattr(thread_state, "session"):
+            thread_state.session = requests.Session()
+            with sessions_lock:
+                sessions.append(thread_state.session)
+        return fetch_posts_for_day(subreddit, date, session=thread_state.session, limiter=limiter)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            # Sliding window of futures, consumed in submission order
+            pending = deque()
+            work_iter = iter(work)
+
+            def submit_next() -> None:
+                item = next(work_iter, None)
+                if item is not None:
+                    pending.append((item, executor.submit(fetch, *item)))
+
+            for _ in range(max(1, concurrency) * 2):
+                submit_next()
+
+            while pending:
+                (date, subreddit), future = pending.popleft()
+                posts = future.result()
+                submit_next()
+
+                date_str = date.strftime("%Y-%m-%d")
                 total_requests += 1
 
                 # Normalize posts
@@ -453,20 +512,11 @@ def backfill_social(
                     if not pd.api.types.is_datetime64_any_dtype(df["created_utc"]):
                         df["created_utc"] = pd.to_datetime(df["created_utc"], utc=True)
 
-                    # Save to date-partitioned parquet
-                    output_path = data_dir / "raw" / "social" / f"date={date_str}" / "social.parquet"
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # Append to existing file if it exists
-                    if output_path.exists():
-                        existing_df = pd.read_parquet(output_path)
-                        df = pd.concat([existing_df, df], ignore_index=True)
-                        # Deduplicate by id
-                        df = df.drop_duplicates(subset=["id"], keep="first")
-
-                    df.to_parquet(output_path, index=False, engine="pyarrow", compression="snappy")
+                    # Append a part file to the date partition (ids already stored are dropped)
+                    writer.write(date_str, df)
 
                 total_posts += len(matched_posts)
+                completed_dates.append(f"{date_str}_{subreddit}")
 
                 # Update progress bar
                 elapsed = time.time() - start_time
@@ -485,18 +535,20 @@ def backfill_social(
                         "total_requests": total_requests,
                         "current_date": date_str,
                         "completed_days": progress_bar.n,
-                        "completed_dates": checkpoint.get("completed_dates", []) + [f"{date_str}_{subreddit}"],
+                        "completed_dates": completed_dates,
                     }
                     save_checkpoint(checkpoint_file, checkpoint_data)
 
-                # Rate limiting - ensure we don't exceed target RPS
-                request_duration = time.time() - request_start
-                sleep_time = request_interval - request_duration
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-
     finally:
         progress_bar.close()
+        for session in sessions:
+            session.close()
+        # Part files stay readable if compaction fails; never mask the error that ended the run
+        try:
+            compacted = writer.compact()
+            print(f"✓ Compacted {compacted} social partitions")
+        except Exception as e:
+            print(f"⚠ Compaction failed ({e}); run `orbit ops compact` to fold part files later")
 
     # Calculate final stats
     elapsed_time = time.time() - start_time
@@ -553,6 +605,12 @@ def main():
         action="store_true",
         help="Don't resume from checkpoint (start fresh)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Fetches in flight under the shared {TARGET_RPS} RPS limit (default: {DEFAULT_CONCURRENCY})",
+    )
 
     args = parser.parse_args()
 
@@ -563,6 +621,7 @@ def main():
         subreddits=args.subreddits,
         data_dir=args.data_dir,
         resume=not args.no_resume,
+        concurrency=args.concurrency,
     )
 
 
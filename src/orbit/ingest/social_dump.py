@@ -0,0 +1,278 @@
+"""ORBIT Social Dump Ingest - offline Reddit history from Pushshift/Arctic Shift dumps.
+
+Bootstraps raw/social history from submission dump files (.zst, .zst_blocks,
+.jsonl) instead of the rate-limited Arctic Shift API.
+
+Two phases, both on one process pool:
+1. Scan: one task per dump file. Each worker streams record batches, keeps
+   on-topic posts from the selected subreddits, normalizes them exactly like
+   the API backfill (normalize_arctic_post), and writes per-date staging
+   parts under ORBIT_DATA_DIR/staging/social_dump/<run_id>/.
+2. Merge: one task per date partition, so each raw/social/date=YYYY-MM-DD/
+   has a single writer in the run. Staged posts are deduplicated by post id
+   against each other and against every file already in the partition
+   (social.parquet and part files of API backfills), then appended as one
+   part file.
+
+Dump files are zstd streams and cannot be split, so parallelism is across
+files (e.g. monthly RS_YYYY-MM.zst or per-subreddit dumps).
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from tqdm import tqdm
+
+from orbit import io as orbit_io
+from orbit.ingest import social_arctic
+from orbit.ingest.reddit_utils import fileStreams
+
+
+DUMP_EXTENSIONS = (".zst", ".zst_blocks", ".jsonl")
+STAGING_FLUSH_ROWS = 50_000  # Rows buffered per worker before writing staging parts
+
+
+def find_dump_files(paths: list) -> list[Path]:
+    """Expand files and directories into a sorted list of dump files.
+
+    Args:
+        paths: Dump files and/or directories containing them
+
+    Returns:
+        Sorted list of dump file paths
+    """
+    files = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.name.endswith(DUMP_EXTENSIONS))
+        elif path.name.endswith(DUMP_EXTENSIONS):
+            files.add(path)
+    return sorted(files)
+
+
+def _is_on_topic(post: dict) -> bool:
+    """Same off-topic rule as normalize_arctic_post, without normalizing the post."""
+    body = post.get("selftext") or ""
+    if body in ("[removed]", "[deleted]"):
+        body = ""
+    return "off-topic" not in social_arctic.extract_matched_terms(post.get("title") or "", body)
+
+
+def _write_staging(rows: list[dict], staging_dir: Path, prefix: str) -> None:
+    """Write buffered rows as one staging part per date partition."""
+    df = pd.DataFrame(rows)
+    for date_str, part in df.groupby(df["created_utc"].dt.strftime("%Y-%m-%d"), sort=False):
+        part_dir = staging_dir / f"date={date_str}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(part_dir / f"{prefix}.parquet", index=False, engine="pyarrow", compression="snappy")
+
+
+def scan_dump_file(
+    path: str,
+    file_index: int,
+    staging_dir: str,
+    subreddits: list[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    run_id: str,
+) -> dict:
+    """Filter and normalize one dump file into per-date staging parts (worker task).
+
+    Args:
+        path: Dump file path
+        file_index: Position of the file in the run (orders staging parts)
+        staging_dir: Staging directory for this run
+        subreddits: Subreddits to keep (case-insensitive)
+        start_date: First UTC date to keep (YYYY-MM-DD), or None
+        end_date: Last UTC date to keep (YYYY-MM-DD), or None
+        run_id: Run identifier
+
+    Returns:
+        Dict with stats: {"file", "records_read", "posts_kept"}
+    """
+    wanted = {s.lower() for s in subreddits}
+    start_ts = pd.Timestamp(start_date, tz="UTC") if start_date else None
+    end_ts = pd.Timestamp(end_date, tz="UTC") + pd.Timedelta(days=1) if end_date else None
+    received_at = datetime.now(timezone.utc)
+
+    records_read = 0
+    posts_kept = 0
+    rows = []
+    n_parts = 0
+
+    with open(path, "rb") as f:
+        batches = fileStreams.getFileJsonBatches(str(path), f)
+        for batch in batches or []:
+            records_read += len(batch)
+            for post in batch:
+                # Submissions only (comment dumps have no title)
+                if post.get("title") is None or not post.get("id"):
+                    continue
+                if str(post.get("subreddit", "")).lower() not in wanted:
+                    continue
+                try:
+                    post["created_utc"] = int(float(post["created_utc"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if not _is_on_topic(post):
+                    continue
+
+                row = social_arctic.normalize_arctic_post(post, received_at, run_id)
+                if start_ts is not None and row["created_utc"] < start_ts:
+                    continue
+                if end_ts is not None and row["created_utc"] >= end_ts:
+                    continue
+                rows.append(row)
+
+            if len(rows) >= STAGING_FLUSH_ROWS:
+                _write_staging(rows, Path(staging_dir), f"{file_index:05d}-{n_parts:05d}")
+                posts_kept += len(rows)
+                n_parts += 1
+                rows = []
+
+    if rows:
+        _write_staging(rows, Path(staging_dir), f"{file_index:05d}-{n_parts:05d}")
+        posts_kept += len(rows)
+
+    return {"file": str(path), "records_read": records_read, "posts_kept": posts_kept}
+
+
+def merge_partition(partition_dir: str, dataset_dir: str, date: str, run_id: str) -> int:
+    """Merge staged parts of one date into its raw/social partition (single writer).
+
+    Existing rows win over staged rows with the same id, matching the
+    API backfill's append behaviour. New rows are written with
+    orbit_io.append_partition (hidden temp file hard-linked into place), so
+    existing files are never rewritten and a crash leaves no partial file.
+
+    Args:
+        partition_dir: Staging directory for the date (date=YYYY-MM-DD)
+        dataset_dir: raw/social dataset directory
+        date: Partition date (YYYY-MM-DD)
+        run_id: Run identifier used in the part file name
+
+    Returns:
+        Number of rows appended to the partition
+    """
+    frames = [pd.read_parquet(p) for p in sorted(Path(partition_dir).glob("*.parquet"))]
+    if not frames:
+        return 0
+
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates(subset=["id"], keep="first")
+
+    existing = orbit_io.read_partition(dataset_dir, date, columns=["id"])
+    if not existing.empty:
+        df = df[~df["id"].isin(existing["id"])]
+    if df.empty:
+        return 0  # Every staged row is already in the partition
+
+    df = df.sort_values("created_utc", kind="stable").reset_index(drop=True)
+    orbit_io.append_partition(df, dataset_dir, date, run_id=run_id)
+    return len(df)
+
+
+def ingest_social_dumps(
+    paths: list,
+    data_dir: Optional[Path] = None,
+    subreddits: Optional[list[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> dict:
+    """Ingest Reddit submission dumps into date-partitioned raw/social Parquet.
+
+    Args:
+        paths: Dump files and/or directories of dump files
+        data_dir: Data directory (defaults to ORBIT_DATA_DIR env var)
+        subreddits: Subreddits to keep (default: DEFAULT_SUBREDDITS)
+        start_date: First UTC date to keep (YYYY-MM-DD), or None for all
+        end_date: Last UTC date to keep (YYYY-MM-DD), or None for all
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        Dict with stats: {
+            "run_id": str,
+            "files": int,
+            "records_read": int,
+            "posts_kept": int,
+            "partitions_written": int,
+            "elapsed_time": float,
+        }
+    """
+    if data_dir is None:
+        data_dir = Path(os.getenv("ORBIT_DATA_DIR", "./data"))
+    data_dir = Path(data_dir)
+    subreddits = subreddits or social_arctic.DEFAULT_SUBREDDITS
+    workers = workers or os.cpu_count() or 1
+
+    files = find_dump_files(paths)
+    if not files:
+        raise ValueError(f"No dump files ({', '.join(DUMP_EXTENSIONS)}) found in: {paths}")
+
+    # The pid keeps runs started in the same second apart: run_id names both
+    # the staging directory (removed when the run ends) and the part files
+    run_id = f"{datetime.now(timezone.utc):%Y%m%d_%H%M%S}_{os.getpid()}_dump"
+    staging_dir = data_dir / "staging" / "social_dump" / run_id
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    start_time = time.time()
+    records_read = 0
+    posts_kept = 0
+    partitions_written = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Phase 1: scan dump files in parallel into staging parts
+            futures = [
+                executor.submit(
+                    scan_dump_file, str(path), index, str(staging_dir),
+                    subreddits, start_date, end_date, run_id,
+                )
+                for index, path in enumerate(files)
+            ]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Scanning dumps", unit="file"):
+                result = future.result()
+                records_read += result["records_read"]
+                posts_kept += result["posts_kept"]
+
+            # Phase 2: one writer per date partition
+            partitions = sorted(p for p in staging_dir.iterdir() if p.name.startswith("date="))
+            futures = [
+                executor.submit(
+                    merge_partition,
+                    str(partition),
+                    str(data_dir / "raw" / "social"),
+                    partition.name[len("date="):],
+                    run_id,
+                )
+                for partition in partitions
+            ]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Merging partitions", unit="day"):
+                if future.result() > 0:
+                    partitions_written += 1
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    elapsed_time = time.time() - start_time
+
+    print("\n✓ Dump ingest complete!")
+    print(f"  Files: {len(files)}")
+    print(f"  Records read: {records_read:,}")
+    print(f"  Posts kept: {posts_kept:,}")
+    print(f"  Partitions written: {partitions_written}")
+
+    return {
+        "run_id": run_id,
+        "files": len(files),
+        "records_read": records_read,
+        "posts_kept": posts_kept,
+        "partitions_written": partitions_written,
+        "elapsed_time": elapsed_time,
+    }
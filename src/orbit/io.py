@@ -12,19 +12,24 @@ Without ORBIT_DATA_DIR set, operations default to ./data which should
 ONLY contain sample data and production models (never raw/curated/features/scores).
 """
 
+import hashlib
 import os
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import pandas as pd
 
 # Try to import pyarrow, fall back to fastparquet
 try:
     import pyarrow as pa
+    import pyarrow.dataset as pads
     import pyarrow.parquet as pq
     PARQUET_ENGINE = "pyarrow"
 except ImportError:
     pa = None
+    pads = None
     pq = None
     PARQUET_ENGINE = "fastparquet"
 
@@ -99,6 +104,8 @@ def read_parquet(
 ) -> pd.DataFrame:
     """Read Parquet file(s) with optional column selection and filtering.
 
+    For date ranges of date=YYYY-MM-DD partitioned datasets use scan().
+
     Args:
         path: File or directory path (relative paths resolved from ORBIT_DATA_DIR)
         columns: Optional list of columns to read (None = all)
@@ -179,6 +186,469 @@ def write_parquet(
     )
 
 
+# Next part number per (partition directory, run_id) within this process
+_PART_COUNTERS: dict[tuple[str, str], int] = {}
+_PART_COUNTERS_LOCK = threading.Lock()
+
+# Re-list a partition if a compaction (orbit ops compact) swaps files mid-read
+READ_PARTITION_ATTEMPTS = 3
+
+# Arrow IPC cache schema metadata key holding the source files' fingerprint
+CACHE_FINGERPRINT_METADATA_KEY = b"orbit.cache_fingerprint"
+
+
+def _resolve(path: Union[str, Path]) -> Path:
+    """Resolve relative paths from ORBIT_DATA_DIR."""
+    path = Path(path)
+    if not path.is_absolute():
+        path = get_data_dir() / path
+    return path
+
+
+def _next_part_number(directory: Path, run_id: str) -> int:
+    """Claim the next free part number for run_id in a partition directory."""
+    key = (str(directory), run_id)
+    prefix = f"part-{run_id}-"
+    with _PART_COUNTERS_LOCK:
+        if key not in _PART_COUNTERS:
+            numbers = [
+                int(p.stem[len(prefix):])
+                for p in directory.glob(f"{prefix}*.parquet")
+                if p.stem[len(prefix):].isdigit()
+            ]
+            _PART_COUNTERS[key] = max(numbers, default=-1) + 1
+        number = _PART_COUNTERS[key]
+        _PART_COUNTERS[key] = number + 1
+    return number
+
+
+def partition_files(directory: Union[str, Path]) -> list[Path]:
+    """Data files of a date partition: canonical files first, then part files in order.
+
+    Hidden files (temp files of in-flight writes) are ignored.
+
+    Args:
+        directory: Partition directory (e.g. raw/news/date=2024-11-05)
+
+    Returns:
+        Sorted list of Parquet files
+    """
+    directory = _resolve(directory)
+    if not directory.is_dir():
+        return []
+    files = [
+        p for p in directory.glob("*.parquet")
+        if not p.name.startswith((".", "_"))
+    ]
+    return sorted(files, key=lambda p: (p.name.startswith("part-"), p.name))
+
+
+def append_partition(
+    df: pd.DataFrame,
+    dataset: Union[str, Path],
+    date: str,
+    run_id: Optional[str] = None,
+    compression: str = "snappy",
+) -> Optional[Path]:
+    """Append rows to a date partition as a new numbered part file.
+
+    Writes `<dataset>/date=<date>/part-<run_id>-<n>.parquet` via a hidden temp
+    file that is hard-linked into place, so readers never see a partial file
+    and flushes of the same day never overwrite each other, even from separate
+    processes sharing a run_id (a number already taken moves on to the next).
+    Cost is O(len(df)), independent of how much the partition already holds.
+
+    Args:
+        df: Rows to append
+        dataset: Dataset directory (relative paths resolved from ORBIT_DATA_DIR)
+        date: Partition date (YYYY-MM-DD)
+        run_id: Writer run identifier (default: UTC timestamp + pid)
+        compression: Compression codec (default: snappy)
+
+    Returns:
+        Path of the written part file, or None if df is empty
+
+    Examples:
+        >>> append_partition(df, "raw/news", "2024-11-05", run_id="20241105_093000")
+        PosixPath('/srv/orbit/data/raw/news/date=2024-11-05/part-20241105_093000-00000.parquet')
+    """
+    if df.empty:
+        return None
+
+    if run_id is None:
+        run_id = f"{datetime.now(timezone.utc):%Y%m%d_%H%M%S}_{os.getpid()}"
+
+    directory = _resolve(dataset) / f"date={date}"
+    directory.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = directory / f".part-{run_id}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+    # Warn if writing production data to repo directory
+    _warn_if_writing_to_repo(tmp_path)
+
+    try:
+        df.to_parquet(tmp_path, engine=PARQUET_ENGINE, compression=compression, index=False)
+        # Publish with a hard link, which fails instead of replacing: another
+        # process writing the same run_id may already hold this part number
+        while True:
+            path = directory / f"part-{run_id}-{_next_part_number(directory, run_id):05d}.parquet"
+            try:
+                os.link(tmp_path, path)
+                break
+            except FileExistsError:
+                continue
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def read_partition(
+    dataset: Union[str, Path],
+    date: str,
+    columns: Optional[list[str]] = None,
+    id_column: Optional[str] = None,
+    cache: bool = False,
+) -> pd.DataFrame:
+    """Read every data file of a date partition as one DataFrame.
+
+    Args:
+        dataset: Dataset directory (relative paths resolved from ORBIT_DATA_DIR)
+        date: Partition date (YYYY-MM-DD)
+        columns: Optional list of columns to read (None = all)
+        id_column: If set, drop duplicate ids (first file in partition_files order wins)
+        cache: Read through the Arrow IPC cache (see read_cached_partition)
+
+    Returns:
+        DataFrame with the partition's rows (empty if the partition has no files)
+    """
+    if cache:
+        table = read_cached_partition(dataset, date)
+        if table is None or table.num_rows == 0:
+            return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+        df = (table.select(columns) if columns else table).to_pandas()
+        if id_column is not None:
+            df = df.drop_duplicates(subset=[id_column], keep="first").reset_index(drop=True)
+        return df
+
+    directory = _resolve(dataset) / f"date={date}"
+    for attempt in range(READ_PARTITION_ATTEMPTS):
+        try:
+            files = partition_files(directory)
+            frames = [pd.read_parquet(p, columns=columns, engine=PARQUET_ENGINE) for p in files]
+            break
+        except FileNotFoundError:
+            # A compaction deleted a merged file after we listed it; list again
+            if attempt == READ_PARTITION_ATTEMPTS - 1:
+                raise
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    if id_column is not None:
+        df = df.drop_duplicates(subset=[id_column], keep="first").reset_index(drop=True)
+    return df
+
+
+def get_cache_dir() -> Path:
+    """Directory of the Arrow IPC partition cache (ORBIT_DATA_DIR/cache)."""
+    return get_data_dir() / "cache"
+
+
+def _partition_fingerprint(files: list[Path]) -> bytes:
+    """Fingerprint of a partition's files from their names, sizes and mtimes."""
+    digest = hashlib.sha256()
+    for path in files:
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest().encode()
+
+
+def partition_fingerprint(directory: Union[str, Path]) -> str:
+    """Fingerprint of a partition's data files.
+
+    Changes whenever a file is added, removed or rewritten (name, size and
+    mtime of every file in partition_files order).
+
+    Args:
+        directory: Partition directory (e.g. raw/news/date=2024-11-05)
+
+    Returns:
+        Hex digest (the digest of no files for a missing partition)
+    """
+    return _partition_fingerprint(partition_files(directory)).decode()
+
+
+def _cache_path(directory: Path) -> Path:
+    """Cache file of a partition directory, mirroring its path under the data dir."""
+    directory = directory.resolve()
+    try:
+        relative = directory.relative_to(get_data_dir().resolve())
+    except ValueError:
+        # Dataset outside ORBIT_DATA_DIR: key by absolute path
+        key = hashlib.sha256(str(directory.parent).encode()).hexdigest()[:16]
+        relative = Path("_external") / key / directory.name
+    return get_cache_dir() / relative.parent / f"{relative.name}.arrow"
+
+
+def read_cached_partition(dataset: Union[str, Path], date: str) -> Optional["pa.Table"]:
+    """Read a date partition as a memory-mapped Arrow table, materializing it if needed.
+
+    The partition's files are concatenated once (in partition_files order)
+    into an uncompressed Arrow IPC (Feather v2) file under get_cache_dir().
+    Later reads memory-map that file, so they skip Parquet decoding and
+    share pages with other processes reading the same partition. The cache
+    entry records a fingerprint of the source files (name, size, mtime) in
+    its schema metadata and is rebuilt whenever the partition changes.
+
+    Args:
+        dataset: Dataset directory (relative paths resolved from ORBIT_DATA_DIR)
+        date: Partition date (YYYY-MM-DD)
+
+    Returns:
+        Arrow table with all rows and columns of the partition (not deduplicated),
+        or None if the partition has no files
+    """
+    if pa is None:
+        raise ImportError("The Arrow IPC cache requires pyarrow (pip install pyarrow)")
+
+    directory = _resolve(dataset) / f"date={date}"
+    for attempt in range(READ_PARTITION_ATTEMPTS):
+        try:
+            files = partition_files(directory)
+            if not files:
+                return None
+            fingerprint = _partition_fingerprint(files)
+
+            path = _cache_path(directory)
+            if path.exists():
+                try:
+                    reader = pa.ipc.open_file(pa.memory_map(str(path)))
+                    if (reader.schema.metadata or {}).get(CACHE_FINGERPRINT_METADATA_KEY) == fingerprint:
+                        return reader.read_all()
+                except pa.ArrowInvalid:
+                    pass  # Truncated or foreign file: rebuild
+
+            frames = [pd.read_parquet(p, engine=PARQUET_ENGINE) for p in files]
+            break
+        except FileNotFoundError:
+            # A compaction deleted a merged file after we listed it; list again
+            if attempt == READ_PARTITION_ATTEMPTS - 1:
+                raise
+
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[CACHE_FINGERPRINT_METADATA_KEY] = fingerprint
+    table = table.replace_schema_metadata(metadata)
+
+    # Write uncompressed (memory-mappable) and swap in atomically for concurrent readers
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return table
+
+
+def clear_cache(dataset: Optional[Union[str, Path]] = None) -> int:
+    """Delete Arrow IPC cache entries.
+
+    Args:
+        dataset: Only clear entries of this dataset directory (None = whole cache)
+
+    Returns:
+        Number of cache files deleted
+    """
+    root = get_cache_dir()
+    if dataset is not None:
+        root = _cache_path(_resolve(dataset) / "date=_").parent
+    if not root.is_dir():
+        return 0
+    removed = 0
+    for path in root.rglob("*.arrow"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def partition_dates(
+    dataset: Union[str, Path],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> list[str]:
+    """Dates (YYYY-MM-DD) of a dataset's date= partitions within [start, end].
+
+    Args:
+        dataset: Dataset directory (relative paths resolved from ORBIT_DATA_DIR)
+        start: First date to include, or None
+        end: Last date to include, or None
+
+    Returns:
+        Sorted list of partition dates
+    """
+    root = _resolve(dataset)
+    if not root.is_dir():
+        return []
+    dates = []
+    for directory in root.glob("date=*"):
+        date = directory.name[len("date="):]
+        if directory.is_dir() and (start is None or date >= start) and (end is None or date <= end):
+            dates.append(date)
+    return sorted(dates)
+
+
+def _dataset_schema(schemas: Iterator["pa.Schema"]) -> Optional["pa.Schema"]:
+    """Schema of a scan: the first schema, with all-null fields typed from later ones.
+
+    A part written while a column was entirely null (e.g. no article had a
+    summary) stores it as the null type; taken as the dataset schema, that
+    type cannot hold the strings of later parts. Later schemas are only
+    read while such fields remain.
+
+    Args:
+        schemas: Schemas of the scanned files/tables, in scan order
+
+    Returns:
+        Schema without metadata, or None if there are no schemas
+    """
+    schemas = iter(schemas)
+    first = next(schemas, None)
+    if first is None:
+        return None
+    schema = first.remove_metadata()
+
+    for other in schemas:
+        unresolved = [i for i, field in enumerate(schema) if pa.types.is_null(field.type)]
+        if not unresolved:
+            break
+        for i in unresolved:
+            field = schema.field(i)
+            index = other.get_field_index(field.name)
+            if index >= 0 and not pa.types.is_null(other.field(index).type):
+                schema = schema.set(i, field.with_type(other.field(index).type))
+    return schema
+
+
+def _cached_dataset(root: Path, dates: list[str]) -> Optional["pads.Dataset"]:
+    """In-memory dataset over the cached tables of some partitions, with a `date` column.
+
+    Like a Parquet dataset scan, the first partition's schema wins (with
+    all-null fields promoted, see _dataset_schema): later partitions gain
+    null columns for missing fields and drop extra ones.
+    """
+    tables = []
+    for date in dates:
+        table = read_cached_partition(root, date)
+        if table is not None:
+            tables.append(table.append_column("date", pa.repeat(date, table.num_rows)))
+    if not tables:
+        return None
+
+    schema = _dataset_schema(table.schema for table in tables)
+    conformed = []
+    for table in tables:
+        arrays = [
+            table.column(field.name).cast(field.type) if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        conformed.append(pa.Table.from_arrays(arrays, schema=schema))
+    return pads.dataset(conformed)
+
+
+def scan(
+    dataset: Union[str, Path],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    filters=None,
+    id_column: Optional[str] = None,
+    dates: Optional[list[str]] = None,
+    batches: bool = False,
+    batch_size: int = 131_072,
+    cache: bool = False,
+) -> Union[pd.DataFrame, Iterator["pa.RecordBatch"]]:
+    """Read a date range of a hive-partitioned dataset in one pyarrow scan.
+
+    Partitions outside [start, end] are pruned before any file is opened,
+    only the requested columns are decoded, and filters are pushed down to
+    Parquet row-group statistics. The partition value is exposed as a string
+    `date` column. Files within a partition are read in partition_files order
+    (hidden and `_` files are skipped), so id dedupe matches read_partition.
+
+    Args:
+        dataset: Dataset directory (relative paths resolved from ORBIT_DATA_DIR)
+        start: First partition date (YYYY-MM-DD), or None
+        end: Last partition date (YYYY-MM-DD), or None
+        columns: Optional list of columns to read, may include "date" (None = all)
+        filters: pyarrow.dataset Expression or DNF list like [("is_dupe", "==", False)]
+        id_column: If set, drop duplicate ids (first copy wins; DataFrame output only)
+        dates: Optional explicit partition dates to read (intersected with [start, end])
+        batches: Return an iterator of pyarrow RecordBatches instead of a DataFrame
+        batch_size: Maximum rows per record batch
+        cache: Scan memory-mapped Arrow IPC cache entries instead of Parquet
+            (see read_cached_partition; filters are applied after the cache read)
+
+    Returns:
+        DataFrame (empty if no files match), or iterator of RecordBatches
+
+    Examples:
+        >>> df = scan("raw/news", "2024-10-01", "2024-12-31", columns=["date", "msg_id", "headline"])
+        >>> for batch in scan("curated/social", "2024-01-01", "2024-12-31", batches=True):
+        ...     process(batch)
+    """
+    if pads is None:
+        raise ImportError("orbit.io.scan requires pyarrow (pip install pyarrow)")
+    if batches and id_column is not None:
+        raise ValueError("id_column dedupe is only supported for DataFrame output")
+
+    root = _resolve(dataset)
+    selected = partition_dates(root, start, end)
+    if dates is not None:
+        wanted = set(dates)
+        selected = [date for date in selected if date in wanted]
+    if cache:
+        data = _cached_dataset(root, selected)
+    else:
+        files = [
+            str(path)
+            for date in selected
+            for path in partition_files(root / f"date={date}")
+        ]
+        data = None
+        if files:
+            schema = _dataset_schema(pq.read_schema(path) for path in files)
+            if "date" not in schema.names:
+                schema = schema.append(pa.field("date", pa.string()))
+            data = pads.dataset(
+                files,
+                schema=schema,
+                format="parquet",
+                partitioning=pads.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+                partition_base_dir=str(root),
+            )
+    if data is None:
+        if batches:
+            return iter(())
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+
+    if filters is not None and not isinstance(filters, pads.Expression):
+        filters = pq.filters_to_expression(filters)
+
+    scanner = data.scanner(columns=columns, filter=filters, batch_size=batch_size)
+    if batches:
+        return iter(scanner.to_batches())
+
+    df = scanner.to_table().to_pandas()
+    if id_column is not None:
+        df = df.drop_duplicates(subset=[id_column], keep="first").reset_index(drop=True)
+    return df
+
+
 def validate_schema(
     df: pd.DataFrame,
     required_columns: list[str],
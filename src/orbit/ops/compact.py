@@ -0,0 +1,307 @@
+"""ORBIT Ops - Compaction of small Parquet part files.
+
+Streaming and backfill writers append one small part file per flush
+(orbit.io.append_partition), so a busy day can hold hundreds of files. This
+job merges each date partition into a few size-targeted files whose rows are
+deduplicated on the id column and sorted by timestamp, so row groups carry
+tight min/max statistics for predicate pushdown.
+
+Swap protocol (compactors hold an exclusive flock on <partition>/.compact.lock
+for all three steps, so two compactors of one partition never interleave and
+one cannot replace output that already folded in files the other deleted;
+writers and readers take no lock):
+1. List the partition's files (only these are merged; parts appended later
+   are left for the next pass).
+2. Write every merged output to a hidden temp file, then publish each with
+   os.replace under a new generation's names, <dataset>-g<gen>-<index>.parquet,
+   where <gen> is one past the newest generation among the inputs. Output
+   names therefore never collide with an input, and they sort ahead of part
+   files so they win id dedupe in orbit.io.read_partition.
+3. Only once every output is published, delete the merged inputs.
+
+A failure or crash before step 3 leaves all inputs in place; any outputs
+already published hold copies of their rows and are merged again by the next
+pass. Between steps 2 and 3 a reader sees old and new files together;
+duplicate ids are dropped by read_partition. A reader that listed a file
+deleted in step 3 retries the listing (read_partition handles
+FileNotFoundError).
+
+Implements: orbit ops compact
+"""
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from orbit import io as orbit_io
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: fall back to a process-local lock
+    fcntl = None
+
+
+# (id column, sort column) per raw dataset
+DATASET_KEYS = {
+    "news": ("msg_id", "published_at"),
+    "social": ("id", "created_utc"),
+}
+
+DEFAULT_TARGET_FILE_MB = 128
+DEFAULT_ROW_GROUP_ROWS = 100_000
+
+LOCK_FILE_NAME = ".compact.lock"
+
+_local_locks: dict = {}
+_local_locks_guard = threading.Lock()
+
+
+def _output_name(dataset: str, generation: int, index: int) -> str:
+    """Name of the index-th compacted file of a partition's given generation."""
+    return f"{dataset}-g{generation:06d}-{index:05d}.parquet"
+
+
+def _next_generation(dataset: str, inputs: list[Path]) -> int:
+    """Generation one past the newest compacted input.
+
+    Files not named by _output_name (part files, legacy <dataset>.parquet)
+    count as generation 0.
+    """
+    pattern = re.compile(rf"{re.escape(dataset)}-g(\d+)-\d+\.parquet")
+    generations = [
+        int(match.group(1))
+        for match in (pattern.fullmatch(p.name) for p in inputs)
+        if match
+    ]
+    return max(generations, default=0) + 1
+
+
+@contextmanager
+def _partition_lock(directory: Path):
+    """Hold the partition's exclusive compaction lock.
+
+    Uses flock on <partition>/.compact.lock (hidden, so partition_files skips
+    it); each call opens its own descriptor, so the lock also excludes other
+    threads of this process. Without fcntl only same-process compactors are
+    serialized.
+    """
+    if fcntl is None:
+        with _local_locks_guard:
+            lock = _local_locks.setdefault(directory.resolve(), threading.Lock())
+        with lock:
+            yield
+        return
+
+    with open(directory / LOCK_FILE_NAME, "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def compact_partition(
+    directory: Path,
+    id_column: str,
+    sort_column: Optional[str] = None,
+    target_file_mb: float = DEFAULT_TARGET_FILE_MB,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    min_files: int = 2,
+) -> Optional[dict]:
+    """Merge the data files of one date partition.
+
+    Args:
+        directory: Partition directory (e.g. raw/news/date=2024-11-05)
+        id_column: Column to deduplicate on (first copy wins, canonical files first)
+        sort_column: Column to sort rows by (None keeps file order)
+        target_file_mb: Approximate maximum size of each output file
+        row_group_rows: Rows per Parquet row group
+        min_files: Skip partitions with fewer files than this
+
+    Returns:
+        Dict with stats {"files_in", "files_out", "rows_in", "rows_out"},
+        or None if the partition was skipped (too few files, or its inputs
+        disappeared while being read). Concurrent compactors of one partition
+        are serialized by the partition lock.
+    """
+    directory = Path(directory)
+    with _partition_lock(directory):
+        return _compact_locked(
+            directory, id_column, sort_column, target_file_mb, row_group_rows, min_files
+        )
+
+
+def _compact_locked(
+    directory: Path,
+    id_column: str,
+    sort_column: Optional[str],
+    target_file_mb: float,
+    row_group_rows: int,
+    min_files: int,
+) -> Optional[dict]:
+    """Body of compact_partition; the caller holds the partition lock."""
+    dataset = directory.parent.name
+    inputs = orbit_io.partition_files(directory)
+    if len(inputs) < min_files:
+        return None
+
+    try:
+        frames = [pd.read_parquet(p) for p in inputs]
+        input_bytes = sum(p.stat().st_size for p in inputs)
+    except FileNotFoundError:
+        return None  # Inputs removed underneath us (e.g. partition deleted)
+
+    df = pd.concat(frames, ignore_index=True)
+    rows_in = len(df)
+    df = df.drop_duplicates(subset=[id_column], keep="first")
+    if sort_column is not None and sort_column in df.columns:
+        df = df.sort_values(sort_column, kind="stable")
+    df = df.reset_index(drop=True)
+
+    # Size outputs from the compressed bytes per row of the inputs
+    bytes_per_row = max(1.0, input_bytes / max(rows_in, 1))
+    rows_per_file = max(1, int(target_file_mb * 1024 * 1024 / bytes_per_row))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    generation = _next_generation(dataset, inputs)
+    suffix = f"{os.getpid()}-{threading.get_ident()}.tmp"
+    staged = []
+    try:
+        # Write every output before publishing any, so a failed write leaves
+        # the partition exactly as it was
+        for index, offset in enumerate(range(0, max(len(df), 1), rows_per_file)):
+            path = directory / _output_name(dataset, generation, index)
+            tmp_path = directory / f".{path.name}.{suffix}"
+            staged.append((tmp_path, path))
+            pq.write_table(
+                table.slice(offset, rows_per_file),
+                tmp_path,
+                compression="snappy",
+                row_group_size=row_group_rows,
+            )
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    except BaseException:
+        for tmp_path, _ in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    outputs = [path for _, path in staged]
+
+    # Every output exists; the merged inputs are now redundant
+    for path in inputs:
+        path.unlink(missing_ok=True)
+
+    return {
+        "files_in": len(inputs),
+        "files_out": len(outputs),
+        "rows_in": rows_in,
+        "rows_out": len(df),
+    }
+
+
+def compact_dataset(
+    dataset: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    data_dir: Optional[Path] = None,
+    target_file_mb: float = DEFAULT_TARGET_FILE_MB,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    min_files: int = 2,
+) -> dict:
+    """Compact every date partition of a raw dataset.
+
+    Args:
+        dataset: Raw dataset name ("news" or "social")
+        start_date: First partition date to compact (YYYY-MM-DD), or None
+        end_date: Last partition date to compact (YYYY-MM-DD), or None
+        data_dir: Data directory (defaults to ORBIT_DATA_DIR)
+        target_file_mb: Approximate maximum size of each output file
+        row_group_rows: Rows per Parquet row group
+        min_files: Skip partitions with fewer files than this
+
+    Returns:
+        Dict with stats: {
+            "partitions_compacted": int,
+            "partitions_skipped": int,
+            "files_in": int,
+            "files_out": int,
+            "duplicates_dropped": int,
+        }
+    """
+    if dataset not in DATASET_KEYS:
+        raise ValueError(f"Unknown dataset: {dataset!r} (expected one of {sorted(DATASET_KEYS)})")
+    id_column, sort_column = DATASET_KEYS[dataset]
+
+    if data_dir is None:
+        data_dir = orbit_io.get_data_dir()
+    root = Path(data_dir) / "raw" / dataset
+
+    stats = {
+        "partitions_compacted": 0,
+        "partitions_skipped": 0,
+        "files_in": 0,
+        "files_out": 0,
+        "duplicates_dropped": 0,
+    }
+    if not root.exists():
+        return stats
+
+    for directory in sorted(root.glob("date=*")):
+        date_str = directory.name.replace("date=", "")
+        if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+            continue
+
+        result = compact_partition(
+            directory,
+            id_column=id_column,
+            sort_column=sort_column,
+            target_file_mb=target_file_mb,
+            row_group_rows=row_group_rows,
+            min_files=min_files,
+        )
+        if result is None:
+            stats["partitions_skipped"] += 1
+            continue
+
+        stats["partitions_compacted"] += 1
+        stats["files_in"] += result["files_in"]
+        stats["files_out"] += result["files_out"]
+        stats["duplicates_dropped"] += result["rows_in"] - result["rows_out"]
+        print(f"✓ {dataset} {date_str}: {result['files_in']} → {result['files_out']} files "
+              f"({result['rows_out']} rows, {result['rows_in'] - result['rows_out']} dupes dropped)")
+
+    return stats
+
+
+def run_compaction_service(
+    datasets: list[str],
+    interval_seconds: float = 600.0,
+    max_passes: Optional[int] = None,
+    **kwargs,
+) -> None:
+    """Compact datasets repeatedly, sleeping between passes (Ctrl+C to stop).
+
+    Args:
+        datasets: Raw dataset names to compact each pass
+        interval_seconds: Pause between passes
+        max_passes: Stop after this many passes (None = run until interrupted)
+        **kwargs: Passed to compact_dataset
+    """
+    passes = 0
+    try:
+        while max_passes is None or passes < max_passes:
+            for dataset in datasets:
+                compact_dataset(dataset, **kwargs)
+            passes += 1
+            if max_passes is None or passes < max_passes:
+                time.sleep(interval_seconds)
+    except KeyboardInterrupt:
+        print("\n✓ Compaction service stopped")
@@ -5,9 +5,11 @@ Implements M1 deliverable: Preprocess hooks
 Modules:
 - cutoffs: Time alignment and 15:30 ET cutoff enforcement
 - dedupe: Deduplication and novelty scoring
+- manifest: Partition manifest for incremental preprocessing
+- novelty_index: Rolling simhash reference window for novelty
 - pipeline: Unified preprocessing pipeline
 """
 
-from orbit.preprocess import cutoffs, dedupe, pipeline
+from orbit.preprocess import cutoffs, dedupe, manifest, novelty_index, pipeline
 
-__all__ = ["cutoffs", "dedupe", "pipeline"]
+__all__ = ["cutoffs", "dedupe", "manifest", "novelty_index", "pipeline"]
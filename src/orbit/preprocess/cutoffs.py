@@ -6,8 +6,23 @@ docs/06-preprocessing/time_alignment_cutoffs.md
 Ensures all data respects the 15:30 ET daily cutoff to prevent lookahead bias.
 """
 
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import pytz
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    MO,
+    USLaborDay,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
 from typing import Tuple, Optional
 
 
@@ -22,18 +37,191 @@ CUTOFF_MINUTE = 30
 # Safety lag for training (minutes before cutoff to drop items)
 DEFAULT_SAFETY_LAG_MINUTES = 30
 
+# Dtype of window_calendar rows (all instants as UTC epoch nanoseconds)
+WINDOW_CALENDAR_DTYPE = np.dtype([
+    ('date', 'datetime64[D]'),
+    ('start_utc_ns', np.int64),
+    ('end_utc_ns', np.int64),
+    ('safety_cutoff_utc_ns', np.int64),
+])
+
+# First year the NYSE calendar below is complete for (Election Day was a
+# market holiday through 1980, and earlier closures are not listed)
+NYSE_CALENDAR_START_YEAR = 1981
+
+# Unscheduled full-day NYSE closures (not covered by the holiday rules)
+NYSE_SPECIAL_CLOSURES = (
+    "1985-09-27",  # Hurricane Gloria
+    "1994-04-27",  # National Day of Mourning, Richard Nixon
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",  # September 11 attacks
+    "2004-06-11",  # National Day of Mourning, Ronald Reagan
+    "2007-01-02",  # National Day of Mourning, Gerald Ford
+    "2012-10-29", "2012-10-30",  # Hurricane Sandy
+    "2018-12-05",  # National Day of Mourning, George H. W. Bush
+    "2025-01-09",  # National Day of Mourning, Jimmy Carter
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """NYSE full-day holidays from NYSE_CALENDAR_START_YEAR on.
+
+    New Year's Day on a Saturday is not observed; Martin Luther King Jr. Day
+    is a market holiday only since 1998.
+    """
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday(
+            "Birthday of Martin Luther King, Jr.", month=1, day=1,
+            start_date="1998-01-01", offset=pd.DateOffset(weekday=MO(3)),
+        ),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-06-19", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _year_cutoffs_ns(year: int) -> np.ndarray:
+    """15:30 ET cutoff of every calendar day of a year, as UTC epoch nanoseconds."""
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq='D')
+    # 15:30 is never inside a DST transition, so localizing wall-clock times is exact
+    cutoffs = (days + pd.Timedelta(hours=CUTOFF_HOUR, minutes=CUTOFF_MINUTE)).tz_localize(ET)
+    result = cutoffs.tz_convert(UTC).as_unit('ns').asi8
+    result.setflags(write=False)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _year_sessions(year: int) -> np.ndarray:
+    """NYSE sessions (weekdays that are not holidays or closures) of a year."""
+    if year < NYSE_CALENDAR_START_YEAR:
+        raise ValueError(
+            f"NYSE calendar is only supported from {NYSE_CALENDAR_START_YEAR} (got {year})"
+        )
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq='B')
+    closed = NYSEHolidayCalendar().holidays(f"{year}-01-01", f"{year}-12-31")
+    closed = closed.union(pd.DatetimeIndex(NYSE_SPECIAL_CLOSURES))
+    result = days.difference(closed).to_numpy().astype('datetime64[D]')
+    result.setflags(write=False)
+    return result
+
+
+def _cutoffs_ns(days: np.ndarray) -> np.ndarray:
+    """15:30 ET cutoffs of datetime64[D] days, looked up in the per-year cache."""
+    years = days.astype('datetime64[Y]').astype(int) + 1970
+    first, last = int(years.min()), int(years.max())
+    table = np.concatenate([_year_cutoffs_ns(year) for year in range(first, last + 1)])
+    offsets = (days - np.datetime64(f"{first}-01-01", 'D')).astype(np.int64)
+    return table[offsets]
+
+
+def nyse_sessions(start_date: str, end_date: str) -> np.ndarray:
+    """NYSE trading sessions in [start_date, end_date] as datetime64[D]."""
+    start, end = np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D')
+    years = range(int(str(start)[:4]), int(str(end)[:4]) + 1)
+    sessions = np.concatenate([_year_sessions(year) for year in years])
+    return sessions[(sessions >= start) & (sessions <= end)]
 
-def membership_window(date_T: pd.Timestamp) -> Tuple[pd.Timestamp, pd.Timestamp]:
+
+def _previous_session(day: np.datetime64) -> np.datetime64:
+    """Last NYSE session strictly before `day`."""
+    year = int(str(day)[:4])
+    while True:
+        sessions = _year_sessions(year)
+        earlier = sessions[sessions < day]
+        if len(earlier):
+            return earlier[-1]
+        year -= 1
+
+
+def window_calendar(
+    start_date: str,
+    end_date: str,
+    safety_lag_minutes: int = 0,
+    trading_days: bool = False,
+) -> np.ndarray:
+    """Membership windows of every day in a range, as a NumPy record array.
+
+    Cutoff instants come from per-year cached tables, so building the
+    calendar for any range is a few array lookups. Windows are contiguous:
+    each row's start is the previous row's end.
+
+    Args:
+        start_date: First date (YYYY-MM-DD)
+        end_date: Last date (YYYY-MM-DD)
+        safety_lag_minutes: Minutes before the cutoff for safety_cutoff_utc_ns
+        trading_days: Only NYSE sessions get windows; text from weekends and
+            holidays rolls into the next session's window
+
+    Returns:
+        Array of WINDOW_CALENDAR_DTYPE rows: (date, start_utc_ns, end_utc_ns,
+        safety_cutoff_utc_ns), one per (trading) day, windows (start, end]
+
+    Example:
+        >>> cal = window_calendar("2024-11-01", "2024-11-04", trading_days=True)
+        >>> cal['date']  # Weekend of 11-02/11-03 rolls into Monday 11-04
+        array(['2024-11-01', '2024-11-04'], dtype='datetime64[D]')
+    """
+    start, end = np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D')
+    if trading_days:
+        dates = nyse_sessions(start_date, end_date)
+        previous = _previous_session(dates[0] if len(dates) else start)
+    else:
+        dates = np.arange(start, end + 1, dtype='datetime64[D]')
+        previous = start - 1
+
+    calendar = np.empty(len(dates), dtype=WINDOW_CALENDAR_DTYPE)
+    if len(dates) == 0:
+        return calendar
+
+    ends = _cutoffs_ns(dates)
+    calendar['date'] = dates
+    calendar['end_utc_ns'] = ends
+    calendar['start_utc_ns'][0] = _cutoffs_ns(np.array([previous]))[0]
+    calendar['start_utc_ns'][1:] = ends[:-1]
+    calendar['safety_cutoff_utc_ns'] = ends - safety_lag_minutes * 60 * 1_000_000_000
+    return calendar
+
+
+@lru_cache(maxsize=4096)
+def _membership_window_cached(date_T: pd.Timestamp, trading_days: bool) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    day = np.datetime64(date_T.date(), 'D')
+    if trading_days:
+        if not len(nyse_sessions(str(day), str(day))):
+            raise ValueError(f"{day} is not an NYSE trading session")
+        previous = _previous_session(day)
+    else:
+        previous = day - 1
+    start_ns, end_ns = _cutoffs_ns(np.array([previous, day]))
+    return (
+        pd.Timestamp(int(start_ns), tz=UTC).tz_convert(ET),
+        pd.Timestamp(int(end_ns), tz=UTC).tz_convert(ET),
+    )
+
+
+def membership_window(date_T: pd.Timestamp, trading_days: bool = False) -> Tuple[pd.Timestamp, pd.Timestamp]:
     """Compute the membership window for trading day T.
 
-    Window is (T-1 15:30, T 15:30] in ET (right-closed).
+    Window is (T-1 15:30, T 15:30] in ET (right-closed). With trading_days,
+    T-1 is the previous NYSE session, so weekend and holiday text belongs
+    to the next session. Results are cached per date.
 
     Args:
         date_T: Trading date (timezone-naive or ET-aware)
+        trading_days: Use the previous NYSE session as T-1
 
     Returns:
         Tuple of (start, end) timestamps in ET
 
+    Raises:
+        ValueError: If trading_days is set and T is not an NYSE session
+
     Example:
         >>> membership_window(pd.Timestamp("2024-11-05"))
         (Timestamp('2024-11-04 15:30:00-0500', tz='America/New_York'),
@@ -47,16 +235,7 @@ def membership_window(date_T: pd.Timestamp) -> Tuple[pd.Timestamp, pd.Timestamp]
     if date_T.tz is not None:
         date_T = date_T.tz_localize(None)
 
-    # Build timestamps in ET
-    start = ET.localize(
-        pd.Timestamp(date_T) - pd.Timedelta(days=1)
-    ).replace(hour=CUTOFF_HOUR, minute=CUTOFF_MINUTE, second=0, microsecond=0)
-
-    end = ET.localize(
-        pd.Timestamp(date_T)
-    ).replace(hour=CUTOFF_HOUR, minute=CUTOFF_MINUTE, second=0, microsecond=0)
-
-    return start, end
+    return _membership_window_cached(date_T.normalize(), trading_days)
 
 
 def apply_cutoff(
@@ -65,6 +244,7 @@ def apply_cutoff(
     date_T: pd.Timestamp,
     safety_lag_minutes: int = DEFAULT_SAFETY_LAG_MINUTES,
     training: bool = True,
+    trading_days: bool = False,
 ) -> pd.DataFrame:
     """Apply 15:30 ET cutoff to filter items for trading day T.
 
@@ -77,6 +257,7 @@ def apply_cutoff(
         date_T: Trading date
         safety_lag_minutes: Minutes before cutoff to drop items (for training)
         training: Whether this is for training (applies safety lag)
+        trading_days: Window starts at the previous NYSE session's cutoff
 
     Returns:
         Filtered dataframe with audit fields added
@@ -104,7 +285,7 @@ def apply_cutoff(
         )
 
     # Get membership window
-    start, end = membership_window(date_T)
+    start, end = membership_window(date_T, trading_days=trading_days)
 
     # Convert timestamps to ET for comparison
     ts_et = df[ts_column].dt.tz_convert(ET)
@@ -116,8 +297,8 @@ def apply_cutoff(
     dropped_late_count = 0
     if training and safety_lag_minutes > 0:
         safety_cutoff = end - pd.Timedelta(minutes=safety_lag_minutes)
-        late_mask = ts_et > safety_cutoff
-        dropped_late_count = late_mask.sum()
+        late_mask = mask & (ts_et > safety_cutoff)
+        dropped_late_count = int(late_mask.sum())
         mask &= ~late_mask
 
     # Filter dataframe
@@ -136,6 +317,7 @@ def validate_cutoff_compliance(
     df: pd.DataFrame,
     ts_column: str,
     date_T: pd.Timestamp,
+    trading_days: bool = False,
 ) -> dict:
     """Validate that all items in dataframe comply with cutoff rules.
 
@@ -143,6 +325,7 @@ def validate_cutoff_compliance(
         df: Dataframe to validate
         ts_column: Name of timestamp column
         date_T: Trading date
+        trading_days: Window starts at the previous NYSE session's cutoff
 
     Returns:
         Dict with validation results:
@@ -161,7 +344,7 @@ def validate_cutoff_compliance(
             "window_end_et": None,
         }
 
-    start, end = membership_window(date_T)
+    start, end = membership_window(date_T, trading_days=trading_days)
     ts_et = df[ts_column].dt.tz_convert(ET)
 
     # Check compliance
@@ -177,6 +360,64 @@ def validate_cutoff_compliance(
     }
 
 
+def assign_cutoff_days(
+    ts: pd.Series,
+    start_date: str,
+    end_date: str,
+    safety_lag_minutes: int = DEFAULT_SAFETY_LAG_MINUTES,
+    training: bool = True,
+    trading_days: bool = False,
+) -> pd.DataFrame:
+    """Assign every timestamp its trading day T in one vectorized pass.
+
+    Window boundaries (DST-correct 15:30 ET cutoffs) come from
+    window_calendar and each timestamp is located with np.searchsorted, so
+    the cost is one binary search per row instead of one scan per day.
+
+    Args:
+        ts: Timezone-aware timestamps
+        start_date: First trading date (YYYY-MM-DD)
+        end_date: Last trading date (YYYY-MM-DD)
+        safety_lag_minutes: Minutes before cutoff flagged as late (for training)
+        training: Whether to flag items inside the safety lag
+        trading_days: Bucket into NYSE sessions (weekends/holidays roll forward)
+
+    Returns:
+        DataFrame with the index of `ts` and columns:
+        - date_T: Categorical trading date (YYYY-MM-DD), NaN outside the range
+        - is_late: True for in-window items dropped by the safety lag
+
+    Raises:
+        ValueError: If timestamps are not timezone-aware
+    """
+    if not isinstance(ts.dtype, pd.DatetimeTZDtype):
+        raise ValueError("Timestamps must be timezone-aware (use pd.to_datetime(..., utc=True))")
+
+    lag = safety_lag_minutes if training else 0
+    calendar = window_calendar(start_date, end_date, safety_lag_minutes=lag, trading_days=trading_days)
+    boundaries = np.concatenate([calendar['start_utc_ns'][:1], calendar['end_utc_ns']])
+    ts_ns = pd.DatetimeIndex(ts).as_unit('ns').asi8
+
+    # boundaries[k - 1] < ts <= boundaries[k] -> day index k - 1 (right-closed windows)
+    k = np.searchsorted(boundaries, ts_ns, side='left')
+    in_range = (k >= 1) & (k < len(boundaries)) & ~pd.isna(ts).to_numpy()
+    codes = np.where(in_range, k - 1, -1)
+
+    is_late = np.zeros(len(ts), dtype=bool)
+    if lag > 0:
+        safety_cutoff = calendar['safety_cutoff_utc_ns'][np.clip(codes, 0, None)]
+        is_late = in_range & (ts_ns > safety_cutoff)
+
+    categories = calendar['date'].astype(str)
+    return pd.DataFrame(
+        {
+            'date_T': pd.Categorical.from_codes(codes, categories=categories),
+            'is_late': is_late,
+        },
+        index=ts.index,
+    )
+
+
 def slice_date_range(
     df: pd.DataFrame,
     ts_column: str,
@@ -184,9 +425,13 @@ def slice_date_range(
     end_date: str,
     safety_lag_minutes: int = DEFAULT_SAFETY_LAG_MINUTES,
     training: bool = True,
+    trading_days: bool = False,
 ) -> dict:
     """Slice dataframe into daily buckets with cutoff enforcement.
 
+    Equivalent to apply_cutoff for every date in the range, but rows are
+    bucketed once with assign_cutoff_days and split with a single groupby.
+
     Args:
         df: Input dataframe
         ts_column: Name of timestamp column
@@ -194,23 +439,34 @@ def slice_date_range(
         end_date: End date (YYYY-MM-DD)
         safety_lag_minutes: Safety lag for training
         training: Whether this is for training
+        trading_days: Slice into NYSE sessions (weekends/holidays roll forward)
 
     Returns:
         Dict mapping date (as string YYYY-MM-DD) to filtered dataframe
     """
-    date_range = pd.date_range(start_date, end_date, freq='D')
+    if df.empty:
+        return {}
+    if ts_column not in df.columns:
+        raise ValueError(f"Timestamp column '{ts_column}' not found in dataframe")
+
+    buckets = assign_cutoff_days(
+        df[ts_column], start_date, end_date,
+        safety_lag_minutes=safety_lag_minutes,
+        training=training,
+        trading_days=trading_days,
+    )
+    late_counts = buckets.loc[buckets['is_late'], 'date_T'].value_counts()
+    keep = buckets['date_T'].notna() & ~buckets['is_late']
+    applied_at = pd.Timestamp.now(tz=UTC)
 
     result = {}
-    for date in date_range:
-        date_str = date.strftime('%Y-%m-%d')
-        filtered = apply_cutoff(
-            df,
-            ts_column,
-            date,
-            safety_lag_minutes=safety_lag_minutes,
-            training=training,
-        )
-        if not filtered.empty:
-            result[date_str] = filtered
+    for date_str, day in df[keep].groupby(buckets.loc[keep, 'date_T'], observed=True, sort=True):
+        start, end = membership_window(pd.Timestamp(date_str), trading_days=trading_days)
+        day = day.copy()
+        day['window_start_et'] = start
+        day['window_end_et'] = end
+        day['cutoff_applied_at'] = applied_at
+        day['dropped_late_count'] = int(late_counts.get(date_str, 0))
+        result[date_str] = day
 
     return result
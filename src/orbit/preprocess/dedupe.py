@@ -8,12 +8,38 @@ a 7-day reference corpus.
 """
 
 import hashlib
+import math
 import re
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 import pandas as pd
 import numpy as np
 
 
+# Token hash used by the batch simhash engine:
+# - "fast": splitmix64 over packed 3-gram code points (vectorized, non-cryptographic)
+# - "sha256": first 8 bytes of SHA-256 per 3-gram (bit-for-bit compatible with compute_simhash)
+HASH_MODES = ("fast", "sha256")
+DEFAULT_HASH_MODE = "fast"
+
+# Maximum Hamming distance between simhashes of near-duplicates
+DEFAULT_HAMMING_THRESHOLD = 3
+
+# Tokens hashed per chunk when accumulating bit weights (bounds the n_tokens x 64 bit matrix)
+SIMHASH_CHUNK_TOKENS = 1 << 20
+
+# Banded index needs blocks of at least this many bits to beat brute force
+MIN_BAND_BITS = 8
+
+# Candidate cells compared per step by the brute-force pair search
+BRUTEFORCE_CHUNK_CELLS = 1 << 22
+
+# Current x reference cells compared per step by min_hamming_distance (~32 MB of uint64)
+NOVELTY_CHUNK_CELLS = 1 << 22
+
+# Marks fallback tokens (texts shorter than 3 chars) so they never collide with a packed 3-gram
+_SHORT_TOKEN_FLAG = np.uint64(1 << 63)
+
+
 def prepare_text(text: str) -> str:
     """Prepare text for deduplication by normalizing.
 
@@ -43,7 +69,9 @@ def prepare_text(text: str) -> str:
 def compute_simhash(text: str, num_bits: int = 64) -> int:
     """Compute simhash of text for near-duplicate detection.
 
-    Uses 3-gram tokenization and SHA-256 hashing.
+    Uses 3-gram tokenization and SHA-256 hashing. This is the scalar reference
+    implementation; compute_simhash_batch(..., hash_mode="sha256") reproduces it
+    bit-for-bit for whole columns.
 
     Args:
         text: Prepared text
@@ -97,6 +125,142 @@ def compute_simhash(text: str, num_bits: int = 64) -> int:
     return simhash
 
 
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Apply the splitmix64 finalizer to a uint64 array (wrapping arithmetic)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _tokens(text: str) -> List[str]:
+    """Character 3-grams of text (the whole text if shorter than 3 chars)."""
+    tokens = [text[i:i+3] for i in range(len(text) - 2)]
+    return tokens if tokens else [text]
+
+
+def _fast_token_hashes(texts: List[str], lengths: np.ndarray) -> np.ndarray:
+    """Hash every 3-gram of a group of non-empty texts with splitmix64.
+
+    Code points are < 2^21, so three of them pack losslessly into 63 bits.
+    Texts shorter than 3 chars contribute one flagged token of their packed
+    code points. Tokens are returned grouped by text, in input order.
+    """
+    cp = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype='<u4').astype(np.uint64)
+    cp = np.concatenate((cp, np.zeros(2, dtype=np.uint64)))
+
+    counts = np.maximum(lengths - 2, 1)
+    text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    token_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Position of every token's first code point in the concatenated buffer
+    pos = np.arange(counts.sum()) + np.repeat(text_starts - token_starts, counts)
+    keys = cp[pos] | (cp[pos + 1] << np.uint64(21)) | (cp[pos + 2] << np.uint64(42))
+
+    short = lengths < 3
+    if short.any():
+        first = token_starts[short]
+        second = np.where(lengths[short] == 2, cp[text_starts[short] + 1], np.uint64(0))
+        keys[first] = cp[text_starts[short]] | (second << np.uint64(21)) | _SHORT_TOKEN_FLAG
+
+    return _splitmix64(keys)
+
+
+def _sha256_token_hashes(texts: List[str], lengths: np.ndarray) -> np.ndarray:
+    """Hash every 3-gram of a group of texts with SHA-256 (low 64 bits, as in compute_simhash)."""
+    digests = b''.join(
+        hashlib.sha256(token.encode('utf-8')).digest()[:8]
+        for text in texts
+        for token in _tokens(text)
+    )
+    return np.frombuffer(digests, dtype='<u8')
+
+
+def _bit_counts(token_hashes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Count, per document, how many of its tokens have each of the 64 bits set.
+
+    Spreads every hash into 16 lanes of four 16-bit counters (lane j holds bits
+    j, 16+j, 32+j, 48+j) so each lane is summed per document with a single
+    1-D reduceat. Valid while no document has more than 65535 tokens.
+    """
+    lane_mask = np.uint64(0x0001000100010001)
+    counts = np.empty((len(starts), 64), dtype=np.int64)
+    for j in range(16):
+        lane_sums = np.add.reduceat((token_hashes >> np.uint64(j)) & lane_mask, starts)
+        for k in range(4):
+            counts[:, 16 * k + j] = (lane_sums >> np.uint64(16 * k)) & np.uint64(0xFFFF)
+    return counts
+
+
+def _accumulate_simhash(token_hashes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Fold token hashes into one simhash per document.
+
+    Bit i of a document's simhash is set when more than half of its tokens
+    have bit i set (equivalent to a positive +1/-1 weight sum).
+    """
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    if counts.max() <= 0xFFFF:
+        ones = _bit_counts(token_hashes, starts)
+    else:
+        bits = np.unpackbits(
+            token_hashes.astype('<u8').view(np.uint8).reshape(-1, 8),
+            axis=1,
+            bitorder='little',
+        )
+        ones = np.add.reduceat(bits, starts, axis=0, dtype=np.int64)
+    majority = (2 * ones) > counts[:, None]
+    return np.packbits(majority, axis=1, bitorder='little').view('<u8').ravel().astype(np.uint64)
+
+
+def compute_simhash_batch(
+    texts: List[str],
+    hash_mode: str = DEFAULT_HASH_MODE,
+    chunk_tokens: int = SIMHASH_CHUNK_TOKENS,
+) -> np.ndarray:
+    """Compute 64-bit simhashes for a whole column of prepared texts.
+
+    Token hashes for many documents are stacked and the bit-weight
+    accumulation runs as one NumPy reduction per chunk of ~chunk_tokens tokens.
+
+    Args:
+        texts: Prepared texts (see prepare_text)
+        hash_mode: "fast" (splitmix64 token hash) or "sha256" (matches compute_simhash
+            bit-for-bit)
+        chunk_tokens: Approximate number of tokens accumulated per chunk (bounds memory)
+
+    Returns:
+        uint64 array of simhashes (0 for empty texts)
+    """
+    if hash_mode == "fast":
+        token_hasher = _fast_token_hashes
+    elif hash_mode == "sha256":
+        token_hasher = _sha256_token_hashes
+    else:
+        raise ValueError(f"Unknown hash_mode: {hash_mode!r} (expected one of {HASH_MODES})")
+
+    hashes = np.zeros(len(texts), dtype=np.uint64)
+    if len(texts) == 0:
+        return hashes
+
+    lengths = np.fromiter((len(text) if text else 0 for text in texts), dtype=np.int64, count=len(texts))
+    rows = np.flatnonzero(lengths)
+    if len(rows) == 0:
+        return hashes
+
+    # Split non-empty rows into chunks of roughly chunk_tokens tokens each
+    token_counts = np.maximum(lengths[rows] - 2, 1)
+    chunk_ids = np.cumsum(token_counts) // max(chunk_tokens, 1)
+    bounds = np.flatnonzero(np.diff(chunk_ids)) + 1
+
+    for chunk_rows in np.split(rows, bounds):
+        chunk_texts = [texts[row] for row in chunk_rows]
+        chunk_lengths = lengths[chunk_rows]
+        token_hashes = token_hasher(chunk_texts, chunk_lengths)
+        hashes[chunk_rows] = _accumulate_simhash(token_hashes, np.maximum(chunk_lengths - 2, 1))
+
+    return hashes
+
+
 def hamming_distance(hash1: int, hash2: int) -> int:
     """Compute Hamming distance between two hashes.
 
@@ -110,10 +274,190 @@ def hamming_distance(hash1: int, hash2: int) -> int:
     return bin(hash1 ^ hash2).count('1')
 
 
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Popcount of every 16-bit value (64 KB, stays cache-resident): 4 lookups per uint64
+_POPCOUNT_TABLE = _BYTE_POPCOUNT[np.arange(1 << 16) & 0xFF] + _BYTE_POPCOUNT[np.arange(1 << 16) >> 8]
+
+
+def popcount64(x: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a uint64 array.
+
+    Uses np.bitwise_count (NumPy >= 2.0) when available, otherwise a 16-bit
+    lookup table over the array's uint16 view.
+
+    Args:
+        x: uint64 array of any shape
+
+    Returns:
+        uint8 array of the same shape with per-element bit counts
+    """
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    halves = _POPCOUNT_TABLE[x.view(np.uint16)].reshape(x.shape + (4,))
+    return halves[..., 0] + halves[..., 1] + halves[..., 2] + halves[..., 3]
+
+
+def min_hamming_distance(
+    hashes: np.ndarray,
+    reference: np.ndarray,
+    chunk_cells: int = NOVELTY_CHUNK_CELLS,
+) -> np.ndarray:
+    """Minimum Hamming distance from each hash to a reference set.
+
+    Compares hashes x reference in tiles of about `chunk_cells` cells, so
+    memory stays bounded for large windows. Stops early once every hash has
+    an exact match.
+
+    Args:
+        hashes: uint64 simhashes to score
+        reference: uint64 simhashes of the reference set
+        chunk_cells: Maximum cells per comparison tile
+
+    Returns:
+        int64 array of distances (64 for every hash if reference is empty)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    reference = np.asarray(reference, dtype=np.uint64)
+    distances = np.full(len(hashes), 64, dtype=np.int64)
+    if len(hashes) == 0 or len(reference) == 0:
+        return distances
+
+    # Roughly square tiles keep both loops vectorized for large inputs; a small
+    # reference set lets row blocks grow so it is covered in one tile
+    rows = max(math.isqrt(chunk_cells), chunk_cells // len(reference))
+    rows = max(1, min(len(hashes), rows))
+    for lo in range(0, len(hashes), rows):
+        block = hashes[lo:lo + rows]
+        best = distances[lo:lo + rows]
+        cols = max(1, chunk_cells // len(block))
+        for ref_lo in range(0, len(reference), cols):
+            tile = popcount64(block[:, None] ^ reference[None, ref_lo:ref_lo + cols])
+            np.minimum(best, tile.min(axis=1), out=best)
+            if not best.any():
+                break
+
+    return distances
+
+
+def _band_layout(threshold: int) -> List[Tuple[int, np.uint64]]:
+    """Split 64 bits into threshold + 1 contiguous blocks as (shift, mask) pairs."""
+    n_blocks = threshold + 1
+    layout = []
+    shift = 0
+    for block in range(n_blocks):
+        width = 64 // n_blocks + (1 if block < 64 % n_blocks else 0)
+        layout.append((shift, np.uint64((1 << width) - 1)))
+        shift += width
+    return layout
+
+
+def _iter_bruteforce_pairs(hashes: np.ndarray, threshold: int) -> Iterator[np.ndarray]:
+    """Yield all (i, j), i < j, pairs within threshold by comparing every pair in chunks."""
+    n = len(hashes)
+    rows_per_chunk = max(1, BRUTEFORCE_CHUNK_CELLS // max(n, 1))
+    for lo in range(0, n - 1, rows_per_chunk):
+        hi = min(lo + rows_per_chunk, n - 1)
+        i = np.repeat(np.arange(lo, hi), n)
+        j = np.tile(np.arange(n), hi - lo)
+        keep = j > i
+        i, j = i[keep], j[keep]
+        close = popcount64(hashes[i] ^ hashes[j]) <= threshold
+        if close.any():
+            yield np.column_stack((i[close], j[close]))
+
+
+def _iter_banded_pairs(hashes: np.ndarray, threshold: int) -> Iterator[np.ndarray]:
+    """Yield all (i, j), i < j, pairs within threshold using a banded simhash index.
+
+    Pigeonhole: if two hashes differ in at most k bits, they agree exactly on
+    at least one of k + 1 disjoint blocks. For each block, items are sorted by
+    block value and only items sharing a value are compared. A pair is emitted
+    only for the first block it agrees on, so no pair is reported twice.
+    """
+    layout = _band_layout(threshold)
+
+    for block, (shift, mask) in enumerate(layout):
+        keys = (hashes >> np.uint64(shift)) & mask
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # Distance from each sorted position to the end of its run of equal keys
+        positions = np.arange(len(order))
+        new_run = np.ones(len(order), dtype=bool)
+        new_run[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        run_ids = np.cumsum(new_run) - 1
+        run_ends = np.flatnonzero(np.append(new_run[1:], True))
+        remaining = run_ends[run_ids] - positions
+
+        offset = 1
+        candidates = np.flatnonzero(remaining >= offset)
+        while len(candidates):
+            a = order[candidates]
+            b = order[candidates + offset]
+            diff = hashes[a] ^ hashes[b]
+
+            keep = popcount64(diff) <= threshold
+            for prev_shift, prev_mask in layout[:block]:
+                keep &= ((diff >> np.uint64(prev_shift)) & prev_mask) != 0
+
+            if keep.any():
+                a, b = a[keep], b[keep]
+                yield np.column_stack((np.minimum(a, b), np.maximum(a, b)))
+
+            offset += 1
+            candidates = candidates[remaining[candidates] >= offset]
+
+
+def iter_duplicate_pairs(hashes: np.ndarray, threshold: int = DEFAULT_HAMMING_THRESHOLD) -> Iterator[np.ndarray]:
+    """Stream near-duplicate index pairs as (m, 2) int64 arrays.
+
+    Uses a banded simhash index (near-linear for small thresholds) and falls
+    back to chunked brute force when blocks would be narrower than MIN_BAND_BITS.
+
+    Args:
+        hashes: uint64 simhashes
+        threshold: Maximum Hamming distance for duplicates
+
+    Yields:
+        Arrays of (i, j) index pairs with i < j; each pair appears exactly once
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    if len(hashes) < 2:
+        return
+    if threshold < 0:
+        raise ValueError(f"threshold must be >= 0, got {threshold}")
+
+    if threshold >= 64 or 64 // (threshold + 1) < MIN_BAND_BITS:
+        yield from _iter_bruteforce_pairs(hashes, threshold)
+    else:
+        yield from _iter_banded_pairs(hashes, threshold)
+
+
+def find_duplicate_pairs(hashes: np.ndarray, threshold: int = DEFAULT_HAMMING_THRESHOLD) -> np.ndarray:
+    """Find all index pairs of simhashes within a Hamming distance threshold.
+
+    Args:
+        hashes: uint64 simhashes
+        threshold: Maximum Hamming distance for duplicates (default: 3)
+
+    Returns:
+        (m, 2) int64 array of (i, j) pairs with i < j, sorted lexicographically
+    """
+    chunks = list(iter_duplicate_pairs(hashes, threshold))
+    if not chunks:
+        return np.empty((0, 2), dtype=np.int64)
+
+    pairs = np.concatenate(chunks).astype(np.int64)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
 def find_duplicates(
     texts: List[str],
     ids: List[str],
-    threshold: int = 3
+    threshold: int = DEFAULT_HAMMING_THRESHOLD,
+    hash_mode: str = DEFAULT_HASH_MODE,
 ) -> List[Tuple[int, int]]:
     """Find near-duplicate pairs using simhash.
 
@@ -121,6 +465,7 @@ def find_duplicates(
         texts: List of prepared texts
         ids: List of corresponding IDs
         threshold: Maximum Hamming distance for duplicates (default: 3)
+        hash_mode: Token hash for simhash ("fast" or "sha256")
 
     Returns:
         List of (i, j) index pairs where i < j are duplicates
@@ -128,17 +473,87 @@ def find_duplicates(
     if len(texts) != len(ids):
         raise ValueError("texts and ids must have same length")
 
-    # Compute simhashes
-    hashes = [compute_simhash(text) for text in texts]
+    hashes = compute_simhash_batch(texts, hash_mode=hash_mode)
+    pairs = find_duplicate_pairs(hashes, threshold=threshold)
+
+    return [(int(i), int(j)) for i, j in pairs]
+
 
-    # Find duplicate pairs
-    pairs = []
-    for i in range(len(hashes)):
-        for j in range(i + 1, len(hashes)):
-            if hamming_distance(hashes[i], hashes[j]) <= threshold:
-                pairs.append((i, j))
+def _find_root(parent: list, i: int) -> int:
+    """Root of i in a parent list, compressing the path to it."""
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
 
-    return pairs
+
+class UnionFind:
+    """Disjoint sets with path compression and union by rank.
+
+    parent/rank are plain Python lists for the object's lifetime: indexing
+    numpy arrays element by element boxes a numpy scalar per access and is
+    several times slower, and converting per call would cost O(n) each time.
+
+    Example:
+        >>> uf = UnionFind(4)
+        >>> uf.union_pairs(np.array([[2, 3], [1, 3]]))
+        >>> uf.leaders()
+        array([0, 1, 1, 1])
+    """
+
+    def __init__(self, n_items: int):
+        """Initialize n_items singleton sets.
+
+        Args:
+            n_items: Number of items (indices 0..n_items-1)
+        """
+        self.parent = list(range(n_items))
+        self.rank = [0] * n_items
+
+    def find(self, i: int) -> int:
+        """Root of the set containing i (compresses the path to it)."""
+        return _find_root(self.parent, int(i))
+
+    def union(self, i: int, j: int) -> None:
+        """Merge the sets containing i and j."""
+        parent, rank = self.parent, self.rank
+        root_i, root_j = _find_root(parent, int(i)), _find_root(parent, int(j))
+        if root_i == root_j:
+            return
+        if rank[root_i] < rank[root_j]:
+            root_i, root_j = root_j, root_i
+        parent[root_j] = root_i
+        if rank[root_i] == rank[root_j]:
+            rank[root_i] += 1
+
+    def union_pairs(self, pairs: np.ndarray) -> None:
+        """Merge every (i, j) row of an (m, 2) pair array."""
+        parent, rank = self.parent, self.rank
+        for i, j in np.asarray(pairs, dtype=np.int64).reshape(-1, 2).tolist():
+            root_i, root_j = _find_root(parent, i), _find_root(parent, j)
+            if root_i == root_j:
+                continue
+            if rank[root_i] < rank[root_j]:
+                root_i, root_j = root_j, root_i
+            parent[root_j] = root_i
+            if rank[root_i] == rank[root_j]:
+                rank[root_i] += 1
+
+    def leaders(self) -> np.ndarray:
+        """Lowest item index in each item's set, as an int64 array."""
+        n = len(self.parent)
+        roots = np.asarray(self.parent, dtype=np.int64)
+        while True:
+            next_roots = roots[roots]
+            if np.array_equal(next_roots, roots):
+                break
+            roots = next_roots
+
+        lowest = np.full(n, n, dtype=np.int64)
+        np.minimum.at(lowest, roots, np.arange(n, dtype=np.int64))
+        return lowest[roots]
 
 
 def cluster_duplicates(
@@ -154,56 +569,34 @@ def cluster_duplicates(
     Returns:
         Dict mapping item index to cluster ID (leader index)
     """
-    # Build adjacency list
-    adj = {i: set() for i in range(n_items)}
-    for i, j in pairs:
-        adj[i].add(j)
-        adj[j].add(i)
-
-    # Find connected components using DFS
-    visited = set()
-    clusters = {}
-
-    for start in range(n_items):
-        if start in visited:
-            continue
-
-        # DFS to find component
-        component = []
-        stack = [start]
-        while stack:
-            node = stack.pop()
-            if node in visited:
-                continue
-            visited.add(node)
-            component.append(node)
-            stack.extend(adj[node])
-
-        # Leader is earliest (lowest index) in component
-        leader = min(component)
-        for node in component:
-            clusters[node] = leader
+    uf = UnionFind(n_items)
+    if len(pairs):
+        uf.union_pairs(np.asarray(pairs))
 
-    return clusters
+    # Leader is earliest (lowest index) in component
+    return dict(enumerate(uf.leaders().tolist()))
 
 
 def add_dedup_fields(
     df: pd.DataFrame,
     text_column: str,
     id_column: str = 'id',
-    threshold: int = 3,
+    threshold: int = DEFAULT_HAMMING_THRESHOLD,
+    hash_mode: str = DEFAULT_HASH_MODE,
 ) -> pd.DataFrame:
     """Add deduplication fields to dataframe.
 
     Adds columns:
     - is_dupe: bool (True if duplicate, False if leader)
     - cluster_id: str (ID of cluster leader)
+    - simhash: uint64 (simhash of the prepared text, reused for novelty)
 
     Args:
         df: Input dataframe
         text_column: Name of text column
         id_column: Name of ID column
         threshold: Hamming distance threshold for duplicates
+        hash_mode: Token hash for simhash ("fast" or "sha256")
 
     Returns:
         Dataframe with dedup fields added
@@ -211,22 +604,37 @@ def add_dedup_fields(
     if df.empty:
         df['is_dupe'] = pd.Series(dtype=bool)
         df['cluster_id'] = pd.Series(dtype=str)
+        df['simhash'] = pd.Series(dtype=np.uint64)
         return df
 
     # Prepare texts
     texts = df[text_column].fillna('').apply(prepare_text).tolist()
-    ids = df[id_column].astype(str).tolist()
+    ids = df[id_column].astype(str).to_numpy()
 
-    # Find duplicates
-    pairs = find_duplicates(texts, ids, threshold=threshold)
+    # Hash once; the hashes are kept for novelty scoring and the curated output
+    hashes = compute_simhash_batch(texts, hash_mode=hash_mode)
 
-    # Cluster
-    clusters = cluster_duplicates(pairs, len(df))
+    # Exact-equal hashes (reposts, retweets) are duplicates of their first
+    # occurrence; union them directly so the index only sees distinct hashes
+    # and a hash repeated k times doesn't emit k * (k - 1) / 2 pairs
+    uf = UnionFind(len(df))
+    unique_hashes, first_index, inverse = np.unique(
+        hashes, return_index=True, return_inverse=True
+    )
+    representative = first_index[inverse]
+    repeated = np.flatnonzero(representative != np.arange(len(df)))
+    uf.union_pairs(np.column_stack((representative[repeated], repeated)))
+
+    # Cluster near-duplicate pairs of distinct hashes as they stream out of the index
+    for pairs in iter_duplicate_pairs(unique_hashes, threshold=threshold):
+        uf.union_pairs(first_index[pairs])
+    leaders = uf.leaders()
 
-    # Add fields
+    # Add fields (positional, so any index works)
     df = df.copy()
-    df['cluster_id'] = df.index.map(lambda i: ids[clusters.get(i, i)])
-    df['is_dupe'] = df.index.map(lambda i: clusters.get(i, i) != i)
+    df['cluster_id'] = ids[leaders]
+    df['is_dupe'] = leaders != np.arange(len(df))
+    df['simhash'] = hashes
 
     return df
 
@@ -235,6 +643,7 @@ def compute_novelty(
     current_texts: List[str],
     reference_texts: List[str],
     threshold: int = 64,  # Maximum Hamming distance
+    hash_mode: str = DEFAULT_HASH_MODE,
 ) -> np.ndarray:
     """Compute novelty scores for current texts vs reference corpus.
 
@@ -245,6 +654,7 @@ def compute_novelty(
         current_texts: List of prepared texts to score
         reference_texts: List of prepared reference texts (prior 7 days)
         threshold: Maximum Hamming distance to consider (default: 64)
+        hash_mode: Token hash for simhash ("fast" or "sha256")
 
     Returns:
         Array of novelty scores in [0, 1]
@@ -256,32 +666,42 @@ def compute_novelty(
         # No reference corpus - all items are novel
         return np.ones(len(current_texts))
 
-    # Compute simhashes
-    current_hashes = [compute_simhash(text) for text in current_texts]
-    reference_hashes = [compute_simhash(text) for text in reference_texts]
+    current_hashes = compute_simhash_batch(current_texts, hash_mode=hash_mode)
+    reference_hashes = compute_simhash_batch(reference_texts, hash_mode=hash_mode)
 
-    # For each current item, find max similarity with reference
-    novelties = []
-    for cur_hash in current_hashes:
-        # Find minimum Hamming distance to reference
-        min_distance = threshold
-        for ref_hash in reference_hashes:
-            dist = hamming_distance(cur_hash, ref_hash)
-            min_distance = min(min_distance, dist)
+    return compute_novelty_from_hashes(current_hashes, reference_hashes, threshold=threshold)
 
-        # Convert to similarity (normalized Hamming distance)
-        # similarity = 1 - (distance / 64)
-        similarity = 1.0 - (min_distance / 64.0)
 
-        # Novelty = 1 - similarity
-        novelty = 1.0 - similarity
+def compute_novelty_from_hashes(
+    current_hashes: np.ndarray,
+    reference_hashes: np.ndarray,
+    threshold: int = 64,  # Maximum Hamming distance
+) -> np.ndarray:
+    """Compute novelty scores from precomputed simhashes.
+
+    Same scoring as compute_novelty, for callers that already hold hashes
+    (e.g. the `simhash` column of curated partitions).
+
+    Args:
+        current_hashes: uint64 simhashes to score
+        reference_hashes: uint64 simhashes of the reference corpus
+        threshold: Maximum Hamming distance to consider (default: 64)
+
+    Returns:
+        Array of novelty scores in [0, 1]
+    """
+    if len(current_hashes) == 0:
+        return np.array([])
 
-        # Clip to [0, 1]
-        novelty = max(0.0, min(1.0, novelty))
+    if len(reference_hashes) == 0:
+        # No reference corpus - all items are novel
+        return np.ones(len(current_hashes))
 
-        novelties.append(novelty)
+    # Minimum Hamming distance to reference, capped at threshold
+    min_distance = np.minimum(min_hamming_distance(current_hashes, reference_hashes), threshold)
 
-    return np.array(novelties)
+    # Novelty = 1 - similarity, where similarity = 1 - (distance / 64)
+    return np.clip(min_distance / 64.0, 0.0, 1.0)
 
 
 def add_novelty_field(
@@ -289,14 +709,23 @@ def add_novelty_field(
     text_column: str,
     reference_df: Optional[pd.DataFrame] = None,
     window_days: int = 7,
+    hash_mode: str = DEFAULT_HASH_MODE,
+    reference_hashes: Optional[np.ndarray] = None,
 ) -> pd.DataFrame:
     """Add novelty scores to dataframe.
 
+    Current items reuse the `simhash` column when add_dedup_fields already
+    computed it. The reference corpus can be passed either as texts
+    (reference_df) or as precomputed leader simhashes (reference_hashes,
+    takes precedence).
+
     Args:
         df: Input dataframe (current day)
         text_column: Name of text column
         reference_df: Reference dataframe (prior window_days), optional
         window_days: Number of days in reference window (for logging)
+        hash_mode: Token hash for simhash ("fast" or "sha256")
+        reference_hashes: uint64 simhashes of non-duplicate reference items, optional
 
     Returns:
         Dataframe with novelty field added
@@ -315,21 +744,27 @@ def add_novelty_field(
         df['novelty'] = pd.Series(dtype=float)
         return df
 
-    # Prepare current texts
-    current_texts = non_dupes[text_column].fillna('').apply(prepare_text).tolist()
+    # Hash current texts (unless dedup already did)
+    if 'simhash' in non_dupes.columns:
+        current_hashes = non_dupes['simhash'].to_numpy(dtype=np.uint64)
+    else:
+        current_texts = non_dupes[text_column].fillna('').apply(prepare_text).tolist()
+        current_hashes = compute_simhash_batch(current_texts, hash_mode=hash_mode)
 
-    # Prepare reference texts
-    if reference_df is not None and not reference_df.empty:
-        # Only use non-duplicates from reference
-        if 'is_dupe' in reference_df.columns:
-            reference_df = reference_df[~reference_df['is_dupe']]
+    # Hash reference texts (unless hashes were supplied)
+    if reference_hashes is None:
+        if reference_df is not None and not reference_df.empty:
+            # Only use non-duplicates from reference
+            if 'is_dupe' in reference_df.columns:
+                reference_df = reference_df[~reference_df['is_dupe']]
 
-        reference_texts = reference_df[text_column].fillna('').apply(prepare_text).tolist()
-    else:
-        reference_texts = []
+            reference_texts = reference_df[text_column].fillna('').apply(prepare_text).tolist()
+        else:
+            reference_texts = []
+        reference_hashes = compute_simhash_batch(reference_texts, hash_mode=hash_mode)
 
     # Compute novelty
-    novelties = compute_novelty(current_texts, reference_texts)
+    novelties = compute_novelty_from_hashes(current_hashes, reference_hashes)
 
     # Add to dataframe
     df = df.copy()
@@ -348,7 +783,9 @@ def dedupe_and_score_novelty(
     id_column: str = 'id',
     reference_df: Optional[pd.DataFrame] = None,
     window_days: int = 7,
-    hamming_threshold: int = 3,
+    hamming_threshold: int = DEFAULT_HAMMING_THRESHOLD,
+    hash_mode: str = DEFAULT_HASH_MODE,
+    reference_hashes: Optional[np.ndarray] = None,
 ) -> pd.DataFrame:
     """Apply deduplication and novelty scoring to dataframe.
 
@@ -361,6 +798,10 @@ def dedupe_and_score_novelty(
         reference_df: Reference dataframe (prior window_days)
         window_days: Number of days in reference window
         hamming_threshold: Hamming distance threshold for duplicates
+        hash_mode: Token hash for simhash ("fast" or "sha256"; "sha256" reproduces
+            compute_simhash exactly)
+        reference_hashes: Precomputed leader simhashes of the reference window
+            (used instead of reference_df when given)
 
     Returns:
         Dataframe with dedup and novelty fields added
@@ -371,6 +812,7 @@ def dedupe_and_score_novelty(
         text_column=text_column,
         id_column=id_column,
         threshold=hamming_threshold,
+        hash_mode=hash_mode,
     )
 
     # Apply novelty scoring
@@ -379,6 +821,8 @@ def dedupe_and_score_novelty(
         text_column=text_column,
         reference_df=reference_df,
         window_days=window_days,
+        hash_mode=hash_mode,
+        reference_hashes=reference_hashes,
     )
 
     return df
@@ -0,0 +1,150 @@
+"""ORBIT Preprocessing - Partition manifest for incremental runs.
+
+Records, per source and date, what produced the curated partition:
+
+- input_fingerprint: raw partition files (name, size, mtime)
+- config_hash: preprocessing parameters that change curated output
+- output_digest: digest of the day's leader simhashes (what later days'
+  novelty is scored against)
+- reference_digest: output digests of the reference window the day was
+  scored against
+
+A day is up to date when its inputs, config and reference window are
+unchanged. Dirty days propagate forward: a day whose leader set may have
+changed dirties every day whose reference window contains it.
+
+Stored in SQLite at ORBIT_DATA_DIR/state/preprocess_manifest.sqlite.
+"""
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from orbit.preprocess import cutoffs, dedupe
+
+
+# Bump when preprocessing logic changes in a way that alters curated output
+PIPELINE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    input_fingerprint TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    output_digest TEXT NOT NULL,
+    reference_digest TEXT NOT NULL,
+    n_items INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, date)
+)
+"""
+
+
+def manifest_path(data_dir: Path) -> Path:
+    """Location of the preprocess manifest inside a data directory."""
+    return Path(data_dir) / "state" / "preprocess_manifest.sqlite"
+
+
+def config_hash(
+    reference_window_days: int,
+    safety_lag_minutes: int,
+    training: bool,
+    hash_mode: str,
+) -> str:
+    """Hash of the parameters that determine a curated partition's content."""
+    config = {
+        "pipeline_version": PIPELINE_VERSION,
+        "reference_window_days": reference_window_days,
+        "safety_lag_minutes": safety_lag_minutes,
+        "training": training,
+        "hash_mode": hash_mode,
+        "hamming_threshold": dedupe.DEFAULT_HAMMING_THRESHOLD,  # Threshold the pipeline dedupes with
+        "cutoff": f"{cutoffs.CUTOFF_HOUR:02d}:{cutoffs.CUTOFF_MINUTE:02d}",
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def hashes_digest(hashes: np.ndarray) -> str:
+    """Order-independent digest of a day's leader simhashes."""
+    ordered = np.sort(np.asarray(hashes, dtype=np.uint64))
+    return hashlib.sha256(ordered.tobytes()).hexdigest()
+
+
+def reference_digest(output_digests: list[tuple[str, str]]) -> str:
+    """Digest of (date, output_digest) pairs of a reference window."""
+    payload = "\n".join(f"{date} {digest}" for date, digest in output_digests)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Manifest row of one source-day."""
+
+    input_fingerprint: str
+    config_hash: str
+    output_digest: str
+    reference_digest: str
+    n_items: int
+
+
+class PreprocessManifest:
+    """SQLite-backed record of how each curated partition was produced.
+
+    Safe to open from several worker processes: every write is its own short
+    transaction and the database runs in WAL mode.
+
+    Example:
+        >>> manifest = PreprocessManifest(manifest_path(data_dir))
+        >>> entry = manifest.get("news", "2024-11-05")
+        >>> manifest.record("news", "2024-11-05", entry)
+    """
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) the manifest database.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, source: str, date: str) -> Optional[ManifestEntry]:
+        """Manifest entry of a source-day, or None if it was never recorded."""
+        row = self._conn.execute(
+            "SELECT input_fingerprint, config_hash, output_digest, reference_digest, n_items "
+            "FROM partitions WHERE source = ? AND date = ?",
+            (source, date),
+        ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def record(self, source: str, date: str, entry: ManifestEntry) -> None:
+        """Insert or replace the entry of a source-day."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    source,
+                    date,
+                    entry.input_fingerprint,
+                    entry.config_hash,
+                    entry.output_digest,
+                    entry.reference_digest,
+                    entry.n_items,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
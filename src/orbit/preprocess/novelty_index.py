@@ -0,0 +1,216 @@
+"""ORBIT Preprocessing - Rolling novelty reference index.
+
+Novelty for day T is scored against the non-duplicate items of the prior
+`window_days` days. Instead of re-reading and re-hashing those days' text for
+every processed date, curated partitions carry a `simhash` column (with the
+hash mode recorded in the Parquet schema metadata) and SimhashWindow keeps the
+leader hashes of recent dates in memory as a date-keyed sliding window.
+
+Within a date range every item is hashed exactly once: when its own day is
+deduplicated. Prior days are only read from disk (one projected column) when
+they are not already in the window, and only re-hashed from text when the
+curated file predates the `simhash` column or used another hash mode.
+SimhashWindow.preload reads a whole window of dates in one dataset scan.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from orbit import io as orbit_io
+from orbit.preprocess import dedupe
+
+
+SIMHASH_COLUMN = "simhash"
+
+# Parquet schema metadata key recording which token hash produced the simhash column
+SIMHASH_MODE_METADATA_KEY = b"orbit.simhash_mode"
+
+# Columns used to rebuild reference text when a curated file has no usable simhash column
+SOURCE_TEXT_COLUMNS = {
+    "news": ["headline"],
+    "social": ["title", "body"],
+}
+
+
+def curated_path(data_dir: Path, source: str, date: str) -> Path:
+    """Path of the curated partition file for a source and date (YYYY-MM-DD)."""
+    return data_dir / "curated" / source / f"date={date}" / f"{source}.parquet"
+
+
+def reference_text(df: pd.DataFrame, source: str) -> pd.Series:
+    """Text used for dedupe/novelty of a source (headline, or title + body for social)."""
+    if source == "social":
+        return df['title'] + ' ' + df['body'].fillna('')
+    return df['headline']
+
+
+def write_curated(df: pd.DataFrame, path: Path, hash_mode: str) -> None:
+    """Write a curated partition, recording the simhash mode in schema metadata.
+
+    Args:
+        df: Curated dataframe (with `simhash` column)
+        path: Output file path
+        hash_mode: Token hash used for the `simhash` column
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIMHASH_MODE_METADATA_KEY] = hash_mode.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    pq.write_table(table, path, compression="snappy")
+
+
+def has_stored_hashes(schema: pa.Schema, hash_mode: str) -> bool:
+    """Whether a curated file's `simhash` column was written with hash_mode."""
+    metadata = schema.metadata or {}
+    stored_mode = metadata.get(SIMHASH_MODE_METADATA_KEY, b"").decode()
+    return SIMHASH_COLUMN in schema.names and stored_mode == hash_mode
+
+
+def read_leader_hashes(path: Path, source: str, hash_mode: str) -> np.ndarray:
+    """Read simhashes of non-duplicate items from a curated partition.
+
+    Uses the stored `simhash` column when it was written with the same hash
+    mode; otherwise rebuilds the hashes from the text columns.
+
+    Args:
+        path: Curated partition file
+        source: "news" or "social"
+        hash_mode: Required token hash mode
+
+    Returns:
+        uint64 array of leader simhashes (empty if the file does not exist)
+    """
+    if not path.exists():
+        return np.array([], dtype=np.uint64)
+
+    schema = pq.read_schema(path)
+    has_dupe_flag = 'is_dupe' in schema.names
+
+    if has_stored_hashes(schema, hash_mode):
+        columns = [SIMHASH_COLUMN] + (['is_dupe'] if has_dupe_flag else [])
+        df = pd.read_parquet(path, columns=columns)
+        if has_dupe_flag:
+            df = df[~df['is_dupe']]
+        return df[SIMHASH_COLUMN].to_numpy(dtype=np.uint64)
+
+    # Older curated output (or different hash mode): hash the text once
+    columns = SOURCE_TEXT_COLUMNS[source] + (['is_dupe'] if has_dupe_flag else [])
+    df = pd.read_parquet(path, columns=columns)
+    if has_dupe_flag:
+        df = df[~df['is_dupe']]
+    texts = reference_text(df, source).fillna('').apply(dedupe.prepare_text).tolist()
+    return dedupe.compute_simhash_batch(texts, hash_mode=hash_mode)
+
+
+class SimhashWindow:
+    """Date-keyed sliding window of leader simhashes for one source.
+
+    Example:
+        >>> window = SimhashWindow(Path("/srv/orbit/data"), "news", window_days=7)
+        >>> ref = window.reference_hashes("2024-11-05")  # leaders of 10-29 .. 11-04
+        >>> window.put("2024-11-05", leader_hashes)      # reused for 11-06 .. 11-12
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        source: str,
+        window_days: int = 7,
+        hash_mode: str = dedupe.DEFAULT_HASH_MODE,
+    ):
+        """Initialize window.
+
+        Args:
+            data_dir: Data directory containing curated/<source>/
+            source: "news" or "social"
+            window_days: Number of prior days in the reference window
+            hash_mode: Token hash mode of the stored hashes
+        """
+        if source not in SOURCE_TEXT_COLUMNS:
+            raise ValueError(f"Unknown source: {source!r}")
+
+        self.data_dir = Path(data_dir)
+        self.source = source
+        self.window_days = window_days
+        self.hash_mode = hash_mode
+        self._hashes: dict[str, np.ndarray] = {}
+
+    def put(self, date: str, hashes: np.ndarray) -> None:
+        """Record leader simhashes of a processed date and evict dates outside the window."""
+        self._hashes[date] = np.asarray(hashes, dtype=np.uint64)
+        self._evict(date)
+
+    def get(self, date: str) -> np.ndarray:
+        """Leader simhashes of a date, loaded from its curated partition if not cached."""
+        if date not in self._hashes:
+            path = curated_path(self.data_dir, self.source, date)
+            self._hashes[date] = read_leader_hashes(path, self.source, self.hash_mode)
+        return self._hashes[date]
+
+    def preload(self, dates: list[str]) -> None:
+        """Load leader simhashes of many dates with one curated-dataset scan.
+
+        Dates whose curated file stores usable hashes are read together via
+        orbit.io.scan (simhash column only, duplicates filtered in the scan);
+        older files fall back to get(). Dates without a curated file get an
+        empty leader set, exactly as get() would.
+
+        Args:
+            dates: Dates (YYYY-MM-DD) to load if not already in the window
+        """
+        stored = []
+        for date in dates:
+            if date in self._hashes:
+                continue
+            path = curated_path(self.data_dir, self.source, date)
+            if not path.exists():
+                self._hashes[date] = np.array([], dtype=np.uint64)
+                continue
+            schema = pq.read_schema(path)
+            if has_stored_hashes(schema, self.hash_mode) and 'is_dupe' in schema.names:
+                stored.append(date)
+            else:
+                self.get(date)
+
+        if not stored:
+            return
+
+        df = orbit_io.scan(
+            self.data_dir / "curated" / self.source,
+            dates=stored,
+            columns=["date", SIMHASH_COLUMN],
+            filters=[("is_dupe", "==", False)],
+        )
+        groups = df.groupby("date")[SIMHASH_COLUMN]
+        for date in stored:
+            hashes = groups.get_group(date) if date in groups.groups else []
+            self._hashes[date] = np.asarray(hashes, dtype=np.uint64)
+
+    def reference_dates(self, date: str) -> list[str]:
+        """Dates in the reference window of `date` (most recent first)."""
+        day = pd.Timestamp(date)
+        return [
+            (day - timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range(1, self.window_days + 1)
+        ]
+
+    def reference_hashes(self, date: str) -> np.ndarray:
+        """Concatenated leader simhashes of the prior window_days days."""
+        parts = [self.get(ref_date) for ref_date in self.reference_dates(date)]
+        if not parts:
+            return np.array([], dtype=np.uint64)
+        return np.concatenate(parts)
+
+    def _evict(self, latest: str) -> None:
+        """Drop cached dates that can no longer be in any future reference window."""
+        oldest = (pd.Timestamp(latest) - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        for cached in [d for d in self._hashes if d < oldest]:
+            del self._hashes[cached]
@@ -5,18 +5,24 @@ Unified preprocessing pipeline that applies:
 2. Deduplication (within-day)
 3. Novelty scoring (vs 7-day reference window)
 
+Curated partitions carry a `simhash` column; novelty references are served by
+a rolling SimhashWindow so each item is hashed once per date range.
+
 Implements M1 deliverable: Preprocess hooks
 """
 
+import contextlib
+import io
 import os
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from orbit import io as orbit_io
-from orbit.preprocess import cutoffs, dedupe
+from orbit.preprocess import cutoffs, dedupe, manifest, novelty_index
 
 
 def preprocess_news_day(
@@ -26,6 +32,8 @@ def preprocess_news_day(
     safety_lag_minutes: int = 30,
     training: bool = True,
     write_curated: bool = True,
+    hash_mode: str = dedupe.DEFAULT_HASH_MODE,
+    novelty_window: Optional[novelty_index.SimhashWindow] = None,
 ) -> pd.DataFrame:
     """Preprocess news data for a single day.
 
@@ -38,6 +46,8 @@ def preprocess_news_day(
         safety_lag_minutes: Safety lag for training (minutes before cutoff)
         training: Whether this is for training (applies safety lag)
         write_curated: Whether to write curated output
+        hash_mode: Token hash for simhash ("fast" or "sha256")
+        novelty_window: Rolling reference index shared across days (created if None)
 
     Returns:
         Preprocessed dataframe
@@ -48,13 +58,12 @@ def preprocess_news_day(
     if data_dir is None:
         data_dir = Path(os.getenv("ORBIT_DATA_DIR", "./data"))
 
-    # Load raw news for this date
-    raw_path = data_dir / "raw" / "news" / f"date={date}" / "news.parquet"
-    if not raw_path.exists():
+    # Load raw news for this date (all files of the partition, deduped on msg_id)
+    if not orbit_io.partition_files(data_dir / "raw" / "news" / f"date={date}"):
         print(f"No raw news data for {date}")
         return pd.DataFrame()
 
-    df = pd.read_parquet(raw_path)
+    df = orbit_io.read_partition(data_dir / "raw" / "news", date, id_column='msg_id')
 
     if df.empty:
         print(f"Empty raw news data for {date}")
@@ -73,34 +82,30 @@ def preprocess_news_day(
         print(f"No news items within cutoff window for {date}")
         return pd.DataFrame()
 
-    # Load reference data for novelty scoring
-    reference_df = None
-    if reference_window_days > 0:
-        reference_dfs = []
-        for i in range(1, reference_window_days + 1):
-            ref_date = (pd.Timestamp(date) - timedelta(days=i)).strftime('%Y-%m-%d')
-            ref_path = data_dir / "curated" / "news" / f"date={ref_date}" / "news.parquet"
-            if ref_path.exists():
-                ref_df = pd.read_parquet(ref_path)
-                reference_dfs.append(ref_df)
-
-        if reference_dfs:
-            reference_df = pd.concat(reference_dfs, ignore_index=True)
+    # Reference simhashes for novelty scoring (prior days' leaders)
+    if novelty_window is None:
+        novelty_window = novelty_index.SimhashWindow(
+            data_dir, "news", window_days=reference_window_days, hash_mode=hash_mode
+        )
+    reference_hashes = (
+        novelty_window.reference_hashes(date) if reference_window_days > 0 else None
+    )
 
     # Apply deduplication and novelty scoring
     df = dedupe.dedupe_and_score_novelty(
         df,
         text_column='headline',
         id_column='msg_id',
-        reference_df=reference_df,
         window_days=reference_window_days,
+        hash_mode=hash_mode,
+        reference_hashes=reference_hashes,
     )
+    novelty_window.put(date, df.loc[~df['is_dupe'], 'simhash'].to_numpy())
 
     # Write curated output
     if write_curated:
-        curated_path = data_dir / "curated" / "news" / f"date={date}" / "news.parquet"
-        curated_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(curated_path, index=False, engine="pyarrow", compression="snappy")
+        curated_path = novelty_index.curated_path(data_dir, "news", date)
+        novelty_index.write_curated(df, curated_path, hash_mode)
         print(f"✓ Wrote curated news: {curated_path}")
 
     # Log stats
@@ -108,7 +113,7 @@ def preprocess_news_day(
     dupes = df['is_dupe'].sum() if 'is_dupe' in df.columns else 0
     novel = df['novelty'].mean() if 'novelty' in df.columns else None
 
-    print(f"News {date}: {total} items ({dupes} dupes, avg novelty={novel:.3f if novel else 0:.3f})")
+    print(f"News {date}: {total} items ({dupes} dupes, avg novelty={novel or 0:.3f})")
 
     return df
 
@@ -120,6 +125,8 @@ def preprocess_social_day(
     safety_lag_minutes: int = 30,
     training: bool = True,
     write_curated: bool = True,
+    hash_mode: str = dedupe.DEFAULT_HASH_MODE,
+    novelty_window: Optional[novelty_index.SimhashWindow] = None,
 ) -> pd.DataFrame:
     """Preprocess social data for a single day.
 
@@ -132,6 +139,8 @@ def preprocess_social_day(
         safety_lag_minutes: Safety lag for training (minutes before cutoff)
         training: Whether this is for training (applies safety lag)
         write_curated: Whether to write curated output
+        hash_mode: Token hash for simhash ("fast" or "sha256")
+        novelty_window: Rolling reference index shared across days (created if None)
 
     Returns:
         Preprocessed dataframe
@@ -142,13 +151,12 @@ def preprocess_social_day(
     if data_dir is None:
         data_dir = Path(os.getenv("ORBIT_DATA_DIR", "./data"))
 
-    # Load raw social for this date
-    raw_path = data_dir / "raw" / "social" / f"date={date}" / "social.parquet"
-    if not raw_path.exists():
+    # Load raw social for this date (all files of the partition, deduped on id)
+    if not orbit_io.partition_files(data_dir / "raw" / "social" / f"date={date}"):
         print(f"No raw social data for {date}")
         return pd.DataFrame()
 
-    df = pd.read_parquet(raw_path)
+    df = orbit_io.read_partition(data_dir / "raw" / "social", date, id_column='id')
 
     if df.empty:
         print(f"Empty raw social data for {date}")
@@ -168,41 +176,35 @@ def preprocess_social_day(
         return pd.DataFrame()
 
     # Combine title and body for deduplication
-    df['text_combined'] = df['title'] + ' ' + df['body'].fillna('')
-
-    # Load reference data for novelty scoring
-    reference_df = None
-    if reference_window_days > 0:
-        reference_dfs = []
-        for i in range(1, reference_window_days + 1):
-            ref_date = (pd.Timestamp(date) - timedelta(days=i)).strftime('%Y-%m-%d')
-            ref_path = data_dir / "curated" / "social" / f"date={ref_date}" / "social.parquet"
-            if ref_path.exists():
-                ref_df = pd.read_parquet(ref_path)
-                if 'text_combined' not in ref_df.columns:
-                    ref_df['text_combined'] = ref_df['title'] + ' ' + ref_df['body'].fillna('')
-                reference_dfs.append(ref_df)
-
-        if reference_dfs:
-            reference_df = pd.concat(reference_dfs, ignore_index=True)
+    df['text_combined'] = novelty_index.reference_text(df, "social")
+
+    # Reference simhashes for novelty scoring (prior days' leaders)
+    if novelty_window is None:
+        novelty_window = novelty_index.SimhashWindow(
+            data_dir, "social", window_days=reference_window_days, hash_mode=hash_mode
+        )
+    reference_hashes = (
+        novelty_window.reference_hashes(date) if reference_window_days > 0 else None
+    )
 
     # Apply deduplication and novelty scoring
     df = dedupe.dedupe_and_score_novelty(
         df,
         text_column='text_combined',
         id_column='id',
-        reference_df=reference_df,
         window_days=reference_window_days,
+        hash_mode=hash_mode,
+        reference_hashes=reference_hashes,
     )
+    novelty_window.put(date, df.loc[~df['is_dupe'], 'simhash'].to_numpy())
 
     # Drop temporary column
     df = df.drop(columns=['text_combined'])
 
     # Write curated output
     if write_curated:
-        curated_path = data_dir / "curated" / "social" / f"date={date}" / "social.parquet"
-        curated_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(curated_path, index=False, engine="pyarrow", compression="snappy")
+        curated_path = novelty_index.curated_path(data_dir, "social", date)
+        novelty_index.write_curated(df, curated_path, hash_mode)
         print(f"✓ Wrote curated social: {curated_path}")
 
     # Log stats
@@ -210,11 +212,185 @@ def preprocess_social_day(
     dupes = df['is_dupe'].sum() if 'is_dupe' in df.columns else 0
     novel = df['novelty'].mean() if 'novelty' in df.columns else None
 
-    print(f"Social {date}: {total} items ({dupes} dupes, avg novelty={novel:.3f if novel else 0:.3f})")
+    print(f"Social {date}: {total} items ({dupes} dupes, avg novelty={novel or 0:.3f})")
 
     return df
 
 
+# Per-day preprocessing function for each source
+_DAY_FUNCTIONS = {
+    'news': preprocess_news_day,
+    'social': preprocess_social_day,
+}
+
+
+def _config_hash(options: dict) -> str:
+    """Manifest config hash of a run's options."""
+    return manifest.config_hash(
+        options['reference_window_days'],
+        options['safety_lag_minutes'],
+        options['training'],
+        options['hash_mode'],
+    )
+
+
+def _raw_dir(data_dir: Path, source: str, date: str) -> Path:
+    """Raw partition directory of a source-day."""
+    return Path(data_dir) / "raw" / source / f"date={date}"
+
+
+def _process_day(
+    source: str,
+    date: str,
+    window: novelty_index.SimhashWindow,
+    options: dict,
+    write_curated: bool = True,
+    day_manifest: Optional[manifest.PreprocessManifest] = None,
+) -> int:
+    """Preprocess one source-day against a shared window; returns item count.
+
+    Days without items record an empty leader set, so later days in the run
+    never fall back to a curated file left over from an earlier run. With a
+    manifest, the day's inputs, config, leader digest and reference window
+    digest are recorded afterwards.
+    """
+    if day_manifest is not None:
+        input_fingerprint = orbit_io.partition_fingerprint(_raw_dir(options['data_dir'], source, date))
+
+    df = _DAY_FUNCTIONS[source](
+        date,
+        novelty_window=window,
+        write_curated=write_curated,
+        **options,
+    )
+    if df.empty:
+        window.put(date, np.array([], dtype=np.uint64))
+
+    if day_manifest is not None:
+        ref_dates = window.reference_dates(date) if options['reference_window_days'] > 0 else []
+        day_manifest.record(source, date, manifest.ManifestEntry(
+            input_fingerprint=input_fingerprint,
+            config_hash=_config_hash(options),
+            output_digest=manifest.hashes_digest(window.get(date)),
+            reference_digest=manifest.reference_digest(
+                [(ref, manifest.hashes_digest(window.get(ref))) for ref in ref_dates]
+            ),
+            n_items=len(df),
+        ))
+    return len(df)
+
+
+def _skip_day(date: str, window: novelty_index.SimhashWindow, n_items: int) -> None:
+    """Keep an up-to-date day's curated output (empty days still record no leaders)."""
+    if n_items == 0:
+        window.put(date, np.array([], dtype=np.uint64))
+
+
+def _plan_clean_days(
+    source: str,
+    dates: list[str],
+    options: dict,
+    day_manifest: manifest.PreprocessManifest,
+) -> dict[str, int]:
+    """Find days whose curated output is up to date according to the manifest.
+
+    A day is dirty if it was never recorded, its raw files or the config
+    changed, its curated file is missing, or its reference window differs
+    from the one it was scored against. Leader hashes depend only on a day's
+    own items, so a day recomputed for any of the first reasons dirties the
+    days whose window contains it; a day recomputed only for its novelty
+    does not.
+
+    Returns:
+        Dict of clean date -> recorded number of curated items
+    """
+    data_dir = options['data_dir']
+    config = _config_hash(options)
+    # Used only to digest reference days outside the manifest (read from curated)
+    window = novelty_index.SimhashWindow(
+        data_dir, source,
+        window_days=options['reference_window_days'],
+        hash_mode=options['hash_mode'],
+    )
+
+    def output_digest(date: str) -> str:
+        entry = day_manifest.get(source, date)
+        if entry is not None:
+            return entry.output_digest
+        return manifest.hashes_digest(window.get(date))
+
+    clean = {}
+    changed = set()  # Days whose leader set may change when recomputed
+    for date in dates:
+        entry = day_manifest.get(source, date)
+        ref_dates = window.reference_dates(date) if options['reference_window_days'] > 0 else []
+        inputs_current = (
+            entry is not None
+            and entry.config_hash == config
+            and entry.input_fingerprint == orbit_io.partition_fingerprint(_raw_dir(data_dir, source, date))
+            and (entry.n_items == 0 or novelty_index.curated_path(data_dir, source, date).exists())
+        )
+        if not inputs_current:
+            changed.add(date)
+        elif not changed.intersection(ref_dates) and entry.reference_digest == manifest.reference_digest(
+            [(ref, output_digest(ref)) for ref in ref_dates]
+        ):
+            clean[date] = entry.n_items
+    return clean
+
+
+def _preprocess_shard(
+    source: str,
+    dates: list[str],
+    warmup_dates: list[str],
+    options: dict,
+    clean: Optional[dict[str, int]] = None,
+) -> dict[str, int]:
+    """Preprocess a contiguous run of dates for one source (process pool task).
+
+    The window is seeded by re-running cutoff + dedupe (no novelty, no write)
+    on the in-range days just before the shard, which is exactly what the
+    sequential run would hold in memory at that point. Earlier days are read
+    from curated output in both cases, so results are identical. Clean days
+    (incremental runs) are neither rebuilt nor rewritten; their curated
+    output is read back when needed.
+
+    Returns:
+        Dict of processed date -> number of curated items
+    """
+    clean = clean or {}
+    window = novelty_index.SimhashWindow(
+        options['data_dir'],
+        source,
+        window_days=options['reference_window_days'],
+        hash_mode=options['hash_mode'],
+    )
+    day_manifest = manifest.PreprocessManifest(manifest.manifest_path(options['data_dir']))
+
+    # Days before the shard that are not rebuilt come from curated output: one scan
+    if options['reference_window_days'] > 0:
+        window.preload([d for d in window.reference_dates(dates[0]) if d not in warmup_dates])
+
+    warmup_options = dict(options, reference_window_days=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for date in warmup_dates:
+            if date in clean:
+                _skip_day(date, window, clean[date])
+            else:
+                _process_day(source, date, window, warmup_options, write_curated=False)
+
+    counts = {}
+    try:
+        for date in dates:
+            if date in clean:
+                _skip_day(date, window, clean[date])
+            else:
+                counts[date] = _process_day(source, date, window, options, day_manifest=day_manifest)
+    finally:
+        day_manifest.close()
+    return counts
+
+
 def preprocess_date_range(
     start_date: str,
     end_date: str,
@@ -223,9 +399,26 @@ def preprocess_date_range(
     reference_window_days: int = 7,
     safety_lag_minutes: int = 30,
     training: bool = True,
+    hash_mode: str = dedupe.DEFAULT_HASH_MODE,
+    workers: int = 1,
+    incremental: bool = False,
 ) -> dict:
     """Preprocess data for a date range.
 
+    One SimhashWindow per source is shared across the range, so each day's
+    leader hashes are computed once and reused by the following days' novelty.
+
+    With workers > 1, each source's dates are split into contiguous shards
+    processed by a ProcessPoolExecutor. A shard first rebuilds the leader
+    hashes of the up to `reference_window_days` in-range days before it, so
+    novelty never depends on another worker's curated output and results
+    match the sequential run.
+
+    Every processed day is recorded in the preprocess manifest
+    (state/preprocess_manifest.sqlite). With incremental=True, days whose raw
+    files, config and reference window are unchanged since they were
+    recorded are skipped; days downstream of a recomputed day are redone.
+
     Args:
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
@@ -234,6 +427,9 @@ def preprocess_date_range(
         reference_window_days: Days in reference window for novelty
         safety_lag_minutes: Safety lag for training
         training: Whether this is for training
+        hash_mode: Token hash for simhash ("fast" or "sha256")
+        workers: Number of worker processes (1 = sequential)
+        incremental: Skip days that are up to date according to the manifest
 
     Returns:
         Dict with processing statistics
@@ -249,34 +445,79 @@ def preprocess_date_range(
         'processed_social': 0,
         'total_news_items': 0,
         'total_social_items': 0,
+        'skipped_news': 0,
+        'skipped_social': 0,
     }
 
-    for date in date_range:
-        date_str = date.strftime('%Y-%m-%d')
-        print(f"\nProcessing {date_str}...")
-
-        if 'news' in sources:
-            df = preprocess_news_day(
-                date_str,
-                data_dir=data_dir,
-                reference_window_days=reference_window_days,
-                safety_lag_minutes=safety_lag_minutes,
-                training=training,
-            )
-            if not df.empty:
-                stats['processed_news'] += 1
-                stats['total_news_items'] += len(df)
-
-        if 'social' in sources:
-            df = preprocess_social_day(
-                date_str,
-                data_dir=data_dir,
-                reference_window_days=reference_window_days,
-                safety_lag_minutes=safety_lag_minutes,
-                training=training,
-            )
-            if not df.empty:
-                stats['processed_social'] += 1
-                stats['total_social_items'] += len(df)
+    options = {
+        'data_dir': data_dir,
+        'reference_window_days': reference_window_days,
+        'safety_lag_minutes': safety_lag_minutes,
+        'training': training,
+        'hash_mode': hash_mode,
+    }
+    dates = [date.strftime('%Y-%m-%d') for date in date_range]
+    sources = [source for source in _DAY_FUNCTIONS if source in sources]
+
+    counts = {source: {} for source in sources}
+
+    day_manifest = manifest.PreprocessManifest(manifest.manifest_path(data_dir))
+    try:
+        clean = {
+            source: _plan_clean_days(source, dates, options, day_manifest) if incremental else {}
+            for source in sources
+        }
+        if incremental:
+            for source in sources:
+                print(f"{source}: {len(clean[source])} of {len(dates)} days up to date")
+
+        if workers <= 1 or len(dates) <= 1:
+            windows = {
+                source: novelty_index.SimhashWindow(
+                    data_dir, source, window_days=reference_window_days, hash_mode=hash_mode
+                )
+                for source in sources
+            }
+            if reference_window_days > 0:
+                for window in windows.values():
+                    window.preload(window.reference_dates(dates[0]))
+            for date_str in dates:
+                if any(date_str not in clean[source] for source in sources):
+                    print(f"\nProcessing {date_str}...")
+                for source in sources:
+                    if date_str in clean[source]:
+                        _skip_day(date_str, windows[source], clean[source][date_str])
+                    else:
+                        counts[source][date_str] = _process_day(
+                            source, date_str, windows[source], options, day_manifest=day_manifest,
+                        )
+        else:
+            n_shards = min(workers, len(dates))
+            bounds = [len(dates) * k // n_shards for k in range(n_shards + 1)]
+            print(f"Processing {len(dates)} days x {len(sources)} sources in {n_shards} shards per source ({workers} workers)")
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        _preprocess_shard,
+                        source,
+                        dates[lo:hi],
+                        dates[max(0, lo - reference_window_days):lo],
+                        options,
+                        clean[source],
+                    ): source
+                    for source in sources
+                    for lo, hi in zip(bounds[:-1], bounds[1:])
+                }
+                for future in as_completed(futures):
+                    counts[futures[future]].update(future.result())
+    finally:
+        day_manifest.close()
+
+    for source in sources:
+        items = list(counts[source].values())
+        stats[f'processed_{source}'] = sum(1 for n in items if n)
+        stats[f'total_{source}_items'] = sum(items)
+        stats[f'skipped_{source}'] = len(clean[source])
 
     return stats
@@ -3,16 +3,34 @@
 Supports up to 5 API keys with round-robin or least-used rotation strategies.
 Tracks daily usage per key and handles failover when keys are exhausted.
 
+Per-key RPM and TPM budgets are tracked in sliding windows. acquire() (or
+acquire_async() from coroutines) hands out a key that has budget for the
+next request, waiting if none does. Keys that got a 429 cool down before
+being handed out again. The manager is safe to share between threads and
+coroutines.
+
+With persist_usage=True the daily counters live in a SQLite store under
+ORBIT_DATA_DIR/state/ (see orbit.utils.key_usage_store), shared by every
+process, so daily quotas hold across restarts and concurrent runs.
+
 Used by Gemini LLM batching and other rate-limited services in ORBIT.
 """
 
+import asyncio
+import math
 import os
-from collections import defaultdict
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from pathlib import Path
 from typing import Optional
 
+from orbit import io as orbit_io
+from orbit.utils.key_usage_store import KeyUsageStore, key_fingerprint, key_usage_path
+
 
 class RotationStrategy(Enum):
     """Key rotation strategies."""
@@ -29,6 +47,11 @@ class KeyUsage:
     tokens_today: int = 0
     last_used_at: Optional[datetime] = None
     last_reset_date: Optional[str] = None
+    fingerprint: str = field(default="", repr=False)  # Persisted instead of key_value
+    # Sliding-window state (time.monotonic() timestamps)
+    request_times: deque = field(default_factory=deque, repr=False)
+    token_events: deque = field(default_factory=deque, repr=False)  # (timestamp, tokens)
+    cooldown_until: float = 0.0
 
     def reset_if_new_day(self, timezone_name: str = "US/Pacific"):
         """Reset daily counters if it's a new day.
@@ -62,6 +85,11 @@ class KeyRotationManager:
         ... )
         >>> key = manager.get_next_key()
         >>> manager.record_usage(key_name=key.key_name, requests=1, tokens=1500)
+
+        Rate-aware use from concurrent workers:
+
+        >>> key = manager.acquire(tokens=1500)  # Blocks until a key has RPM/TPM budget
+        >>> manager.report_rate_limited(key.key_name)  # After a 429
     """
 
     def __init__(
@@ -74,6 +102,10 @@ class KeyRotationManager:
         quota_tpm: Optional[int] = None,
         reset_timezone: str = "US/Pacific",
         safety_margin: float = 0.95,  # Use up to 95% of quota before failover
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 60.0,
+        persist_usage: bool = False,
+        usage_store_path: Optional[Path] = None,
     ):
         """Initialize key rotation manager.
 
@@ -86,6 +118,11 @@ class KeyRotationManager:
             quota_tpm: Tokens per minute per key (optional)
             reset_timezone: Timezone for daily reset (e.g., "US/Pacific")
             safety_margin: Use up to this fraction of quota before failover (0.0-1.0)
+            window_seconds: Length of the RPM/TPM sliding window
+            cooldown_seconds: Default cooldown of a key after a 429
+            persist_usage: Share daily usage with other processes via the key usage store
+            usage_store_path: Store location (default: ORBIT_DATA_DIR/state/key_usage.sqlite;
+                giving a path implies persist_usage)
         """
         self.env_prefix = env_prefix
         self.max_keys = max_keys
@@ -95,11 +132,21 @@ class KeyRotationManager:
         self.quota_tpm = quota_tpm
         self.reset_timezone = reset_timezone
         self.safety_margin = safety_margin
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+        # Guards all key state; reentrant because public methods call each other
+        self._lock = threading.RLock()
 
         # Load keys from environment
         self.keys: list[KeyUsage] = []
         self._load_keys()
 
+        # Persistent daily counters (None = in-memory only)
+        self._store = None
+        if persist_usage or usage_store_path is not None:
+            self._store = KeyUsageStore(usage_store_path or key_usage_path(orbit_io.get_data_dir()))
+
         # Rotation state
         self.current_index = 0
 
@@ -121,6 +168,7 @@ class KeyRotationManager:
                 self.keys.append(KeyUsage(
                     key_name=key_name,
                     key_value=key_value.strip(),
+                    fingerprint=key_fingerprint(key_value.strip()),
                 ))
 
         if not self.keys:
@@ -145,20 +193,184 @@ class KeyRotationManager:
         Returns:
             True if key is available, False if exhausted
         """
-        # Reset if new day
-        key.reset_if_new_day(self.reset_timezone)
+        self._refresh_usage(key)
 
         # Check daily quota
-        if self.quota_rpd:
-            quota_limit = int(self.quota_rpd * self.safety_margin)
-            if key.requests_today >= quota_limit:
-                return False
-
-        # Other quotas (RPM, TPM) would require time-window tracking
-        # For now, we only track daily quotas (RPD)
+        quota_limit = self._daily_limit()
+        if quota_limit is not None and key.requests_today >= quota_limit:
+            return False
 
         return True
 
+    def _daily_limit(self) -> Optional[int]:
+        """Requests per key per day after the safety margin (None = unlimited)."""
+        if not self.quota_rpd:
+            return None
+        return int(self.quota_rpd * self.safety_margin)
+
+    def _refresh_usage(self, key: KeyUsage) -> None:
+        """Reset a key's daily counters on a new day and load other processes' usage."""
+        key.reset_if_new_day(self.reset_timezone)
+        if self._store is not None:
+            key.requests_today, key.tokens_today = self._store.usage(key.fingerprint, key.last_reset_date)
+
+    def _record_window(self, key: KeyUsage, requests: int, tokens: int, now: float) -> None:
+        """Record usage in a key's sliding windows and the run totals."""
+        key.last_used_at = datetime.now(timezone.utc)
+        key.request_times.extend([now] * requests)
+        if tokens:
+            key.token_events.append((now, tokens))
+        self.total_requests += requests
+        self.total_tokens += tokens
+
+    def _prune_window(self, key: KeyUsage, now: float) -> None:
+        """Drop window entries older than window_seconds."""
+        horizon = now - self.window_seconds
+        while key.request_times and key.request_times[0] <= horizon:
+            key.request_times.popleft()
+        while key.token_events and key.token_events[0][0] <= horizon:
+            key.token_events.popleft()
+
+    def _wait_time(self, key: KeyUsage, tokens: int, now: float) -> float:
+        """Seconds until key can take a request of `tokens` tokens (inf if out of daily quota)."""
+        if not self._is_key_available(key):
+            return math.inf
+
+        self._prune_window(key, now)
+        wait = max(0.0, key.cooldown_until - now)
+
+        if self.quota_rpm and len(key.request_times) >= self.quota_rpm:
+            # Wait until enough requests leave the window
+            oldest = key.request_times[len(key.request_times) - self.quota_rpm]
+            wait = max(wait, oldest + self.window_seconds - now)
+
+        if self.quota_tpm and key.token_events:
+            # A request larger than the whole budget runs once the window is empty
+            budget = self.quota_tpm - min(tokens, self.quota_tpm)
+            used = sum(event_tokens for _, event_tokens in key.token_events)
+            for timestamp, event_tokens in key.token_events:
+                if used <= budget:
+                    break
+                used -= event_tokens
+                wait = max(wait, timestamp + self.window_seconds - now)
+
+        return wait
+
+    def _candidates(self) -> list[KeyUsage]:
+        """Keys in the order the rotation strategy prefers them."""
+        if self.strategy == RotationStrategy.LEAST_USED:
+            return sorted(self.keys, key=lambda k: k.requests_today)
+        return self.keys[self.current_index:] + self.keys[:self.current_index]
+
+    def try_acquire(self, tokens: int = 0) -> tuple[Optional[KeyUsage], float]:
+        """Take a key with RPM/TPM budget for one request, without waiting.
+
+        On success the request and its tokens are recorded against the key
+        immediately, so concurrent callers see them.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Tuple of (key, 0.0), or (None, seconds until a key may have budget)
+
+        Raises:
+            RuntimeError: If all keys are out of daily quota
+        """
+        with self._lock:
+            now = time.monotonic()
+            waits = []
+            for key in self._candidates():
+                wait = self._wait_time(key, tokens, now)
+                if wait == 0 and self._store is not None:
+                    # Check and count the request atomically across processes
+                    consumed, key.requests_today, key.tokens_today = self._store.try_consume(
+                        key.fingerprint, key.key_name, key.last_reset_date, self._daily_limit(), tokens,
+                    )
+                    if not consumed:
+                        wait = math.inf  # Another process used the rest of its quota
+                    else:
+                        self._record_window(key, 1, tokens, now)
+                elif wait == 0:
+                    key.requests_today += 1
+                    key.tokens_today += tokens
+                    self._record_window(key, 1, tokens, now)
+
+                if wait == 0:
+                    if self.strategy == RotationStrategy.ROUND_ROBIN:
+                        self.current_index = (self.keys.index(key) + 1) % len(self.keys)
+                    self.key_switches += 1
+                    return key, 0.0
+                waits.append(wait)
+
+            if min(waits) == math.inf:
+                raise RuntimeError(
+                    f"All {len(self.keys)} API keys exhausted. "
+                    f"Daily quota: {self.quota_rpd} RPD per key. "
+                    f"Try again after midnight {self.reset_timezone}."
+                )
+            return None, min(waits)
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> KeyUsage:
+        """Block until a key has RPM/TPM budget, then take it (see try_acquire).
+
+        If the request's actual token count differs from the estimate, report
+        the difference with record_usage(key_name, requests=0, tokens=actual - tokens).
+
+        Args:
+            tokens: Estimated tokens of the request
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            KeyUsage of the key to use
+
+        Raises:
+            RuntimeError: If all keys are out of daily quota
+            TimeoutError: If no key has budget within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            key, wait = self.try_acquire(tokens)
+            if key is not None:
+                return key
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"No {self.env_prefix} key has budget within {timeout}s")
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0, timeout: Optional[float] = None) -> KeyUsage:
+        """Await until a key has RPM/TPM budget, then take it (see acquire).
+
+        With a usage store attached, try_acquire runs SQLite transactions that
+        may wait on other processes' locks, so it runs in a worker thread
+        instead of blocking the event loop.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._store is not None:
+                key, wait = await asyncio.to_thread(self.try_acquire, tokens)
+            else:
+                key, wait = self.try_acquire(tokens)
+            if key is not None:
+                return key
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"No {self.env_prefix} key has budget within {timeout}s")
+            await asyncio.sleep(wait)
+
+    def report_rate_limited(self, key_name: str, retry_after: Optional[float] = None) -> None:
+        """Cool a key down after a 429 so acquire() hands out other keys meanwhile.
+
+        Args:
+            key_name: Key that was rate limited
+            retry_after: Server-provided Retry-After seconds (default: cooldown_seconds)
+        """
+        with self._lock:
+            for key in self.keys:
+                if key.key_name == key_name:
+                    cooldown = self.cooldown_seconds if retry_after is None else retry_after
+                    key.cooldown_until = max(key.cooldown_until, time.monotonic() + cooldown)
+                    print(f"  ⚠ {key_name} rate limited; cooling down for {cooldown:.0f}s")
+                    break
+
     def get_next_key(self) -> KeyUsage:
         """Get next available API key according to rotation strategy.
 
@@ -168,14 +380,15 @@ class KeyRotationManager:
         Raises:
             RuntimeError: If all keys are exhausted
         """
-        self._reset_all_keys_if_new_day()
+        with self._lock:
+            self._reset_all_keys_if_new_day()
 
-        if self.strategy == RotationStrategy.ROUND_ROBIN:
-            return self._get_next_round_robin()
-        elif self.strategy == RotationStrategy.LEAST_USED:
-            return self._get_least_used()
-        else:
-            raise ValueError(f"Unknown rotation strategy: {self.strategy}")
+            if self.strategy == RotationStrategy.ROUND_ROBIN:
+                return self._get_next_round_robin()
+            elif self.strategy == RotationStrategy.LEAST_USED:
+                return self._get_least_used()
+            else:
+                raise ValueError(f"Unknown rotation strategy: {self.strategy}")
 
     def _get_next_round_robin(self) -> KeyUsage:
         """Get next key using round-robin strategy.
@@ -243,17 +456,44 @@ class KeyRotationManager:
             requests: Number of requests made
             tokens: Number of tokens used
         """
-        # Find key
-        for key in self.keys:
-            if key.key_name == key_name:
-                key.requests_today += requests
-                key.tokens_today += tokens
-                key.last_used_at = datetime.now(timezone.utc)
-                break
+        with self._lock:
+            now = time.monotonic()
+
+            # Find key
+            for key in self.keys:
+                if key.key_name == key_name:
+                    key.reset_if_new_day(self.reset_timezone)
+                    if self._store is not None:
+                        key.requests_today, key.tokens_today = self._store.add(
+                            key.fingerprint, key.key_name, key.last_reset_date, requests, tokens,
+                        )
+                    else:
+                        key.requests_today += requests
+                        key.tokens_today += tokens
+                    self._record_window(key, requests, tokens, now)
+                    break
+
+    def remaining_quota(self) -> dict[str, Optional[int]]:
+        """Requests each key may still make today, counting usage by all processes.
+
+        Uses the same safety-margined limit as failover, so a scheduler can
+        plan work against it directly.
 
-        # Update totals
-        self.total_requests += requests
-        self.total_tokens += tokens
+        Returns:
+            Dict of key name -> remaining requests (None if no daily quota)
+        """
+        with self._lock:
+            limit = self._daily_limit()
+            remaining = {}
+            for key in self.keys:
+                self._refresh_usage(key)
+                remaining[key.key_name] = None if limit is None else max(0, limit - key.requests_today)
+            return remaining
+
+    def close(self) -> None:
+        """Close the usage store (no-op without persistence)."""
+        if self._store is not None:
+            self._store.close()
 
     def get_stats(self) -> dict:
         """Get usage statistics for all keys.
@@ -261,18 +501,24 @@ class KeyRotationManager:
         Returns:
             Dict with statistics
         """
-        self._reset_all_keys_if_new_day()
-
-        key_stats = []
-        for key in self.keys:
-            key_stats.append({
-                "key_name": key.key_name,
-                "requests_today": key.requests_today,
-                "tokens_today": key.tokens_today,
-                "quota_rpd": self.quota_rpd,
-                "usage_pct": (key.requests_today / self.quota_rpd * 100) if self.quota_rpd else 0,
-                "available": self._is_key_available(key),
-            })
+        with self._lock:
+            self._reset_all_keys_if_new_day()
+
+            now = time.monotonic()
+            key_stats = []
+            for key in self.keys:
+                self._prune_window(key, now)
+                key_stats.append({
+                    "key_name": key.key_name,
+                    "requests_today": key.requests_today,
+                    "tokens_today": key.tokens_today,
+                    "quota_rpd": self.quota_rpd,
+                    "usage_pct": (key.requests_today / self.quota_rpd * 100) if self.quota_rpd else 0,
+                    "available": self._is_key_available(key),
+                    "requests_in_window": len(key.request_times),
+                    "tokens_in_window": sum(tokens for _, tokens in key.token_events),
+                    "cooldown_seconds": max(0.0, key.cooldown_until - now),
+                })
 
         return {
             "total_requests": self.total_requests,
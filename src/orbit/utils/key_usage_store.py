@@ -0,0 +1,144 @@
+"""Persistent per-key daily usage shared across processes.
+
+KeyRotationManager keeps daily request/token counters in memory; with a
+store attached they are persisted so every orbit invocation (cron runs,
+concurrent workers) sees the real usage of the day and daily quotas hold
+across restarts.
+
+Keys are identified by a fingerprint (truncated SHA-256 of the key value)
+plus their env var name; the key value itself is never stored.
+
+Stored in SQLite at ORBIT_DATA_DIR/state/key_usage.sqlite. Every update is
+a short BEGIN IMMEDIATE transaction, so check-and-increment is atomic
+across processes.
+"""
+
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS key_usage (
+    fingerprint TEXT NOT NULL,
+    day TEXT NOT NULL,
+    key_name TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (fingerprint, day)
+)
+"""
+
+
+def key_usage_path(data_dir: Path) -> Path:
+    """Location of the key usage store inside a data directory."""
+    return Path(data_dir) / "state" / "key_usage.sqlite"
+
+
+def key_fingerprint(key_value: str) -> str:
+    """Stable, non-reversible identifier of an API key."""
+    return hashlib.sha256(key_value.encode()).hexdigest()[:16]
+
+
+class KeyUsageStore:
+    """SQLite-backed daily request/token counters per API key.
+
+    Example:
+        >>> store = KeyUsageStore(key_usage_path(data_dir))
+        >>> store.try_consume(key_fingerprint(value), "GEMINI_API_KEY_1", "2025-01-15", limit=950)
+        (True, 1, 0)
+    """
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) the store.
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE.
+        # Callers serialize access (KeyRotationManager holds its lock), so the
+        # connection may be used from several threads.
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database write lock up front."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def usage(self, fingerprint: str, day: str) -> tuple[int, int]:
+        """(requests, tokens) recorded for a key on a day."""
+        row = self._conn.execute(
+            "SELECT requests, tokens FROM key_usage WHERE fingerprint = ? AND day = ?",
+            (fingerprint, day),
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def add(self, fingerprint: str, key_name: str, day: str, requests: int = 0, tokens: int = 0) -> tuple[int, int]:
+        """Add usage to a key's day and return the new (requests, tokens) totals."""
+        with self._transaction() as conn:
+            return self._increment(conn, fingerprint, key_name, day, requests, tokens)
+
+    def try_consume(
+        self,
+        fingerprint: str,
+        key_name: str,
+        day: str,
+        limit: Optional[int],
+        tokens: int = 0,
+    ) -> tuple[bool, int, int]:
+        """Record one request unless the key already made `limit` requests that day.
+
+        Args:
+            fingerprint: Key fingerprint
+            key_name: Key env var name (for inspection only)
+            day: Quota day (YYYY-MM-DD in the quota's reset timezone)
+            limit: Maximum requests per day (None = unlimited)
+            tokens: Tokens to record with the request
+
+        Returns:
+            Tuple of (consumed, requests, tokens) with the day's totals after the call
+        """
+        with self._transaction() as conn:
+            requests_used, tokens_used = self.usage(fingerprint, day)
+            if limit is not None and requests_used >= limit:
+                return False, requests_used, tokens_used
+            return (True, *self._increment(conn, fingerprint, key_name, day, 1, tokens))
+
+    @staticmethod
+    def _increment(
+        conn: sqlite3.Connection,
+        fingerprint: str,
+        key_name: str,
+        day: str,
+        requests: int,
+        tokens: int,
+    ) -> tuple[int, int]:
+        conn.execute(
+            "INSERT INTO key_usage VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (fingerprint, day) DO UPDATE SET "
+            "requests = requests + excluded.requests, tokens = tokens + excluded.tokens, "
+            "key_name = excluded.key_name, updated_at = excluded.updated_at",
+            (fingerprint, day, key_name, requests, tokens, datetime.now(timezone.utc).isoformat()),
+        )
+        return conn.execute(
+            "SELECT requests, tokens FROM key_usage WHERE fingerprint = ? AND day = ?",
+            (fingerprint, day),
+        ).fetchone()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
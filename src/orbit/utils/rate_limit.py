@@ -0,0 +1,69 @@
+"""Thread-safe token-bucket rate limiter.
+
+Shared by concurrent fetchers so that N in-flight requests together stay
+under one requests-per-second budget (e.g. Arctic Shift's 3.5 RPS).
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket that refills at `rate` tokens/second up to `capacity`.
+
+    acquire() reserves tokens under a lock and sleeps outside it, so waiting
+    callers are served in arrival order and never hold the lock while
+    sleeping.
+
+    Example:
+        >>> limiter = TokenBucket(rate=3.5)
+        >>> limiter.acquire()  # Blocks until a request slot is available
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """Initialize limiter.
+
+        Args:
+            rate: Tokens added per second (requests per second)
+            capacity: Maximum burst size (tokens available after idling)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now, going into debt if needed.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before using them (0 if available now)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,654 @@
+"""Unit tests for orbit.ingest.llm_gemini and orbit.ingest.sentiment_cache.
+
+Tests concurrent batch scoring, order-preserving reassembly, neutral
+fallback for failed batches and the sentiment cache. The Gemini API call is
+replaced by a fake.
+"""
+
+import asyncio
+import json
+import random
+import warnings
+
+import aiohttp
+import numpy as np
+import pandas as pd
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from orbit.ingest import llm_gemini
+from orbit.ingest.sentiment_cache import SentimentCache, cache_key, normalize_text
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Isolated ORBIT_DATA_DIR (sentiment cache and raw output)."""
+    monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def gemini_keys(monkeypatch):
+    """Three fake Gemini API keys."""
+    for i in range(1, 6):
+        monkeypatch.delenv(f"GEMINI_API_KEY_{i}", raising=False)
+    for i in range(1, 4):
+        monkeypatch.setenv(f"GEMINI_API_KEY_{i}", f"test-key-{i}")
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """Fake call_gemini_api_async with random latency; records concurrency.
+
+    Batches containing `fail_ids` fail with HTTP 503, batches containing
+    `garbled_ids` or more than `max_items` items fail to parse. Results for
+    `dropped_ids` are left out of the first `drop_times` responses they are in.
+    """
+    state = {"in_flight": 0, "max_in_flight": 0, "keys": set(), "fail_ids": set(), "sent_ids": [], "sent_llm": {},
+             "max_items": None, "calls": 0, "garbled_ids": set(),
+             "dropped_ids": set(), "drop_times": 1}
+
+    async def fake_call(session, items, api_key, model=llm_gemini.DEFAULT_MODEL, **kwargs):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        state["keys"].add(api_key)
+        state["calls"] += 1
+        try:
+            await asyncio.sleep(random.uniform(0.001, 0.02))
+            if state["max_items"] and len(items) > state["max_items"]:
+                raise ValueError("Failed to parse Gemini response: truncated output")
+            state["sent_ids"].extend(item["id"] for item in items)
+            if any(item["id"] in state["fail_ids"] for item in items):
+                raise _http_error(503)
+            if any(item["id"] in state["garbled_ids"] for item in items):
+                raise ValueError("Failed to parse Gemini response")
+            drops = state.setdefault("drops", {})
+            missing = []
+            for item in items:
+                if item["id"] in state["dropped_ids"] and drops.get(item["id"], 0) < state["drop_times"]:
+                    drops[item["id"]] = drops.get(item["id"], 0) + 1
+                    missing.append(item["id"])
+            results = [
+                {"id": item["id"], "sent_llm": state["sent_llm"].get(item["id"], 0.5), "stance": "bull", "sarcasm": False,
+                 "certainty": 0.9, "toxicity": 0.0}
+                for item in items
+                if item["id"] not in missing
+            ]
+            return {"results": results, "missing_ids": missing, "raw_response": {}, "tokens": 10 * len(items)}
+        finally:
+            state["in_flight"] -= 1
+
+    monkeypatch.setattr(llm_gemini, "call_gemini_api_async", fake_call)
+    monkeypatch.setattr(llm_gemini, "TRANSIENT_RETRY_BACKOFF", 0.0)
+    return state
+
+
+def _http_error(status):
+    url = URL("https://generativelanguage.googleapis.com")
+    request_info = aiohttp.RequestInfo(url, "POST", CIMultiDictProxy(CIMultiDict()), url)
+    return aiohttp.ClientResponseError(request_info, (), status=status)
+
+
+class _StubResponse:
+    """aiohttp response stand-in: an HTTP status and a JSON body."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise _http_error(self.status)
+
+    async def json(self, content_type=None):
+        return self.body
+
+
+class _StubSession:
+    """aiohttp session stand-in answering POSTs with the given outcomes in order.
+
+    An outcome is an HTTP status or an exception to raise.
+    """
+
+    def __init__(self, outcomes, body):
+        self.outcomes = list(outcomes)
+        self.body = body
+        self.posts = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _StubResponse(outcome, self.body)
+
+
+def _gemini_body(items):
+    text = "\n".join(
+        json.dumps({"id": item["id"], "sent_llm": 0.5, "stance": "bull", "sarcasm": False,
+                    "certainty": 0.9, "toxicity": 0.0})
+        for item in items
+    )
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}], "usageMetadata": {"totalTokenCount": 42}}
+
+
+def _items(n):
+    return pd.DataFrame({"id": [f"item_{i}" for i in range(n)], "text": [f"text {i}" for i in range(n)]})
+
+
+class TestBatchScoreGemini:
+    """Tests for batch_score_gemini."""
+
+    def test_results_in_input_order(self, gemini_keys, fake_api):
+        """Test concurrent batches are reassembled in input order."""
+        items = _items(50)
+
+        scored = llm_gemini.batch_score_gemini(
+            items, batch_size=5, write_raw=False, concurrency_per_key=2, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert scored["id"].tolist() == items["id"].tolist()
+        assert (scored["sent_llm"] == 0.5).all()
+        assert (scored["stance"] == "bull").all()
+
+    def test_requests_in_flight_across_keys(self, gemini_keys, fake_api):
+        """Test every key is used and several requests run at once."""
+        llm_gemini.batch_score_gemini(
+            _items(60), batch_size=5, write_raw=False, concurrency_per_key=2, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert fake_api["keys"] == {"test-key-1", "test-key-2", "test-key-3"}
+        assert fake_api["max_in_flight"] > 1
+
+    def test_neutral_fill_only_for_failed_batch(self, gemini_keys, fake_api):
+        """Test a failed batch is marked neutral and other batches keep their scores."""
+        fake_api["fail_ids"] = {"item_7"}  # Batch 2 of size 5: item_5 .. item_9
+
+        scored = llm_gemini.batch_score_gemini(
+            _items(20), batch_size=5, write_raw=False, quota_rpm=None, quota_tpm=None,
+        ).set_index("id")
+
+        failed = [f"item_{i}" for i in range(5, 10)]
+        assert (scored.loc[failed, "sent_llm"] == 0.0).all()
+        assert (scored.loc[failed, "stance"] == "neutral").all()
+        assert (scored.drop(index=failed)["sent_llm"] == 0.5).all()
+
+    def test_exhausted_keys_hand_off_batches(self, gemini_keys, fake_api):
+        """Test batches move to keys with quota left; beyond total quota they are neutral."""
+        # quota_rpd=2 with the 0.95 safety margin allows 1 request per key
+        scored = llm_gemini.batch_score_gemini(
+            _items(20), batch_size=5, write_raw=False, quota_rpd=2, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert (scored["sent_llm"] == 0.5).sum() == 15  # 3 keys x 1 batch
+        assert (scored["stance"] == "neutral").sum() == 5
+
+    def test_rpm_limit_paces_each_key(self, gemini_keys, fake_api):
+        """Test each key's RPM window delays requests beyond its budget."""
+        elapsed = asyncio.run(_timed_scoring(quota_rpm=1, window_seconds=0.1))
+
+        # 6 batches over 3 keys at 1 request per 0.1 s window: one extra window
+        assert elapsed >= 0.09
+
+    def test_connections_closed_on_error(self, gemini_keys, monkeypatch):
+        """Test the sentiment cache and key usage store are closed when scoring raises."""
+        closed = []
+        monkeypatch.setattr(llm_gemini.SentimentCache, "close", lambda self: closed.append("cache"))
+        monkeypatch.setattr(llm_gemini.KeyRotationManager, "close", lambda self: closed.append("keys"))
+
+        async def failing_scoring(*args, **kwargs):
+            raise RuntimeError("scoring crashed")
+
+        monkeypatch.setattr(llm_gemini, "score_batches_async", failing_scoring)
+
+        with pytest.raises(RuntimeError, match="scoring crashed"):
+            llm_gemini.batch_score_gemini(_items(3), write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert sorted(closed) == ["cache", "keys"]
+
+    def test_rate_limited_key_cools_down(self, gemini_keys, fake_api, monkeypatch):
+        """Test a 429 moves the batch to another key and cools the key down."""
+        calls = []
+
+        async def fake_call(session, items, api_key, model=llm_gemini.DEFAULT_MODEL, **kwargs):
+            calls.append(api_key)
+            if api_key == "test-key-1":
+                raise _http_error(429)
+            results = [{"id": item["id"], "sent_llm": 0.5} for item in items]
+            return {"results": results, "missing_ids": [], "raw_response": {}, "tokens": 0}
+
+        monkeypatch.setattr(llm_gemini, "call_gemini_api_async", fake_call)
+
+        scored = llm_gemini.batch_score_gemini(
+            _items(6), batch_size=1, write_raw=False, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert (scored["sent_llm"] == 0.5).all()
+        assert calls.count("test-key-1") == 1  # Cooling down for the rest of the run
+        assert len(calls) == 7
+
+
+class TestCallGeminiApiAsync:
+    """Tests for call_gemini_api_async against a stubbed aiohttp session."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        """Skip retry backoff."""
+        monkeypatch.setattr(llm_gemini, "TRANSIENT_RETRY_BACKOFF", 0.0)
+
+    @staticmethod
+    def _call(session, items):
+        return asyncio.run(llm_gemini.call_gemini_api_async(session, items, "test-key"))
+
+    @pytest.mark.parametrize("status", [400, 413, 429])
+    def test_client_errors_not_retried(self, status):
+        """Test 4xx responses are raised after a single request."""
+        items = [{"id": "a", "text": "SPY up"}]
+        session = _StubSession([status, 200], _gemini_body(items))
+
+        with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+            self._call(session, items)
+
+        assert excinfo.value.status == status
+        assert session.posts == 1
+
+    def test_single_request(self):
+        """Test server errors are raised after one request (the scoring queue retries)."""
+        items = [{"id": "a", "text": "SPY up"}]
+        session = _StubSession([503, 200], _gemini_body(items))
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            self._call(session, items)
+
+        assert session.posts == 1
+
+    def test_retries_acquire_a_key_again(self, gemini_keys, monkeypatch):
+        """Test 5xx and network retries go through the key manager and are counted."""
+        items = [{"id": "a", "text": "SPY up"}]
+        session = _StubSession([503, aiohttp.ClientConnectionError("reset"), 200], _gemini_body(items))
+        monkeypatch.setattr(llm_gemini.aiohttp, "ClientSession", lambda: session)
+        manager = llm_gemini.KeyRotationManager(env_prefix="GEMINI_API_KEY", quota_rpd=100)
+
+        scored = asyncio.run(llm_gemini.score_batches_async([items], manager))
+
+        assert session.posts == 3
+        assert manager.total_requests == 3
+        assert sum(manager.remaining_quota().values()) == 3 * 95 - 3
+        assert [r["id"] for r in scored[0].response["results"]] == ["a"]
+
+    def test_transient_retries_bounded(self, gemini_keys, monkeypatch):
+        """Test a request failing with 5xx is given up after MAX_TRANSIENT_RETRIES re-queues."""
+        items = [{"id": "a", "text": "SPY up"}, {"id": "b", "text": "VOO down"}]
+        session = _StubSession([503] * 10, _gemini_body(items))
+        monkeypatch.setattr(llm_gemini.aiohttp, "ClientSession", lambda: session)
+        manager = llm_gemini.KeyRotationManager(env_prefix="GEMINI_API_KEY")
+
+        scored = asyncio.run(llm_gemini.score_batches_async([items], manager))
+
+        assert scored == []
+        assert session.posts == 1 + llm_gemini.MAX_TRANSIENT_RETRIES
+
+    def test_oversized_batch_split_after_one_request(self, gemini_keys, monkeypatch):
+        """Test a 413 is bisected by the scoring queue without retrying the full batch."""
+        items = [{"id": f"item_{i}", "text": f"text {i}"} for i in range(4)]
+        sizes = []
+
+        class SizeLimitedSession(_StubSession):
+            def post(self, url, json=None, **kwargs):
+                self.posts += 1
+                sent = [item for item in items if item["id"] in str(json)]
+                sizes.append(len(sent))
+                return _StubResponse(413 if len(sent) > 2 else 200, _gemini_body(sent))
+
+        monkeypatch.setattr(llm_gemini.aiohttp, "ClientSession", lambda: SizeLimitedSession([], None))
+        manager = llm_gemini.KeyRotationManager(env_prefix="GEMINI_API_KEY")
+
+        scored = asyncio.run(llm_gemini.score_batches_async([items], manager))
+
+        assert sizes == [4, 2, 2]
+        assert sorted(r["id"] for batch in scored for r in batch.response["results"]) == [i["id"] for i in items]
+
+
+class TestSentimentCaching:
+    """Tests for sentiment cache use in batch_score_gemini."""
+
+    def test_rerun_is_served_from_cache(self, gemini_keys, fake_api):
+        """Test a second run sends nothing and returns the cached scores."""
+        items = _items(12)
+        llm_gemini.batch_score_gemini(items, batch_size=5, write_raw=False, quota_rpm=None, quota_tpm=None)
+        fake_api["sent_ids"].clear()
+
+        scored = llm_gemini.batch_score_gemini(items, batch_size=5, write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert fake_api["sent_ids"] == []
+        assert (scored["sent_llm"] == 0.5).all()
+        assert scored["sarcasm"].tolist() == [False] * 12
+
+    def test_null_cached_fields_filled_without_warnings(self, gemini_keys, fake_api, data_dir):
+        """Test NULL sarcasm/toxicity from the cache come back as typed neutral values."""
+        items = _items(3)
+        cache = SentimentCache(data_dir / "state" / "sentiment_cache.sqlite")
+        cache.put_many({
+            cache_key(llm_gemini.DEFAULT_MODEL, llm_gemini.PROMPT_VERSION, text): {"sent_llm": 0.1, "stance": "bull"}
+            for text in items["text"]
+        })
+        cache.close()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            scored = llm_gemini.batch_score_gemini(items, write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert fake_api["sent_ids"] == []
+        assert scored["sarcasm"].dtype == bool
+        assert scored["sarcasm"].tolist() == [False] * 3
+        assert scored["toxicity"].tolist() == [0.0] * 3
+
+    def test_repeated_text_sent_once(self, gemini_keys, fake_api):
+        """Test syndicated copies of a text (whitespace aside) cost one item."""
+        items = pd.DataFrame({
+            "id": ["a", "b", "c"],
+            "text": ["Fed holds rates", "Fed  holds rates ", "SPY rallies"],
+        })
+
+        scored = llm_gemini.batch_score_gemini(items, write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert sorted(fake_api["sent_ids"]) == ["a", "c"]
+        assert scored["id"].tolist() == ["a", "b", "c"]
+        assert (scored["sent_llm"] == 0.5).all()
+
+    def test_failed_batches_not_cached(self, gemini_keys, fake_api):
+        """Test neutral-filled items are re-sent on the next run."""
+        fake_api["fail_ids"] = {"item_1"}
+        llm_gemini.batch_score_gemini(_items(4), batch_size=2, write_raw=False, quota_rpm=None, quota_tpm=None)
+        fake_api["fail_ids"] = set()
+        fake_api["sent_ids"].clear()
+
+        scored = llm_gemini.batch_score_gemini(_items(4), batch_size=2, write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert sorted(fake_api["sent_ids"]) == ["item_0", "item_1"]
+        assert (scored["sent_llm"] == 0.5).all()
+
+    def test_cache_disabled(self, gemini_keys, fake_api, data_dir):
+        """Test use_cache=False neither reads nor creates the cache."""
+        llm_gemini.batch_score_gemini(_items(3), write_raw=False, use_cache=False, quota_rpm=None, quota_tpm=None)
+
+        assert not (data_dir / "state" / "sentiment_cache.sqlite").exists()
+
+
+class TestTokenBudgetBatching:
+    """Tests for token estimation, batch packing and bisect-and-retry."""
+
+    def test_pack_respects_input_budget(self):
+        """Test batches close before exceeding the input token budget."""
+        items = [{"id": str(i), "text": "x" * 400} for i in range(10)]  # ~104 tokens each
+        budget = llm_gemini.PROMPT_OVERHEAD_TOKENS + 350
+
+        batches = llm_gemini.pack_batches(items, max_input_tokens=budget)
+
+        assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+        assert [item for batch in batches for item in batch] == items
+        for batch in batches:
+            input_tokens = llm_gemini.PROMPT_OVERHEAD_TOKENS + sum(map(llm_gemini.estimate_item_tokens, batch))
+            assert input_tokens <= budget
+
+    def test_pack_respects_item_and_output_limits(self):
+        """Test max_items and the output budget both cap batch length."""
+        items = [{"id": str(i), "text": "hi"} for i in range(10)]
+
+        assert [len(b) for b in llm_gemini.pack_batches(items, max_items=4)] == [4, 4, 2]
+        by_output = llm_gemini.pack_batches(items, max_output_tokens=3 * llm_gemini.OUTPUT_TOKENS_PER_ITEM)
+        assert [len(b) for b in by_output] == [3, 3, 3, 1]
+
+    def test_oversized_item_sent_alone(self):
+        """Test an item larger than the budget gets its own batch."""
+        items = [{"id": "a", "text": "short"}, {"id": "b", "text": "y" * 10_000}, {"id": "c", "text": "short"}]
+
+        batches = llm_gemini.pack_batches(items, max_input_tokens=llm_gemini.PROMPT_OVERHEAD_TOKENS + 500)
+
+        assert [[item["id"] for item in batch] for batch in batches] == [["a"], ["b"], ["c"]]
+
+    def test_estimate_counts_utf8_bytes(self):
+        """Test multi-byte text is not underestimated."""
+        assert llm_gemini.estimate_tokens("abcd") == 1
+        assert llm_gemini.estimate_tokens("🚀🚀") == 2
+
+    def test_failed_batch_bisected(self, gemini_keys, fake_api):
+        """Test a batch the model cannot handle is split until the halves succeed."""
+        fake_api["max_items"] = 3  # Batches above 3 items come back garbled
+
+        scored = llm_gemini.batch_score_gemini(
+            _items(10), batch_size=10, write_raw=False, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert (scored["sent_llm"] == 0.5).all()
+        assert sorted(fake_api["sent_ids"]) == sorted(scored["id"])
+        # 10 -> 5 + 5 -> (2 + 3) + (2 + 3): 3 failed + 4 successful calls
+        assert fake_api["calls"] == 7
+
+    def test_single_item_failure_is_neutral(self, gemini_keys, fake_api):
+        """Test bisection stops at single items and only those are neutral."""
+        fake_api["garbled_ids"] = {"item_2"}
+
+        scored = llm_gemini.batch_score_gemini(
+            _items(8), batch_size=8, write_raw=False, quota_rpm=None, quota_tpm=None,
+        ).set_index("id")
+
+        assert scored.loc["item_2", "stance"] == "neutral"
+        assert (scored.drop(index="item_2")["sent_llm"] == 0.5).all()
+
+    def test_bisect_only_size_dependent_errors(self):
+        """Test 429s and server errors are not bisected, parse and 400/413 errors are."""
+        assert llm_gemini._should_bisect(ValueError("bad json"))
+        assert llm_gemini._should_bisect(_http_error(400))
+        assert llm_gemini._should_bisect(_http_error(413))
+        assert not llm_gemini._should_bisect(_http_error(429))
+        assert not llm_gemini._should_bisect(_http_error(503))
+        assert not llm_gemini._should_bisect(asyncio.TimeoutError())
+
+
+class TestPartialResultSalvage:
+    """Tests for salvage mode of parse_gemini_response and re-queueing."""
+
+    ITEMS = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+
+    def test_strict_mode_still_raises(self):
+        """Test the default mode rejects an ID mismatch."""
+        with pytest.raises(ValueError, match="ID mismatch"):
+            llm_gemini.parse_gemini_response('[{"id": "a", "sent_llm": 0.1}]', self.ITEMS)
+
+    def test_salvage_keeps_valid_and_reports_missing(self):
+        """Test hallucinated, duplicate and non-numeric results are dropped, the rest kept."""
+        text = json.dumps([
+            {"id": "a", "sent_llm": 2.0, "stance": "bull"},
+            {"id": "zzz", "sent_llm": 0.3},
+            {"id": "a", "sent_llm": -1.0},
+            {"id": "c", "sent_llm": "very positive"},
+        ])
+
+        results, missing = llm_gemini.parse_gemini_response(text, self.ITEMS, salvage=True)
+
+        assert results == [{"id": "a", "sent_llm": 1.0, "stance": "bull"}]
+        assert missing == ["b", "c"]
+
+    def test_salvage_truncated_output(self):
+        """Test complete objects before a truncated tail are kept."""
+        text = '[{"id": "a", "sent_llm": 0.2}, {"id": "b", "sent_llm": -0.4}, {"id": "c", "sent_l'
+
+        results, missing = llm_gemini.parse_gemini_response(text, self.ITEMS, salvage=True)
+
+        assert [r["id"] for r in results] == ["a", "b"]
+        assert missing == ["c"]
+
+    def test_salvage_jsonl_and_numeric_ids(self):
+        """Test JSONL output and IDs echoed back as numbers are accepted."""
+        items = [{"id": "1"}, {"id": "2"}]
+        text = '{"id": 1, "sent_llm": 0.2}\n{"id": "2", "sent_llm": 0.1}\n'
+
+        results, missing = llm_gemini.parse_gemini_response(text, items, salvage=True)
+
+        assert [r["id"] for r in results] == ["1", "2"]
+        assert missing == []
+
+    def test_missing_items_requeued(self, gemini_keys, fake_api):
+        """Test only the missing items are sent again and end up scored."""
+        fake_api["dropped_ids"] = {"item_3"}
+
+        scored = llm_gemini.batch_score_gemini(_items(10), batch_size=10, write_raw=False, quota_rpm=None, quota_tpm=None)
+
+        assert (scored["sent_llm"] == 0.5).all()
+        assert fake_api["calls"] == 2
+        assert sorted(fake_api["sent_ids"]) == sorted([f"item_{i}" for i in range(10)] + ["item_3"])
+
+    def test_requeue_is_bounded(self, gemini_keys, fake_api):
+        """Test items still missing after max_salvage_retries are neutral."""
+        fake_api["dropped_ids"] = {"item_3"}
+        fake_api["drop_times"] = 10
+
+        scored = llm_gemini.batch_score_gemini(
+            _items(10), batch_size=10, write_raw=False, max_salvage_retries=2, quota_rpm=None, quota_tpm=None,
+        ).set_index("id")
+
+        assert fake_api["calls"] == 3  # Original request + 2 retries
+        assert scored.loc["item_3", "stance"] == "neutral"
+        assert (scored.drop(index="item_3")["sent_llm"] == 0.5).all()
+
+    def test_salvage_stats(self):
+        """Test salvage metrics over scored requests."""
+        def scored(part, n_items, missing):
+            items = [{"id": str(i)} for i in range(n_items)]
+            results = [{"id": str(i)} for i in range(n_items - len(missing))]
+            return llm_gemini.ScoredBatch(0, part, items, "K", {"results": results, "missing_ids": missing})
+
+        stats = llm_gemini.salvage_stats([scored((), 10, ["8", "9"]), scored((2,), 2, [])])
+
+        assert stats == {
+            "partial_responses": 1,
+            "salvaged_items": 8,
+            "salvage_rate": 0.8,
+            "requeued_items": 2,
+            "recovered_items": 2,
+        }
+
+
+class TestLeaderOnlyScoring:
+    """Tests for leaders_only scoring in batch_score_gemini."""
+
+    @staticmethod
+    def _clustered():
+        # Cluster a: a (leader), a1 (1 bit away), a2 (8 bits away); b is a singleton
+        return pd.DataFrame({
+            "id": ["a", "a1", "b", "a2"],
+            "text": ["SPY to the moon", "SPY to the moon!!", "Fed cuts", "SPY to the moon lol"],
+            "cluster_id": ["a", "a", "b", "a"],
+            "is_dupe": [False, True, False, True],
+            "simhash": np.array([0b0, 0b1, 0b1111_0000, 0xFF], dtype=np.uint64),
+        })
+
+    def test_members_inherit_leader_sentiment(self, gemini_keys, fake_api):
+        """Test only leaders are sent and members copy their leader's scores."""
+        fake_api["sent_llm"] = {"a": 0.8, "b": -0.4}
+
+        scored = llm_gemini.batch_score_gemini(
+            self._clustered(), write_raw=False, leaders_only=True, quota_rpm=None, quota_tpm=None,
+        )
+
+        assert sorted(fake_api["sent_ids"]) == ["a", "b"]
+        assert scored["id"].tolist() == ["a", "a1", "b", "a2"]
+        assert scored["sent_llm"].tolist() == [0.8, 0.8, -0.4, 0.8]
+
+    def test_low_similarity_members_scored(self, gemini_keys, fake_api):
+        """Test members beyond member_override_distance get their own score."""
+        fake_api["sent_llm"] = {"a": 0.8, "a2": -0.9, "b": -0.4}
+
+        scored = llm_gemini.batch_score_gemini(
+            self._clustered(), write_raw=False, leaders_only=True, member_override_distance=3,
+            quota_rpm=None, quota_tpm=None,
+        )
+
+        assert sorted(fake_api["sent_ids"]) == ["a", "a2", "b"]
+        assert scored["sent_llm"].tolist() == [0.8, 0.8, -0.4, -0.9]
+
+    def test_member_without_leader_scored(self, gemini_keys, fake_api):
+        """Test a duplicate whose leader is not in the frame is scored itself."""
+        items = self._clustered().iloc[1:]
+
+        llm_gemini.batch_score_gemini(items, write_raw=False, leaders_only=True, quota_rpm=None, quota_tpm=None)
+
+        assert sorted(fake_api["sent_ids"]) == ["a1", "a2", "b"]
+
+    def test_requires_dedupe_fields(self, gemini_keys, fake_api):
+        """Test leaders_only without dedupe columns is rejected."""
+        with pytest.raises(ValueError, match="cluster_id"):
+            llm_gemini.batch_score_gemini(_items(3), write_raw=False, leaders_only=True)
+
+
+class TestSentimentCache:
+    """Tests for SentimentCache."""
+
+    SCORE = {"sent_llm": -0.2, "stance": "bear", "sarcasm": True, "certainty": 0.7, "toxicity": None}
+
+    def test_roundtrip(self, tmp_path):
+        """Test stored fields come back with their types."""
+        cache = SentimentCache(tmp_path / "cache.sqlite")
+        cache.put_many({"k1": self.SCORE})
+
+        assert cache.get_many(["k1", "k2"]) == {"k1": self.SCORE}
+
+    def test_sarcasm_parsed_strictly(self, tmp_path):
+        """Test sarcasm accepts bools, 0/1 and "true"/"false" and stores anything else as NULL."""
+        cache = SentimentCache(tmp_path / "cache.sqlite")
+        values = {"b": False, "i": 1, "s": " TRUE ", "f": "false", "no": "no", "x": 0.5, "n": None}
+        cache.put_many({key: {**self.SCORE, "sarcasm": value} for key, value in values.items()})
+
+        found = cache.get_many(values)
+
+        assert {key: fields["sarcasm"] for key, fields in found.items()} == {
+            "b": False, "i": True, "s": True, "f": False, "no": None, "x": None, "n": None,
+        }
+
+    def test_key_depends_on_model_and_prompt_version(self):
+        """Test the key changes with model and prompt version but not whitespace."""
+        key = cache_key("m1", 1, "Fed holds rates")
+
+        assert key == cache_key("m1", 1, "  Fed\nholds   rates")
+        assert key != cache_key("m2", 1, "Fed holds rates")
+        assert key != cache_key("m1", 2, "Fed holds rates")
+        assert normalize_text("ﬁnance\t news") == "finance news"
+
+    def test_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Test entries over max_entries are evicted oldest-use first."""
+        clock = iter(range(100))
+        monkeypatch.setattr("orbit.ingest.sentiment_cache.time.time", lambda: next(clock))
+        cache = SentimentCache(tmp_path / "cache.sqlite", max_entries=2)
+
+        cache.put_many({"a": self.SCORE})
+        cache.put_many({"b": self.SCORE})
+        cache.get_many(["a"])  # "b" is now least recently used
+        cache.put_many({"c": self.SCORE})
+
+        assert len(cache) == 2
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+async def _timed_scoring(quota_rpm, window_seconds):
+    manager = llm_gemini.KeyRotationManager(
+        env_prefix="GEMINI_API_KEY", quota_rpd=1000, quota_rpm=quota_rpm, window_seconds=window_seconds,
+    )
+    batches = [[{"id": f"b{i}", "text": "x"}] for i in range(6)]
+    start = asyncio.get_running_loop().time()
+    scored = await llm_gemini.score_batches_async(batches, manager)
+    assert [batch.batch_idx for batch in scored] == list(range(6))
+    return asyncio.get_running_loop().time() - start
@@ -0,0 +1,42 @@
+"""Unit tests for orbit.ingest.news module.
+
+Tests buffered flushes of WebSocket news to date-partitioned Parquet.
+"""
+
+import pytest
+
+from orbit import io
+from orbit.ingest import news
+
+
+def _message(msg_id, published_at):
+    return {"msg_id": msg_id, "headline": f"headline {msg_id}", "published_at": published_at}
+
+
+class TestFlushToParquet:
+    """Tests for flush_to_parquet function."""
+
+    def test_repeated_flushes_same_day(self, tmp_path, monkeypatch):
+        """Test a second flush of the same day appends instead of raising FileExistsError."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+
+        news.flush_to_parquet([_message("a", "2024-11-05T14:00:00Z")], run_id="ws1")
+        news.flush_to_parquet([
+            _message("b", "2024-11-05T15:00:00Z"),
+            _message("c", "2024-11-06T15:00:00Z"),
+        ], run_id="ws1")
+
+        day_1 = io.read_partition("raw/news", "2024-11-05", id_column="msg_id")
+        day_2 = io.read_partition("raw/news", "2024-11-06", id_column="msg_id")
+
+        assert day_1["msg_id"].tolist() == ["a", "b"]
+        assert day_2["msg_id"].tolist() == ["c"]
+        assert len(io.partition_files(tmp_path / "raw/news/date=2024-11-05")) == 2
+
+    def test_empty_flush(self):
+        """Test flushing no messages writes nothing."""
+        assert news.flush_to_parquet([]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,13 +4,17 @@ Tests Alpaca REST API historical news backfill with mocked responses.
 """
 
 import json
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 import pandas as pd
 import pytest
+import requests
 
+from orbit import io as orbit_io
 from orbit.ingest import news_backfill
 
 
@@ -229,6 +233,23 @@ class TestGetAlpacaCredsForRest:
         with pytest.raises(ValueError, match="Alpaca REST API credentials not found"):
             news_backfill.get_alpaca_creds_for_rest()
 
+    @patch.dict("os.environ", {
+        "ALPACA_API_KEY_1": "key1",
+        "ALPACA_API_SECRET_1": "secret1",
+        "ALPACA_API_KEY_2": "key2",  # No SECRET_2
+        "ALPACA_API_KEY_3": "key3",
+        "ALPACA_API_SECRET_3": "secret3",
+    }, clear=True)
+    def test_load_rest_credentials_pairs_numbered_keys(self, capsys):
+        """Test multi-key mode pairs each numbered key with its secret, skipping unpaired keys."""
+        credentials = news_backfill.load_rest_credentials(use_multi_key=True)
+
+        assert credentials == [
+            ("ALPACA_API_KEY_1", "key1", "secret1"),
+            ("ALPACA_API_KEY_3", "key3", "secret3"),
+        ]
+        assert "ALPACA_API_KEY_2 has no matching secret" in capsys.readouterr().out
+
 
 class TestBackfillIntegration:
     """Integration tests for full backfill workflow."""
@@ -302,5 +323,208 @@ class TestRateLimiting:
         assert abs(expected_interval - 0.316) < 0.001
 
 
+@pytest.fixture
+def alpaca_keys(monkeypatch, tmp_path):
+    """Three numbered Alpaca REST keys; data dir and cwd (checkpoints) in tmp_path."""
+    for i in range(1, 6):
+        monkeypatch.delenv(f"ALPACA_API_KEY_{i}", raising=False)
+        monkeypatch.delenv(f"ALPACA_API_SECRET_{i}", raising=False)
+    for i in range(1, 4):
+        monkeypatch.setenv(f"ALPACA_API_KEY_{i}", f"key{i}")
+        monkeypatch.setenv(f"ALPACA_API_SECRET_{i}", f"secret{i}")
+    monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.fixture
+def fake_alpaca(monkeypatch):
+    """Replace fetch_news_page with a fake serving `pages` pages of 2 articles per day.
+
+    Options (set on the returned state): pages, fail_days (HTTP 500) and
+    rate_limited (day -> number of 429s before its pages succeed).
+    Records (api_key, day, page_token, monotonic time) per call.
+    """
+    state = {"pages": 2, "fail_days": set(), "rate_limited": {}, "calls": []}
+    lock = threading.Lock()
+
+    def fake_fetch(symbols, start, end, api_key, api_secret, page_token=None, session=None, **kwargs):
+        day = start[:10]
+        assert api_secret == api_key.replace("key", "secret")
+        with lock:
+            state["calls"].append((api_key, day, page_token, time.monotonic()))
+            if state["rate_limited"].get(day, 0) > 0:
+                state["rate_limited"][day] -= 1
+                raise _http_error(429)
+        if day in state["fail_days"]:
+            raise _http_error(500)
+
+        page = int(page_token) if page_token else 0
+        news = [
+            {
+                "id": f"{day}-{page}-{i}",
+                "headline": f"Headline {day} {page} {i}",
+                "source": "benzinga",
+                "created_at": f"{day}T{10 + page:02d}:00:00Z",
+                "symbols": ["SPY"],
+            }
+            for i in range(2)
+        ]
+        next_token = str(page + 1) if page + 1 < state["pages"] else None
+        return {"news": news, "next_page_token": next_token}
+
+    monkeypatch.setattr(news_backfill, "fetch_news_page", fake_fetch)
+    return state
+
+
+def _backfill(start_date, end_date, **kwargs):
+    kwargs.setdefault("quota_rpm", 60_000)
+    return news_backfill.backfill_news_date_range(
+        symbols=["SPY"], start_date=start_date, end_date=end_date, **kwargs
+    )
+
+
+class TestConcurrentBackfill:
+    """Tests for the per-key worker pool over day shards."""
+
+    def test_all_days_and_pages_written(self, alpaca_keys, fake_alpaca, tmp_path):
+        """Test every day's token chain is followed and written to its date partition."""
+        result = _backfill("2024-11-01", "2024-11-05", run_id="test")
+
+        assert result["articles_fetched"] == 16
+        assert result["requests_made"] == 8
+        assert result["failed_dates"] == []
+        for day in ("2024-11-01", "2024-11-02", "2024-11-03", "2024-11-04"):
+            df = orbit_io.read_partition("raw/news", day, id_column="msg_id")
+            assert sorted(df["msg_id"]) == [f"{day}-{p}-{i}" for p in range(2) for i in range(2)]
+        assert not (tmp_path / "raw" / "news" / "date=2024-11-05").exists()
+        assert not list(tmp_path.glob(".backfill_checkpoint_*"))
+
+    def test_pages_of_a_day_stay_in_order(self, alpaca_keys, fake_alpaca):
+        """Test each day's pages are requested in token order."""
+        fake_alpaca["pages"] = 3
+
+        _backfill("2024-11-01", "2024-11-04", write_raw=False)
+
+        for day in ("2024-11-01", "2024-11-02", "2024-11-03"):
+            tokens = [token for _, d, token, _ in fake_alpaca["calls"] if d == day]
+            assert tokens == [None, "1", "2"]
+
+    def test_throughput_scales_with_keys(self, alpaca_keys, fake_alpaca, monkeypatch):
+        """Test each key is paced by its own limiter, so more keys finish sooner."""
+        fake_alpaca["pages"] = 1
+        interval = 0.1  # quota_rpm=600
+
+        start = time.monotonic()
+        _backfill("2024-11-01", "2024-11-10", quota_rpm=600, write_raw=False)
+        multi_elapsed = time.monotonic() - start
+
+        for api_key in ("key1", "key2", "key3"):
+            stamps = sorted(t for key, _, _, t in fake_alpaca["calls"] if key == api_key)
+            assert stamps
+            assert all(b - a >= interval - 0.02 for a, b in zip(stamps, stamps[1:]))
+
+        for i in (2, 3):
+            monkeypatch.delenv(f"ALPACA_API_KEY_{i}")
+        fake_alpaca["calls"].clear()
+        start = time.monotonic()
+        _backfill("2024-11-01", "2024-11-10", quota_rpm=600, write_raw=False)
+        single_elapsed = time.monotonic() - start
+
+        # 9 requests: 8 intervals on one key vs ~2 per key on three
+        assert {key for key, _, _, _ in fake_alpaca["calls"]} == {"key1"}
+        assert single_elapsed >= 8 * interval - 0.05
+        assert multi_elapsed < single_elapsed / 2
+
+    def test_rate_limited_page_is_retried(self, alpaca_keys, fake_alpaca, monkeypatch):
+        """Test a 429 backs off and retries the same page instead of dropping the day."""
+        monkeypatch.setattr(news_backfill, "RATE_LIMIT_BACKOFF", 0.01)
+        fake_alpaca["rate_limited"] = {"2024-11-02": 2}
+
+        result = _backfill("2024-11-01", "2024-11-03")
+
+        assert result["failed_dates"] == []
+        assert result["articles_fetched"] == 8
+        assert result["requests_made"] == 6
+        assert len(orbit_io.read_partition("raw/news", "2024-11-02", id_column="msg_id")) == 4
+
+    def test_failed_day_not_written(self, alpaca_keys, fake_alpaca, tmp_path):
+        """Test a failed day is reported and left unwritten so the next run retries it."""
+        fake_alpaca["fail_days"] = {"2024-11-02"}
+
+        result = _backfill("2024-11-01", "2024-11-04")
+
+        assert result["failed_dates"] == ["2024-11-02"]
+        assert result["articles_fetched"] == 8
+        assert not (tmp_path / "raw" / "news" / "date=2024-11-02").exists()
+        assert news_backfill.scan_existing_news_dates(tmp_path) == {"2024-11-01", "2024-11-03"}
+
+    def test_failed_day_keeps_checkpoint(self, alpaca_keys, fake_alpaca, tmp_path):
+        """Test a run with failed days keeps its checkpoint and a resume retries only those days."""
+        fake_alpaca["fail_days"] = {"2024-11-02"}
+        _backfill("2024-11-01", "2024-11-04", run_id="retry")
+
+        checkpoint = news_backfill.load_checkpoint(tmp_path / ".backfill_checkpoint_retry.json")
+        assert checkpoint["failed_dates"] == ["2024-11-02"]
+        assert sorted(checkpoint["completed_dates"]) == ["2024-11-01", "2024-11-03"]
+
+        fake_alpaca["fail_days"] = set()
+        fake_alpaca["calls"].clear()
+        result = _backfill("2024-11-01", "2024-11-04", run_id="retry", reset=True)
+
+        assert sorted({day for _, day, _, _ in fake_alpaca["calls"]}) == ["2024-11-02"]
+        assert result["failed_dates"] == []
+        assert not (tmp_path / ".backfill_checkpoint_retry.json").exists()
+
+    def test_dead_worker_does_not_hang(self, alpaca_keys, monkeypatch):
+        """Test the collector raises a worker's crash instead of waiting for its shard."""
+        monkeypatch.setattr(news_backfill, "RESULT_POLL_SECONDS", 0.05)
+
+        def crashing_fetch_day(*args, **kwargs):
+            raise MemoryError("worker crashed")
+
+        monkeypatch.setattr(news_backfill, "fetch_news_day", crashing_fetch_day)
+
+        with pytest.raises(MemoryError, match="worker crashed"):
+            _backfill("2024-11-01", "2024-11-03")
+
+    def test_stop_interrupts_rate_limit_backoff(self, fake_alpaca):
+        """Test setting stop ends a 429 backoff right away instead of sleeping it out."""
+        fake_alpaca["rate_limited"] = {"2024-11-01": 1}
+        stop = threading.Event()
+        threading.Timer(0.1, stop.set).start()
+        limiter = news_backfill.TokenBucket(rate=100)
+
+        start = time.monotonic()
+        shard = news_backfill.fetch_news_day(
+            ["SPY"], datetime(2024, 11, 1, tzinfo=timezone.utc), datetime(2024, 11, 2, tzinfo=timezone.utc),
+            "key1", "secret1", limiter=limiter, stop=stop,
+        )
+
+        assert time.monotonic() - start < 5
+        assert shard.error == "interrupted"
+        assert shard.requests == 1
+
+    def test_existing_and_checkpointed_days_skipped(self, alpaca_keys, fake_alpaca, tmp_path):
+        """Test incremental runs skip ingested days and resume skips checkpointed ones."""
+        _backfill("2024-11-01", "2024-11-02")
+        news_backfill.save_checkpoint(
+            tmp_path / ".backfill_checkpoint_resume.json",
+            {"run_id": "resume", "completed_dates": ["2024-11-02"], "articles_fetched": 4, "requests_made": 2},
+        )
+        fake_alpaca["calls"].clear()
+
+        result = _backfill("2024-11-01", "2024-11-04", run_id="resume")
+
+        assert sorted({day for _, day, _, _ in fake_alpaca["calls"]}) == ["2024-11-03"]
+        assert result["articles_fetched"] == 8
+        assert result["requests_made"] == 4
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""Unit tests for orbit.ingest.partition_writer module.
+
+Tests append-only part files, id-level dedup and end-of-run compaction.
+"""
+
+import pandas as pd
+import pytest
+
+from orbit import io as orbit_io
+from orbit.ingest.partition_writer import PartitionWriter
+
+
+def _rows(ids, source):
+    return pd.DataFrame({"id": ids, "source": [source] * len(ids)})
+
+
+class TestPartitionWriter:
+    """Tests for PartitionWriter."""
+
+    def test_write_appends_parts_without_rewrites(self, tmp_path):
+        """Test each write adds a part file and skips ids already in the partition."""
+        writer = PartitionWriter(tmp_path, "social", run_id="run1")
+
+        assert writer.write("2024-11-05", _rows(["a", "b"], "stocks")) == 2
+        assert writer.write("2024-11-05", _rows(["b", "c", "c"], "investing")) == 1
+        assert writer.write("2024-11-05", _rows(["a"], "wallstreetbets")) == 0
+
+        partition = tmp_path / "raw/social/date=2024-11-05"
+        assert sorted(p.name for p in partition.iterdir()) == [
+            "part-run1-00000.parquet",
+            "part-run1-00001.parquet",
+        ]
+
+    def test_compact_merges_with_existing_file(self, tmp_path):
+        """Test compaction keeps existing rows first and removes part files."""
+        partition = tmp_path / "raw/social/date=2024-11-05"
+        partition.mkdir(parents=True)
+        _rows(["x", "a"], "existing").to_parquet(partition / "social.parquet", index=False)
+
+        writer = PartitionWriter(tmp_path, "social", run_id="run2")
+        writer.write("2024-11-05", _rows(["a", "b"], "stocks"))
+        writer.write("2024-11-06", _rows(["c"], "stocks"))
+
+        assert writer.compact() == 2
+
+        day_1 = pd.read_parquet(partition / "social-g000001-00000.parquet")
+        assert day_1["id"].tolist() == ["x", "a", "b"]
+        assert day_1["source"].tolist() == ["existing", "existing", "stocks"]
+        assert [p.name for p in partition.glob("*.parquet")] == ["social-g000001-00000.parquet"]
+        assert len(orbit_io.partition_files(tmp_path / "raw/social/date=2024-11-06")) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
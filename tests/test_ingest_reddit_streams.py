@@ -0,0 +1,91 @@
+"""Unit tests for orbit.ingest.reddit_utils.fileStreams module.
+
+Tests the bytes-level line splitter and batched JSON readers used for
+Pushshift/Arctic Shift dump files, using in-memory streams.
+"""
+
+import io
+import json
+
+import pytest
+
+from orbit.ingest.reddit_utils import fileStreams
+
+
+def _jsonl(records):
+    return b"".join(json.dumps(r).encode() + b"\n" for r in records)
+
+
+class TestIterLineBatches:
+    """Tests for iterLineBatches function."""
+
+    def test_lines_split_across_chunks(self):
+        """Test lines spanning read boundaries are reassembled intact."""
+        data = b"first line\nsecond, longer line\n\nthird"
+
+        batches = list(fileStreams.iterLineBatches(io.BytesIO(data), chunk_size=4))
+        lines = [line for batch in batches for line in batch]
+
+        assert lines == [b"first line", b"second, longer line", b"", b"third"]
+
+    def test_line_longer_than_chunk(self):
+        """Test a single line larger than chunk_size is yielded once complete."""
+        data = b"x" * 100 + b"\ny\n"
+
+        batches = list(fileStreams.iterLineBatches(io.BytesIO(data), chunk_size=8))
+
+        assert [line for batch in batches for line in batch] == [b"x" * 100, b"y"]
+
+    def test_empty_stream(self):
+        """Test empty input yields nothing."""
+        assert list(fileStreams.iterLineBatches(io.BytesIO(b""))) == []
+
+
+class TestParseJsonLines:
+    """Tests for parseJsonLines function."""
+
+    def test_skips_blank_and_malformed_lines(self):
+        """Test blank and malformed lines are dropped without stopping the batch."""
+        lines = [b'{"id": "a"}', b"", b"{not json", b'{"id": "b"}']
+
+        records = fileStreams.parseJsonLines(lines)
+
+        assert [r["id"] for r in records] == ["a", "b"]
+
+    def test_invalid_utf8_is_replaced(self):
+        """Test invalid UTF-8 bytes fall back to a lossy decode."""
+        records = fileStreams.parseJsonLines([b'{"title": "caf\xe9"}'])
+
+        assert records == [{"title": "caf�"}]
+
+
+class TestFileJsonBatches:
+    """Tests for batched file readers."""
+
+    def test_jsonl_batches(self):
+        """Test .jsonl files stream as batches of parsed records."""
+        records = [{"id": str(i), "title": f"post {i}"} for i in range(50)]
+
+        batches = list(fileStreams.getFileJsonBatches("dump.jsonl", io.BytesIO(_jsonl(records))))
+
+        assert [r for batch in batches for r in batch] == records
+
+    def test_zst_stream_matches_records(self):
+        """Test .zst dumps decompress and parse across small chunks."""
+        zstandard = pytest.importorskip("zstandard")
+        records = [{"id": str(i), "selftext": "é" * (i % 7)} for i in range(200)]
+        compressed = zstandard.ZstdCompressor().compress(_jsonl(records))
+
+        batches = list(fileStreams.getZstFileJsonBatches(io.BytesIO(compressed), chunk_size=256))
+
+        assert len(batches) > 1
+        assert [r for batch in batches for r in batch] == records
+        assert list(fileStreams.getFileJsonStream("RS_2024-01.zst", io.BytesIO(compressed))) == records
+
+    def test_unknown_extension(self):
+        """Test unsupported extensions return None."""
+        assert fileStreams.getFileJsonBatches("dump.csv", io.BytesIO(b"")) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
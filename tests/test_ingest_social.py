@@ -4,6 +4,7 @@ Tests Arctic Shift Reddit API historical post backfill with mocked responses.
 """
 
 import hashlib
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -11,6 +12,7 @@ from unittest.mock import Mock, patch
 import pandas as pd
 import pytest
 
+from orbit import io as orbit_io
 from orbit.ingest import social_arctic
 
 
@@ -336,6 +338,81 @@ class TestFetchPostsForDay:
         assert "User-Agent" in call_kwargs["headers"]
 
 
+class TestConcurrentBackfill:
+    """Tests for concurrent fetching in backfill_social."""
+
+    @staticmethod
+    def _fake_fetch(subreddit, date, **kwargs):
+        """Deterministic posts per (subreddit, date), with a cross-subreddit duplicate."""
+        time.sleep(0.01 * (len(subreddit) % 3))  # Finish out of order
+        base = int(date.replace(tzinfo=timezone.utc).timestamp()) + 3600
+        return [
+            {"id": f"{subreddit}-{date:%m%d}", "created_utc": base, "subreddit": subreddit,
+             "author": "user1", "title": f"SPY talk in {subreddit}", "selftext": ""},
+            {"id": f"shared-{date:%m%d}", "created_utc": base + 1, "subreddit": subreddit,
+             "author": "user2", "title": "market update", "selftext": subreddit},
+        ]
+
+    def test_concurrent_matches_sequential(self, tmp_path, monkeypatch):
+        """Test concurrency > 1 writes the same partitions as the sequential path."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(social_arctic, "fetch_posts_for_day", self._fake_fetch)
+
+        subreddits = ["stocks", "investing", "wallstreetbets"]
+        for concurrency, name in ((1, "sequential"), (4, "concurrent")):
+            social_arctic.backfill_social(
+                "2024-11-04", "2024-11-06", subreddits,
+                data_dir=tmp_path / name, reset=True, concurrency=concurrency,
+            )
+
+        for day in ("04", "05", "06"):
+            partition = f"raw/social/date=2024-11-{day}"
+            expected = orbit_io.read_partition(tmp_path / "sequential" / "raw/social", f"2024-11-{day}")
+            result = orbit_io.read_partition(tmp_path / "concurrent" / "raw/social", f"2024-11-{day}")
+            assert len(orbit_io.partition_files(tmp_path / "concurrent" / partition)) == 1
+            columns = ["id", "subreddit", "title", "body"]
+            pd.testing.assert_frame_equal(result[columns], expected[columns])
+            assert len(result) == 4  # 3 per-subreddit posts + first "shared" copy
+
+    def test_compaction_error_does_not_mask_fetch_error(self, tmp_path, monkeypatch):
+        """Test a failing compaction in cleanup leaves the original exception visible."""
+        monkeypatch.chdir(tmp_path)
+        calls = []
+
+        def fetch(subreddit, date, **kwargs):
+            calls.append(date)
+            if len(calls) > 1:
+                raise ConnectionError("arctic shift down")
+            return self._fake_fetch(subreddit, date)
+
+        def failing_compact(self):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(social_arctic, "fetch_posts_for_day", fetch)
+        monkeypatch.setattr(social_arctic.PartitionWriter, "compact", failing_compact)
+
+        with pytest.raises(ConnectionError, match="arctic shift down"):
+            social_arctic.backfill_social(
+                "2024-11-04", "2024-11-05", ["stocks"], data_dir=tmp_path, reset=True,
+            )
+
+        assert list((tmp_path / "raw/social/date=2024-11-04").glob("part-*.parquet"))
+
+    def test_fetch_uses_session_and_limiter(self):
+        """Test fetch_posts_for_day takes one limiter token per page via the session."""
+        session = Mock()
+        response = Mock()
+        response.json.return_value = {"data": []}
+        response.raise_for_status = Mock()
+        session.get.return_value = response
+        limiter = Mock()
+
+        social_arctic.fetch_posts_for_day("stocks", datetime(2024, 11, 5), session=session, limiter=limiter)
+
+        session.get.assert_called_once()
+        limiter.acquire.assert_called_once()
+
+
 class TestCheckpointOperations:
     """Tests for checkpoint save/load operations."""
 
@@ -0,0 +1,149 @@
+"""Unit tests for orbit.ingest.social_dump module.
+
+Tests offline Reddit dump ingestion using small .jsonl dump files.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from orbit import io as orbit_io
+from orbit.ingest import social_dump
+
+
+def _post(post_id, created_utc, title, subreddit="stocks", selftext=""):
+    return {
+        "id": post_id,
+        "created_utc": created_utc,
+        "subreddit": subreddit,
+        "author": "someone",
+        "title": title,
+        "selftext": selftext,
+        "score": 1,
+        "num_comments": 0,
+        "permalink": f"/r/{subreddit}/comments/{post_id}",
+    }
+
+
+def _write_dump(path, posts):
+    path.write_text("".join(json.dumps(p) + "\n" for p in posts))
+    return path
+
+
+# 2024-01-02 15:00 UTC and 2024-01-03 15:00 UTC
+DAY_1 = 1704207600
+DAY_2 = 1704294000
+
+
+class TestFindDumpFiles:
+    """Tests for find_dump_files function."""
+
+    def test_expands_directories(self, tmp_path):
+        """Test directories are searched recursively for dump extensions."""
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "RS_2024-01.zst").touch()
+        (tmp_path / "RS_2024-02.jsonl").touch()
+        (tmp_path / "notes.txt").touch()
+
+        files = social_dump.find_dump_files([tmp_path])
+
+        assert sorted(f.name for f in files) == ["RS_2024-01.zst", "RS_2024-02.jsonl"]
+
+
+class TestIngestSocialDumps:
+    """Tests for ingest_social_dumps function."""
+
+    def test_partitions_filters_and_dedupes(self, tmp_path):
+        """Test posts land in date partitions, filtered and deduplicated across files."""
+        dumps = tmp_path / "dumps"
+        dumps.mkdir()
+        _write_dump(dumps / "a.jsonl", [
+            _post("p1", DAY_1, "SPY calls printing"),
+            _post("p2", DAY_1, "New spy camera review"),  # Off-topic
+            _post("p3", DAY_1, "SPY puts", subreddit="pics"),  # Other subreddit
+            _post("p4", str(DAY_2), "VOO or VTI?", subreddit="Investing"),
+        ])
+        _write_dump(dumps / "b.jsonl", [
+            _post("p1", DAY_1, "SPY calls printing"),  # Duplicate across files
+            _post("p5", DAY_2, "Market is up", selftext="[removed]"),
+        ])
+
+        data_dir = tmp_path / "data"
+        stats = social_dump.ingest_social_dumps([dumps], data_dir=data_dir, workers=2)
+
+        day_1 = orbit_io.read_partition(data_dir / "raw/social", "2024-01-02")
+        day_2 = orbit_io.read_partition(data_dir / "raw/social", "2024-01-03")
+
+        assert stats["files"] == 2
+        assert stats["records_read"] == 6
+        assert stats["partitions_written"] == 2
+        assert day_1["id"].tolist() == ["p1"]
+        assert sorted(day_2["id"]) == ["p4", "p5"]
+        assert day_2.set_index("id").loc["p5", "body"] is None
+        assert not (data_dir / "staging" / "social_dump" / stats["run_id"]).exists()
+
+    def test_date_range_and_existing_rows(self, tmp_path):
+        """Test date filtering and that existing partition rows are kept."""
+        existing_path = tmp_path / "raw/social/date=2024-01-02/social.parquet"
+        existing_path.parent.mkdir(parents=True)
+        pd.DataFrame({
+            "id": ["p0"],
+            "created_utc": pd.to_datetime([DAY_1 - 60], unit="s", utc=True),
+            "title": ["Earlier SPY post"],
+        }).to_parquet(existing_path, index=False)
+
+        dump = _write_dump(tmp_path / "dump.jsonl", [
+            _post("p1", DAY_1, "SPY calls printing"),
+            _post("p2", DAY_2, "SPY again tomorrow"),
+        ])
+
+        social_dump.ingest_social_dumps(
+            [dump], data_dir=tmp_path, start_date="2024-01-02", end_date="2024-01-02", workers=1,
+        )
+
+        day_1 = orbit_io.read_partition(tmp_path / "raw/social", "2024-01-02")
+        assert day_1["id"].tolist() == ["p0", "p1"]
+        assert pd.read_parquet(existing_path)["id"].tolist() == ["p0"]  # Not rewritten
+        assert not (tmp_path / "raw/social/date=2024-01-03").exists()
+
+    def test_dedupes_against_backfill_part_files(self, tmp_path):
+        """Test posts already in API backfill part files are not appended again."""
+        orbit_io.append_partition(pd.DataFrame({
+            "id": ["p1"],
+            "created_utc": pd.to_datetime([DAY_1], unit="s", utc=True),
+            "title": ["SPY calls printing (backfill)"],
+        }), tmp_path / "raw/social", "2024-01-02", run_id="api")
+
+        dump = _write_dump(tmp_path / "dump.jsonl", [
+            _post("p1", DAY_1, "SPY calls printing"),
+            _post("p2", DAY_1 + 60, "SPY puts"),
+        ])
+        social_dump.ingest_social_dumps([dump], data_dir=tmp_path, workers=1)
+
+        day_1 = orbit_io.read_partition(tmp_path / "raw/social", "2024-01-02")
+        assert sorted(day_1["id"]) == ["p1", "p2"]
+        assert day_1.set_index("id").loc["p1", "title"] == "SPY calls printing (backfill)"
+        assert not list((tmp_path / "raw/social/date=2024-01-02").glob(".*"))
+
+    def test_reingest_counts_no_partitions(self, tmp_path):
+        """Test partitions whose posts are all present already are not counted as written."""
+        dump = _write_dump(tmp_path / "dump.jsonl", [
+            _post("p1", DAY_1, "SPY calls printing"),
+            _post("p2", DAY_2, "SPY again tomorrow"),
+        ])
+
+        first = social_dump.ingest_social_dumps([dump], data_dir=tmp_path, workers=1)
+        second = social_dump.ingest_social_dumps([dump], data_dir=tmp_path, workers=1)
+
+        assert first["partitions_written"] == 2
+        assert second["partitions_written"] == 0
+
+    def test_no_dump_files(self, tmp_path):
+        """Test a clear error when no dump files are found."""
+        with pytest.raises(ValueError, match="No dump files"):
+            social_dump.ingest_social_dumps([tmp_path], data_dir=tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -131,6 +131,193 @@ class TestReadWriteParquet:
         pd.testing.assert_frame_equal(df, df_read)
 
 
+class TestPartitions:
+    """Tests for append_partition and read_partition functions."""
+
+    def test_append_never_collides(self, tmp_path, monkeypatch):
+        """Test repeated appends to one day write numbered part files."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+
+        first = io.append_partition(pd.DataFrame({"msg_id": ["a", "b"]}), "raw/news", "2024-11-05", run_id="r1")
+        second = io.append_partition(pd.DataFrame({"msg_id": ["c"]}), "raw/news", "2024-11-05", run_id="r1")
+
+        assert first.name == "part-r1-00000.parquet"
+        assert second.name == "part-r1-00001.parquet"
+        assert io.append_partition(pd.DataFrame(), "raw/news", "2024-11-05") is None
+        # No temp files left behind
+        assert sorted(p.name for p in first.parent.iterdir()) == [first.name, second.name]
+
+    def test_append_continues_numbering_of_existing_parts(self, tmp_path):
+        """Test a new writer with the same run_id does not overwrite earlier parts."""
+        dataset = tmp_path / "raw/news"
+        partition = dataset / "date=2024-11-05"
+        partition.mkdir(parents=True)
+        pd.DataFrame({"msg_id": ["a"]}).to_parquet(partition / "part-r2-00003.parquet")
+
+        path = io.append_partition(pd.DataFrame({"msg_id": ["b"]}), dataset, "2024-11-05", run_id="r2")
+
+        assert path.name == "part-r2-00004.parquet"
+
+    def test_writers_sharing_run_id_never_overwrite(self, tmp_path, monkeypatch):
+        """Test a second process with the same run_id skips part numbers already taken."""
+        dataset = tmp_path / "raw/news"
+        first = io.append_partition(pd.DataFrame({"msg_id": ["a"]}), dataset, "2024-11-05", run_id="r4")
+        # Another process: its own counters start from a listing taken before our write landed
+        monkeypatch.setattr(io, "_PART_COUNTERS", {(str(first.parent), "r4"): 0})
+
+        second = io.append_partition(pd.DataFrame({"msg_id": ["b"]}), dataset, "2024-11-05", run_id="r4")
+
+        assert first.name == "part-r4-00000.parquet"
+        assert second.name == "part-r4-00001.parquet"
+        assert sorted(io.read_partition(dataset, "2024-11-05")["msg_id"]) == ["a", "b"]
+        assert not list(first.parent.glob(".*.tmp"))
+
+    def test_read_partition_dedupes_across_files(self, tmp_path):
+        """Test read_partition combines canonical and part files, first copy wins."""
+        dataset = tmp_path / "raw/news"
+        partition = dataset / "date=2024-11-05"
+        partition.mkdir(parents=True)
+        pd.DataFrame({"msg_id": ["a", "b"], "v": [1, 2]}).to_parquet(partition / "news.parquet")
+        io.append_partition(pd.DataFrame({"msg_id": ["b", "c"], "v": [20, 3]}), dataset, "2024-11-05", run_id="r3")
+
+        df = io.read_partition(dataset, "2024-11-05", id_column="msg_id")
+
+        assert df["msg_id"].tolist() == ["a", "b", "c"]
+        assert df["v"].tolist() == [1, 2, 3]
+        assert io.read_partition(dataset, "2024-11-06").empty
+
+
+class TestScan:
+    """Tests for the dataset-level scan function."""
+
+    @staticmethod
+    def _write_days(dataset):
+        for day in (4, 5, 6):
+            date = f"2024-11-{day:02d}"
+            io.append_partition(
+                pd.DataFrame({"msg_id": [f"{day}a", f"{day}b"], "score": [day, day * 10]}),
+                dataset, date, run_id="r1",
+            )
+
+    def test_prunes_partitions_and_projects_columns(self, tmp_path):
+        """Test only partitions in range are read, with the date exposed as a column."""
+        dataset = tmp_path / "raw/news"
+        self._write_days(dataset)
+        (dataset / "date=2024-11-05" / "_SUCCESS.parquet").write_text("not parquet")
+
+        df = io.scan(dataset, "2024-11-05", "2024-11-06", columns=["date", "msg_id"])
+
+        assert list(df.columns) == ["date", "msg_id"]
+        assert df["date"].tolist() == ["2024-11-05", "2024-11-05", "2024-11-06", "2024-11-06"]
+        assert io.partition_dates(dataset, start="2024-11-06") == ["2024-11-06"]
+
+    def test_filters_and_batches(self, tmp_path):
+        """Test pushed-down filters and record batch output."""
+        dataset = tmp_path / "raw/news"
+        self._write_days(dataset)
+
+        df = io.scan(dataset, filters=[("score", ">", 40)])
+        batches = list(io.scan(dataset, "2024-11-04", "2024-11-04", batches=True))
+
+        assert sorted(df["msg_id"]) == ["5b", "6b"]
+        assert sum(b.num_rows for b in batches) == 2
+        assert list(io.scan(dataset, "2025-01-01", batches=True)) == []
+        assert io.scan(dataset, "2025-01-01").empty
+
+    def test_id_dedupe_matches_read_partition(self, tmp_path):
+        """Test id_column dedupe keeps the same copy as read_partition."""
+        dataset = tmp_path / "raw/news"
+        partition = dataset / "date=2024-11-05"
+        partition.mkdir(parents=True)
+        pd.DataFrame({"msg_id": ["a", "b"], "v": [1, 2]}).to_parquet(partition / "news.parquet", index=False)
+        io.append_partition(pd.DataFrame({"msg_id": ["b", "c"], "v": [20, 3]}), dataset, "2024-11-05", run_id="r1")
+
+        df = io.scan(dataset, id_column="msg_id", columns=["msg_id", "v"])
+
+        expected = io.read_partition(dataset, "2024-11-05", id_column="msg_id")
+        pd.testing.assert_frame_equal(df, expected)
+        with pytest.raises(ValueError, match="DataFrame output"):
+            io.scan(dataset, id_column="msg_id", batches=True)
+
+    def test_all_null_part_then_populated_part(self, tmp_path, monkeypatch):
+        """Test a column that is all-null in the first part takes its type from later parts."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+        io.append_partition(pd.DataFrame({"msg_id": ["a"], "summary": [None]}), "curated/news", "2024-11-05", run_id="r1")
+        io.append_partition(pd.DataFrame({"msg_id": ["b"], "summary": ["x"]}), "curated/news", "2024-11-05", run_id="r1")
+        io.append_partition(pd.DataFrame({"msg_id": ["c"], "summary": ["y"]}), "curated/news", "2024-11-06", run_id="r1")
+
+        df = io.scan("curated/news", columns=["msg_id", "summary"])
+        cached = io.scan("curated/news", columns=["msg_id", "summary"], cache=True)
+
+        assert df["msg_id"].tolist() == ["a", "b", "c"]
+        assert df["summary"].tolist() == [None, "x", "y"]
+        pd.testing.assert_frame_equal(cached, df)
+        assert len(io.read_partition("curated/news", "2024-11-05")) == 2
+
+
+class TestPartitionCache:
+    """Tests for the Arrow IPC partition cache."""
+
+    def test_cached_reads_match_and_invalidate(self, tmp_path, monkeypatch):
+        """Test cached reads equal Parquet reads and pick up new part files."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+        io.append_partition(pd.DataFrame({"msg_id": ["a", "b"], "v": [1, 2]}), "curated/news", "2024-11-05", run_id="r1")
+
+        first = io.read_partition("curated/news", "2024-11-05", cache=True)
+        cache_file = tmp_path / "cache/curated/news/date=2024-11-05.arrow"
+        assert cache_file.exists()
+        pd.testing.assert_frame_equal(first, io.read_partition("curated/news", "2024-11-05"))
+
+        io.append_partition(pd.DataFrame({"msg_id": ["b", "c"], "v": [20, 3]}), "curated/news", "2024-11-05", run_id="r1")
+        df = io.read_partition("curated/news", "2024-11-05", id_column="msg_id", cache=True)
+
+        assert df["v"].tolist() == [1, 2, 3]
+        assert io.read_cached_partition("curated/news", "2024-11-06") is None
+
+    def test_cache_hit_is_memory_mapped(self, tmp_path, monkeypatch):
+        """Test a second read serves the table from the cache file without Parquet reads."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+        io.append_partition(pd.DataFrame({"msg_id": ["a"], "v": [1]}), "curated/news", "2024-11-05", run_id="r1")
+        io.read_cached_partition("curated/news", "2024-11-05")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Parquet read on cache hit")
+
+        monkeypatch.setattr(io.pd, "read_parquet", fail)
+        table = io.read_cached_partition("curated/news", "2024-11-05")
+
+        assert table.column("msg_id").to_pylist() == ["a"]
+        assert io.clear_cache("curated/news") == 1
+
+    def test_failed_cache_write_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        """Test a cache write that raises removes its temp file and no entry appears."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+        io.append_partition(pd.DataFrame({"msg_id": ["a"], "v": [1]}), "curated/news", "2024-11-05", run_id="r1")
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(io.pa.ipc, "new_file", fail)
+        with pytest.raises(OSError, match="disk full"):
+            io.read_cached_partition("curated/news", "2024-11-05")
+
+        cache_root = tmp_path / "cache"
+        assert not list(cache_root.rglob("*.tmp"))
+        assert not list(cache_root.rglob("*.arrow"))
+
+    def test_scan_from_cache(self, tmp_path, monkeypatch):
+        """Test cached scans match Parquet scans, including schema drift between days."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+        io.append_partition(pd.DataFrame({"msg_id": ["a"], "v": [1]}), "curated/news", "2024-11-04", run_id="r1")
+        io.append_partition(pd.DataFrame({"msg_id": ["b"], "v": [2], "extra": ["x"]}), "curated/news", "2024-11-05", run_id="r1")
+
+        expected = io.scan("curated/news", filters=[("v", ">=", 1)])
+        result = io.scan("curated/news", filters=[("v", ">=", 1)], cache=True)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert list(result.columns) == ["msg_id", "v", "date"]
+
+
 class TestValidateSchema:
     """Tests for validate_schema function."""
 
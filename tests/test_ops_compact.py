@@ -0,0 +1,208 @@
+"""Unit tests for orbit.ops.compact module.
+
+Tests merging of small part files into sorted, deduplicated partition files.
+"""
+
+import os
+import threading
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from orbit import io as orbit_io
+from orbit.ops import compact
+
+
+def _news(ids, minutes, headline="SPY rallies"):
+    return pd.DataFrame({
+        "msg_id": ids,
+        "published_at": pd.Timestamp("2024-11-05 14:00", tz="UTC") + pd.to_timedelta(minutes, unit="m"),
+        "headline": [f"{headline} {i}" for i in ids],
+    })
+
+
+class TestCompactPartition:
+    """Tests for compact_partition function."""
+
+    def test_merges_sorts_and_dedupes(self, tmp_path):
+        """Test part files become one sorted file with the first copy of each id."""
+        dataset = tmp_path / "raw/news"
+        orbit_io.append_partition(_news([3, 1], [30, 10]), dataset, "2024-11-05", run_id="ws")
+        orbit_io.append_partition(_news([2, 1], [20, 10], headline="dupe"), dataset, "2024-11-05", run_id="ws")
+        partition = dataset / "date=2024-11-05"
+
+        result = compact.compact_partition(partition, id_column="msg_id", sort_column="published_at")
+
+        assert result == {"files_in": 2, "files_out": 1, "rows_in": 4, "rows_out": 3}
+        assert [p.name for p in orbit_io.partition_files(partition)] == ["news-g000001-00000.parquet"]
+        df = pd.read_parquet(partition / "news-g000001-00000.parquet")
+        assert df["msg_id"].tolist() == [1, 2, 3]
+        assert df.set_index("msg_id").loc[1, "headline"] == "SPY rallies 1"
+
+    def test_concurrent_compactors_use_distinct_temp_files(self, tmp_path, monkeypatch):
+        """Test temp file names are unique per writer and never left behind."""
+        dataset = tmp_path / "raw/news"
+        orbit_io.append_partition(_news([1], [10]), dataset, "2024-11-05", run_id="ws")
+        orbit_io.append_partition(_news([2], [20]), dataset, "2024-11-05", run_id="ws")
+        partition = dataset / "date=2024-11-05"
+        tmp_names = []
+        write_table = pq.write_table
+
+        def recording_write_table(table, where, **kwargs):
+            tmp_names.append((threading.get_ident(), os.path.basename(where)))
+            return write_table(table, where, **kwargs)
+
+        monkeypatch.setattr(compact.pq, "write_table", recording_write_table)
+        errors = []
+
+        def run():
+            try:
+                compact.compact_partition(partition, "msg_id", min_files=1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert tmp_names
+        assert all(name.endswith(f".{os.getpid()}-{ident}.tmp") for ident, name in tmp_names)
+        assert not list(partition.glob(".*.tmp"))
+        assert sorted(orbit_io.read_partition(dataset, "2024-11-05", id_column="msg_id")["msg_id"]) == [1, 2]
+
+    def test_interleaved_compactors_lose_no_rows(self, tmp_path, monkeypatch):
+        """Test a compactor started mid-swap waits and keeps rows appended meanwhile."""
+        dataset = tmp_path / "raw/news"
+        orbit_io.append_partition(_news([1], [10]), dataset, "2024-11-05", run_id="a")
+        orbit_io.append_partition(_news([2], [20]), dataset, "2024-11-05", run_id="a")
+        partition = dataset / "date=2024-11-05"
+        write_table = pq.write_table
+        second = {}
+
+        def interleaving_write_table(table, where, **kwargs):
+            if not second:
+                # First compactor has read its inputs: append a part and start another compactor
+                second["started"] = True
+                orbit_io.append_partition(_news([3], [30]), dataset, "2024-11-05", run_id="b")
+                second["thread"] = threading.Thread(
+                    target=lambda: second.setdefault(
+                        "result", compact.compact_partition(partition, "msg_id", min_files=1)
+                    )
+                )
+                second["thread"].start()
+                second["thread"].join(timeout=0.2)
+                second["blocked"] = second["thread"].is_alive()
+            return write_table(table, where, **kwargs)
+
+        monkeypatch.setattr(compact.pq, "write_table", interleaving_write_table)
+
+        first = compact.compact_partition(partition, "msg_id", min_files=1)
+        second["thread"].join()
+
+        assert second["blocked"]
+        assert first["rows_out"] == 2
+        assert second["result"]["rows_out"] == 3
+        assert sorted(orbit_io.read_partition(dataset, "2024-11-05", id_column="msg_id")["msg_id"]) == [1, 2, 3]
+        assert [p.name for p in orbit_io.partition_files(partition)] == ["news-g000002-00000.parquet"]
+
+    def test_splits_by_target_size(self, tmp_path):
+        """Test output is split into size-targeted files with bounded row groups."""
+        dataset = tmp_path / "raw/news"
+        for start in range(0, 400, 100):
+            ids = list(range(start, start + 100))
+            orbit_io.append_partition(_news(ids, ids), dataset, "2024-11-05", run_id="ws")
+        partition = dataset / "date=2024-11-05"
+        input_mb = sum(p.stat().st_size for p in partition.iterdir()) / 1024 / 1024
+
+        result = compact.compact_partition(
+            partition, id_column="msg_id", sort_column="published_at",
+            target_file_mb=input_mb / 2, row_group_rows=50,
+        )
+
+        names = [p.name for p in orbit_io.partition_files(partition)]
+        assert result["files_out"] == 2
+        assert names == ["news-g000001-00000.parquet", "news-g000001-00001.parquet"]
+        assert pq.ParquetFile(partition / "news-g000001-00000.parquet").metadata.row_group(0).num_rows == 50
+        df = orbit_io.read_partition(dataset, "2024-11-05", id_column="msg_id")
+        assert sorted(df["msg_id"]) == list(range(400))
+
+    def test_failed_output_write_loses_no_rows(self, tmp_path, monkeypatch):
+        """Test a failure writing the second output leaves every input row readable."""
+        dataset = tmp_path / "raw/news"
+        partition = dataset / "date=2024-11-05"
+        partition.mkdir(parents=True)
+        ids = list(range(1000))
+        _news(ids, ids).to_parquet(partition / "news.parquet", index=False)
+        orbit_io.append_partition(_news([1000], [1000]), dataset, "2024-11-05", run_id="ws")
+        before = orbit_io.partition_files(partition)
+        write_table = pq.write_table
+        calls = []
+
+        def failing_write_table(table, where, **kwargs):
+            calls.append(where)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            return write_table(table, where, **kwargs)
+
+        monkeypatch.setattr(compact.pq, "write_table", failing_write_table)
+
+        with pytest.raises(OSError, match="disk full"):
+            compact.compact_partition(partition, "msg_id", target_file_mb=0.01)
+
+        assert orbit_io.partition_files(partition) == before
+        assert not list(partition.glob(".*.tmp"))
+        df = orbit_io.read_partition(dataset, "2024-11-05", id_column="msg_id")
+        assert sorted(df["msg_id"]) == list(range(1001))
+
+    def test_recompaction_never_overwrites_inputs(self, tmp_path):
+        """Test a second pass publishes a new generation and drops the old one."""
+        dataset = tmp_path / "raw/news"
+        partition = dataset / "date=2024-11-05"
+        orbit_io.append_partition(_news([1], [10]), dataset, "2024-11-05", run_id="ws")
+        orbit_io.append_partition(_news([2], [20]), dataset, "2024-11-05", run_id="ws")
+        compact.compact_partition(partition, "msg_id")
+        orbit_io.append_partition(_news([3], [30]), dataset, "2024-11-05", run_id="ws")
+
+        compact.compact_partition(partition, "msg_id")
+
+        assert [p.name for p in orbit_io.partition_files(partition)] == ["news-g000002-00000.parquet"]
+        assert sorted(orbit_io.read_partition(dataset, "2024-11-05")["msg_id"]) == [1, 2, 3]
+
+    def test_skips_partitions_below_min_files(self, tmp_path):
+        """Test a partition with a single file is left alone."""
+        dataset = tmp_path / "raw/news"
+        path = orbit_io.append_partition(_news([1], [0]), dataset, "2024-11-05", run_id="ws")
+
+        assert compact.compact_partition(path.parent, id_column="msg_id") is None
+        assert path.exists()
+
+
+class TestCompactDataset:
+    """Tests for compact_dataset function."""
+
+    def test_respects_date_range(self, tmp_path):
+        """Test only partitions inside the date range are compacted."""
+        dataset = tmp_path / "raw/news"
+        for date in ["2024-11-04", "2024-11-05"]:
+            orbit_io.append_partition(_news([1, 2], [0, 1]), dataset, date, run_id="ws")
+            orbit_io.append_partition(_news([2, 3], [1, 2]), dataset, date, run_id="ws")
+
+        stats = compact.compact_dataset("news", start_date="2024-11-05", data_dir=tmp_path)
+
+        assert stats["partitions_compacted"] == 1
+        assert stats["duplicates_dropped"] == 1
+        assert len(orbit_io.partition_files(dataset / "date=2024-11-04")) == 2
+        assert len(orbit_io.partition_files(dataset / "date=2024-11-05")) == 1
+
+    def test_unknown_dataset(self, tmp_path):
+        """Test a clear error for datasets without id/sort keys."""
+        with pytest.raises(ValueError, match="Unknown dataset"):
+            compact.compact_dataset("prices", data_dir=tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,10 +4,12 @@ Tests cutoff enforcement, deduplication, and novelty scoring.
 """
 
 from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
-from orbit.preprocess import cutoffs, dedupe
+from orbit.preprocess import cutoffs, dedupe, novelty_index, pipeline
 
 
 class TestCutoffs:
@@ -104,6 +106,104 @@ class TestCutoffs:
         assert validation['total_items'] == 2
         assert validation['out_of_window'] == 0
 
+    def test_dropped_late_count_only_counts_window_items(self):
+        """Test items after the cutoff are not reported as safety-lag drops."""
+        df = pd.DataFrame({
+            'id': ['a', 'b', 'c'],
+            'published_at': pd.to_datetime([
+                "2024-11-05 19:00:00",  # 14:00 ET, kept
+                "2024-11-05 20:15:00",  # 15:15 ET, dropped by safety lag
+                "2024-11-05 21:00:00",  # 16:00 ET, next day's window
+            ], utc=True),
+        })
+
+        result = cutoffs.apply_cutoff(df, 'published_at', pd.Timestamp("2024-11-05"))
+
+        assert result['id'].tolist() == ['a']
+        assert result['dropped_late_count'].iloc[0] == 1
+
+    def test_assign_cutoff_days_across_dst(self):
+        """Test bucketing uses the DST-correct 15:30 ET cutoff on both sides of a change."""
+        ts = pd.Series(pd.to_datetime([
+            "2024-03-08 20:29:00",  # 15:29 EST Fri -> 03-08
+            "2024-03-08 20:31:00",  # 15:31 EST Fri -> 03-09
+            "2024-03-11 19:29:00",  # 15:29 EDT Mon -> 03-11
+            "2024-03-11 19:31:00",  # 15:31 EDT Mon -> 03-12 (outside range)
+            "2024-03-11 19:10:00",  # 15:10 EDT Mon -> 03-11, inside safety lag
+        ], utc=True))
+
+        buckets = cutoffs.assign_cutoff_days(ts, "2024-03-08", "2024-03-11")
+
+        assert buckets['date_T'].tolist()[:3] == ["2024-03-08", "2024-03-09", "2024-03-11"]
+        assert pd.isna(buckets['date_T'].iloc[3])
+        assert buckets['is_late'].tolist() == [True, False, True, False, True]
+
+    def test_window_calendar_matches_membership_window(self):
+        """Test calendar rows are contiguous and agree with membership_window."""
+        calendar = cutoffs.window_calendar("2024-03-08", "2024-03-12", safety_lag_minutes=30)
+
+        assert len(calendar) == 5
+        assert (calendar['start_utc_ns'][1:] == calendar['end_utc_ns'][:-1]).all()
+        for row in calendar:
+            start, end = cutoffs.membership_window(pd.Timestamp(row['date']))
+            assert start.value == row['start_utc_ns']
+            assert end.value == row['end_utc_ns']
+            assert row['end_utc_ns'] - row['safety_cutoff_utc_ns'] == 30 * 60 * 10**9
+
+    def test_trading_day_calendar(self):
+        """Test weekends and NYSE holidays roll into the next session."""
+        sessions = cutoffs.nyse_sessions("2024-01-01", "2024-12-31")
+        assert len(sessions) == 252
+        assert np.datetime64("2024-03-29") not in sessions  # Good Friday
+        assert np.datetime64("2024-06-19") not in sessions  # Juneteenth
+
+        start, end = cutoffs.membership_window(pd.Timestamp("2024-07-05"), trading_days=True)
+        assert start.strftime("%Y-%m-%d %H:%M") == "2024-07-03 15:30"
+        with pytest.raises(ValueError, match="not an NYSE trading session"):
+            cutoffs.membership_window(pd.Timestamp("2024-07-04"), trading_days=True)
+
+        ts = pd.Series(pd.to_datetime(["2024-11-02 16:00:00", "2024-11-04 19:00:00"], utc=True))
+        buckets = cutoffs.assign_cutoff_days(ts, "2024-11-01", "2024-11-04", trading_days=True)
+        assert buckets['date_T'].tolist() == ["2024-11-04", "2024-11-04"]
+
+    def test_special_closures(self):
+        """Test unscheduled market closures are not sessions and roll into the next one."""
+        sessions = cutoffs.nyse_sessions("2001-09-10", "2001-09-17")
+        assert sessions.tolist() == [np.datetime64("2001-09-10"), np.datetime64("2001-09-17")]
+        assert np.datetime64("2004-06-11") not in cutoffs.nyse_sessions("2004-06-01", "2004-06-30")
+        assert np.datetime64("2007-01-02") not in cutoffs.nyse_sessions("2007-01-01", "2007-01-31")
+
+        start, end = cutoffs.membership_window(pd.Timestamp("2001-09-17"), trading_days=True)
+        assert start.strftime("%Y-%m-%d %H:%M") == "2001-09-10 15:30"
+
+    def test_calendar_before_2001(self):
+        """Test MLK Day closes the market only from 1998, pre-2001 closures, and the supported range."""
+        assert np.datetime64("1997-01-20") in cutoffs.nyse_sessions("1997-01-01", "1997-01-31")
+        assert np.datetime64("1998-01-19") not in cutoffs.nyse_sessions("1998-01-01", "1998-01-31")
+        assert np.datetime64("1985-09-27") not in cutoffs.nyse_sessions("1985-09-01", "1985-09-30")
+        assert np.datetime64("1994-04-27") not in cutoffs.nyse_sessions("1994-04-01", "1994-04-30")
+
+        with pytest.raises(ValueError, match="only supported from 1981"):
+            cutoffs.nyse_sessions("1980-11-01", "1981-01-31")
+
+    def test_slice_date_range_matches_apply_cutoff(self):
+        """Test single-pass slicing returns the same days and rows as per-day apply_cutoff."""
+        rng = np.random.default_rng(7)
+        seconds = rng.integers(1709251200, 1712016000, 2000)  # March 2024 (spans DST start)
+        df = pd.DataFrame({
+            'id': np.arange(len(seconds)),
+            'published_at': pd.to_datetime(seconds, unit='s', utc=True),
+        })
+
+        sliced = cutoffs.slice_date_range(df, 'published_at', "2024-03-02", "2024-03-30")
+
+        assert len(sliced) == 29
+        for date_str, day in sliced.items():
+            expected = cutoffs.apply_cutoff(df, 'published_at', pd.Timestamp(date_str))
+            assert day['id'].tolist() == expected['id'].tolist()
+            assert day['dropped_late_count'].iloc[0] == expected['dropped_late_count'].iloc[0]
+            assert (day['window_end_et'] == expected['window_end_et']).all()
+
 
 class TestDedupe:
     """Tests for deduplication."""
@@ -135,6 +235,39 @@ class TestDedupe:
 
         assert hash1 != hash2
 
+    def test_compute_simhash_batch_sha256_matches_scalar(self):
+        """Test that sha256 mode reproduces compute_simhash bit-for-bit."""
+        texts = [
+            "the quick brown fox",
+            "spy rallies 2% after cpi print",
+            "ab",  # Shorter than one 3-gram
+            "",
+            "émojis 🚀🚀 and accents",
+        ]
+
+        hashes = dedupe.compute_simhash_batch(texts, hash_mode="sha256", chunk_tokens=8)
+
+        assert hashes.dtype == np.uint64
+        assert [int(h) for h in hashes] == [dedupe.compute_simhash(t) for t in texts]
+
+    def test_compute_simhash_batch_fast_mode(self):
+        """Test fast mode is deterministic, chunk-independent and separates texts."""
+        texts = ["the quick brown fox", "the quick brown fox", "completely different", ""]
+
+        hashes = dedupe.compute_simhash_batch(texts)
+        chunked = dedupe.compute_simhash_batch(texts, chunk_tokens=1)
+
+        assert hashes.dtype == np.uint64
+        assert np.array_equal(hashes, chunked)
+        assert hashes[0] == hashes[1]
+        assert hashes[0] != hashes[2]
+        assert hashes[3] == 0
+
+    def test_compute_simhash_batch_invalid_mode(self):
+        """Test that unknown hash modes are rejected."""
+        with pytest.raises(ValueError, match="Unknown hash_mode"):
+            dedupe.compute_simhash_batch(["text"], hash_mode="md5")
+
     def test_hamming_distance(self):
         """Test Hamming distance calculation."""
         hash1 = 0b1010
@@ -143,6 +276,49 @@ class TestDedupe:
         distance = dedupe.hamming_distance(hash1, hash2)
         assert distance == 1  # Only one bit differs
 
+    def test_popcount64_matches_scalar(self):
+        """Test vectorized popcount against bin().count on edge values."""
+        values = np.array([0, 1, 0b1011, 2**63, 2**64 - 1, 0x5555555555555555], dtype=np.uint64)
+
+        counts = dedupe.popcount64(values.reshape(2, 3))
+
+        assert counts.shape == (2, 3)
+        assert counts.ravel().tolist() == [bin(int(v)).count('1') for v in values]
+
+    def test_min_hamming_distance_matches_scalar(self):
+        """Test chunked min-distance kernel against the pairwise scalar loop."""
+        rng = np.random.default_rng(11)
+        hashes = rng.integers(0, 2**63, 37, dtype=np.int64).astype(np.uint64)
+        reference = np.concatenate([hashes[:5] ^ np.uint64(0b101), rng.integers(0, 2**63, 50, dtype=np.int64).astype(np.uint64)])
+
+        distances = dedupe.min_hamming_distance(hashes, reference, chunk_cells=16)
+
+        expected = [
+            min(dedupe.hamming_distance(int(h), int(r)) for r in reference)
+            for h in hashes
+        ]
+        assert distances.tolist() == expected
+        assert dedupe.min_hamming_distance(hashes, np.array([], dtype=np.uint64)).tolist() == [64] * 37
+
+    def test_min_hamming_distance_tiles_stay_square(self, monkeypatch):
+        """Test a batch larger than chunk_cells still compares many reference columns per tile."""
+        rng = np.random.default_rng(12)
+        hashes = rng.integers(0, 2**63, 300, dtype=np.int64).astype(np.uint64)
+        reference = rng.integers(0, 2**63, 200, dtype=np.int64).astype(np.uint64)
+        shapes = []
+        popcount64 = dedupe.popcount64
+
+        def recording_popcount64(x):
+            shapes.append(x.shape)
+            return popcount64(x)
+
+        monkeypatch.setattr(dedupe, "popcount64", recording_popcount64)
+        distances = dedupe.min_hamming_distance(hashes, reference, chunk_cells=256)
+
+        assert shapes[0] == (16, 16)
+        assert all(rows * cols <= 256 and cols > 1 for rows, cols in shapes)
+        assert distances.tolist() == dedupe.min_hamming_distance(hashes, reference).tolist()
+
     def test_find_duplicates(self):
         """Test duplicate detection."""
         texts = [
@@ -160,6 +336,28 @@ class TestDedupe:
         assert (0, 2) not in pairs
         assert (1, 2) not in pairs
 
+    def test_find_duplicate_pairs_matches_bruteforce(self):
+        """Test banded index returns exactly the brute-force pair set."""
+        rng = np.random.default_rng(7)
+        base = rng.integers(0, 2**63, 200, dtype=np.int64).astype(np.uint64)
+        # Plant near-duplicates 0-4 bits away, plus a block of identical empty-text hashes
+        flips = np.zeros(200, dtype=np.uint64)
+        for n_bits in range(4):
+            flips[n_bits::4] |= np.uint64(1) << rng.integers(0, 64, 50).astype(np.uint64)
+        hashes = np.concatenate([base, base ^ flips, np.zeros(4, dtype=np.uint64)])
+
+        for threshold in (0, 3, 12):
+            expected = {
+                (i, j)
+                for i in range(len(hashes))
+                for j in range(i + 1, len(hashes))
+                if dedupe.hamming_distance(int(hashes[i]), int(hashes[j])) <= threshold
+            }
+            pairs = dedupe.find_duplicate_pairs(hashes, threshold=threshold)
+
+            assert len(pairs) == len(expected)
+            assert {(int(i), int(j)) for i, j in pairs} == expected
+
     def test_cluster_duplicates(self):
         """Test clustering of duplicate pairs."""
         pairs = [(0, 1), (1, 2)]  # 0-1 and 1-2 are dupes
@@ -170,6 +368,65 @@ class TestDedupe:
         assert clusters[1] == 0
         assert clusters[2] == 0
 
+    def test_union_find_leader_is_lowest_index(self):
+        """Test union-find components report their lowest member as leader."""
+        uf = dedupe.UnionFind(7)
+        uf.union_pairs(np.array([[5, 6], [3, 6], [4, 1], [1, 2]]))
+        uf.union_pairs(np.empty((0, 2), dtype=np.int64))
+
+        assert uf.leaders().tolist() == [0, 1, 1, 3, 1, 3, 3]
+        assert uf.find(6) == uf.find(5)
+
+    def test_union_pairs_matches_pairwise_union(self):
+        """Test the batched list-based union_pairs builds the same sets as union()."""
+        rng = np.random.default_rng(3)
+        pairs = rng.integers(0, 500, (800, 2))
+        batched, pairwise = dedupe.UnionFind(500), dedupe.UnionFind(500)
+
+        batched.union_pairs(pairs[:400])
+        batched.union_pairs(pairs[400:])
+        for i, j in pairs.tolist():
+            pairwise.union(i, j)
+
+        assert batched.leaders().tolist() == pairwise.leaders().tolist()
+        assert isinstance(batched.parent, list)
+        assert batched.leaders().dtype == np.int64
+
+    def test_add_dedup_fields_non_range_index(self):
+        """Test dedup fields are positional when the index has gaps (e.g. after cutoff)."""
+        df = pd.DataFrame({
+            'id': ['a', 'b', 'c'],
+            'text': ["completely different", "the quick brown fox", "the quick brown fox"],
+        }, index=[10, 4, 7])
+
+        result = dedupe.add_dedup_fields(df, text_column='text')
+
+        assert result['is_dupe'].tolist() == [False, False, True]
+        assert result['cluster_id'].tolist() == ['a', 'b', 'b']
+
+    def test_add_dedup_fields_collapses_exact_hashes(self, monkeypatch):
+        """Test repeated hashes are unioned directly and only distinct hashes are indexed."""
+        texts = ["the quick brown fox"] * 50 + ["completely different"] * 30 + ["the quick brown fox jumps"]
+        df = pd.DataFrame({'id': [f"id{i}" for i in range(len(texts))], 'text': texts})
+        indexed = []
+        iter_pairs = dedupe.iter_duplicate_pairs
+
+        def recording_iter_pairs(hashes, threshold=3):
+            indexed.append(len(hashes))
+            return iter_pairs(hashes, threshold)
+
+        hashes = dedupe.compute_simhash_batch(df['text'].apply(dedupe.prepare_text).tolist())
+        expected = dedupe.cluster_duplicates(
+            dedupe.find_duplicate_pairs(hashes, threshold=10).tolist(), len(df)
+        )
+
+        monkeypatch.setattr(dedupe, "iter_duplicate_pairs", recording_iter_pairs)
+        result = dedupe.add_dedup_fields(df, text_column='text', threshold=10)
+
+        assert indexed == [len(np.unique(hashes))]
+        assert result['cluster_id'].tolist() == [f"id{expected[i]}" for i in range(len(df))]
+        assert result['is_dupe'].sum() == len(df) - len(set(expected.values()))
+
     def test_add_dedup_fields(self):
         """Test adding dedup fields to dataframe."""
         df = pd.DataFrame({
@@ -255,6 +512,172 @@ class TestDedupe:
         assert pd.notna(result.loc[2, 'novelty'])
 
 
+class TestNoveltyIndex:
+    """Tests for the rolling simhash reference window."""
+
+    @staticmethod
+    def _write_raw_news(data_dir, date, headlines):
+        """Write a raw news partition with items at 10:00 ET on `date`."""
+        path = data_dir / "raw" / "news" / f"date={date}" / "news.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({
+            'msg_id': [f"{date}-{i}" for i in range(len(headlines))],
+            'headline': headlines,
+            'published_at': pd.to_datetime([f"{date} 15:00:00"] * len(headlines), utc=True),
+        }).to_parquet(path)
+
+    def test_date_range_hashes_each_item_once(self, tmp_path, monkeypatch):
+        """Test curated output carries simhash and prior days are not re-hashed."""
+        dates = ["2024-11-04", "2024-11-05", "2024-11-06"]
+        for date in dates:
+            self._write_raw_news(tmp_path, date, ["market rally continues", f"story for {date}"])
+
+        hashed = []
+        batch = dedupe.compute_simhash_batch
+
+        def counting_batch(texts, *args, **kwargs):
+            hashed.extend(texts)
+            return batch(texts, *args, **kwargs)
+
+        monkeypatch.setattr(dedupe, "compute_simhash_batch", counting_batch)
+
+        pipeline.preprocess_date_range(dates[0], dates[-1], data_dir=tmp_path, sources=['news'])
+
+        assert len(hashed) == 6
+        path = novelty_index.curated_path(tmp_path, "news", dates[-1])
+        metadata = pq.read_schema(path).metadata
+        assert metadata[novelty_index.SIMHASH_MODE_METADATA_KEY] == b"fast"
+
+        curated = pd.read_parquet(path)
+        assert curated['simhash'].dtype == np.uint64
+        # Repeated headline was seen on prior days; the new one was not
+        assert curated['novelty'].iloc[0] == 0.0
+        assert curated['novelty'].iloc[1] > 0
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Test sharded process-pool run writes the same curated output as a sequential run."""
+        dates = [f"2024-11-{day:02d}" for day in range(4, 10)]
+        headlines = ["market rally continues", "fed holds rates steady", "spy hits new high"]
+        for k, date in enumerate(dates):
+            day_headlines = headlines[:1 + k % 3] + [f"story number {k}"]
+            for run in ("sequential", "parallel"):
+                if date != "2024-11-06":  # One empty day inside the range
+                    self._write_raw_news(tmp_path / run, date, day_headlines)
+
+        pipeline.preprocess_date_range(
+            dates[0], dates[-1], data_dir=tmp_path / "sequential", sources=['news'],
+            reference_window_days=2,
+        )
+        stats = pipeline.preprocess_date_range(
+            dates[0], dates[-1], data_dir=tmp_path / "parallel", sources=['news'],
+            reference_window_days=2, workers=3,
+        )
+
+        assert stats['processed_news'] == 5
+        for date in dates:
+            if date == "2024-11-06":
+                continue
+            expected = pd.read_parquet(novelty_index.curated_path(tmp_path / "sequential", "news", date))
+            result = pd.read_parquet(novelty_index.curated_path(tmp_path / "parallel", "news", date))
+            columns = ['msg_id', 'is_dupe', 'cluster_id', 'simhash', 'novelty']
+            pd.testing.assert_frame_equal(result[columns], expected[columns])
+
+    def test_window_rehashes_on_mode_mismatch(self, tmp_path):
+        """Test leader hashes are rebuilt from text when the stored mode differs."""
+        df = pd.DataFrame({'headline': ["spy hits new high", "spy hits new high"], 'is_dupe': [False, True]})
+        df['simhash'] = dedupe.compute_simhash_batch(df['headline'].tolist(), hash_mode="fast")
+        path = novelty_index.curated_path(tmp_path, "news", "2024-11-04")
+        novelty_index.write_curated(df, path, hash_mode="fast")
+
+        window = novelty_index.SimhashWindow(tmp_path, "news", window_days=1, hash_mode="sha256")
+        reference = window.reference_hashes("2024-11-05")
+
+        assert reference.tolist() == [dedupe.compute_simhash("spy hits new high")]
+
+    def test_preload_matches_lazy_reads(self, tmp_path):
+        """Test one-scan preload returns the same leader hashes as per-date reads."""
+        for date, headlines in [("2024-11-03", ["fed holds rates", "fed holds rates"]),
+                                ("2024-11-04", ["spy hits new high"])]:
+            df = pd.DataFrame({'headline': headlines, 'is_dupe': [False] + [True] * (len(headlines) - 1)})
+            df['simhash'] = dedupe.compute_simhash_batch(df['headline'].tolist())
+            novelty_index.write_curated(df, novelty_index.curated_path(tmp_path, "news", date), "fast")
+
+        lazy = novelty_index.SimhashWindow(tmp_path, "news", window_days=3)
+        preloaded = novelty_index.SimhashWindow(tmp_path, "news", window_days=3)
+        preloaded.preload(preloaded.reference_dates("2024-11-05"))
+
+        assert sorted(preloaded._hashes) == ["2024-11-02", "2024-11-03", "2024-11-04"]
+        for date in preloaded.reference_dates("2024-11-05"):
+            assert preloaded.get(date).tolist() == lazy.get(date).tolist()
+        assert len(preloaded.get("2024-11-03")) == 1
+
+
+class TestIncrementalPreprocess:
+    """Tests for manifest-driven incremental preprocessing."""
+
+    DATES = ["2024-11-04", "2024-11-05", "2024-11-06", "2024-11-07", "2024-11-08"]
+
+    def _write_days(self, data_dir):
+        for k, date in enumerate(self.DATES):
+            TestNoveltyIndex._write_raw_news(data_dir, date, ["market rally continues", f"story {k}"])
+
+    def _run(self, data_dir, **kwargs):
+        return pipeline.preprocess_date_range(
+            self.DATES[0], self.DATES[-1], data_dir=data_dir, sources=['news'],
+            reference_window_days=2, incremental=True, **kwargs,
+        )
+
+    def test_second_run_skips_everything(self, tmp_path):
+        """Test an unchanged range is skipped entirely on the next run."""
+        self._write_days(tmp_path)
+
+        first = self._run(tmp_path)
+        second = self._run(tmp_path)
+
+        assert first['skipped_news'] == 0
+        assert first['processed_news'] == 5
+        assert second['skipped_news'] == 5
+        assert second['processed_news'] == 0
+        assert (tmp_path / "state" / "preprocess_manifest.sqlite").exists()
+
+    def test_changed_day_recomputes_window_downstream(self, tmp_path):
+        """Test a changed raw partition recomputes itself and the days that reference it."""
+        self._write_days(tmp_path)
+        self._run(tmp_path)
+
+        TestNoveltyIndex._write_raw_news(tmp_path, "2024-11-05", ["fed holds rates steady"])
+        stats = self._run(tmp_path)
+
+        # 11-05 changed; 11-06 and 11-07 have it in their 2-day window
+        assert stats['processed_news'] == 3
+        assert stats['skipped_news'] == 2
+
+        # Output matches a full recompute
+        full = tmp_path / "full"
+        self._write_days(full)
+        TestNoveltyIndex._write_raw_news(full, "2024-11-05", ["fed holds rates steady"])
+        pipeline.preprocess_date_range(
+            self.DATES[0], self.DATES[-1], data_dir=full, sources=['news'], reference_window_days=2,
+        )
+        for date in self.DATES:
+            expected = pd.read_parquet(novelty_index.curated_path(full, "news", date))
+            result = pd.read_parquet(novelty_index.curated_path(tmp_path, "news", date))
+            pd.testing.assert_frame_equal(
+                result[['msg_id', 'is_dupe', 'novelty']], expected[['msg_id', 'is_dupe', 'novelty']]
+            )
+
+    def test_config_change_and_parallel(self, tmp_path):
+        """Test a config change invalidates all days, also with a process pool."""
+        self._write_days(tmp_path)
+        self._run(tmp_path)
+
+        stats = self._run(tmp_path, safety_lag_minutes=10, workers=2)
+        again = self._run(tmp_path, safety_lag_minutes=10, workers=2)
+
+        assert stats['skipped_news'] == 0
+        assert again['skipped_news'] == 5
+
+
 class TestIntegration:
     """Integration tests for preprocessing pipeline."""
 
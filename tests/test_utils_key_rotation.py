@@ -0,0 +1,250 @@
+"""Unit tests for orbit.utils.key_rotation and orbit.utils.key_usage_store.
+
+Tests rotation, sliding-window RPM/TPM budgets, 429 cooldowns, concurrent
+acquisition and daily usage persisted across managers (processes).
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orbit.utils.key_rotation import KeyRotationManager, RotationStrategy
+from orbit.utils.key_usage_store import KeyUsageStore, key_fingerprint
+
+
+@pytest.fixture
+def test_keys(monkeypatch):
+    """Two fake API keys."""
+    for i in range(1, 6):
+        monkeypatch.delenv(f"TEST_API_KEY_{i}", raising=False)
+    monkeypatch.setenv("TEST_API_KEY_1", "key1")
+    monkeypatch.setenv("TEST_API_KEY_2", "key2")
+
+
+def _manager(**kwargs):
+    return KeyRotationManager(env_prefix="TEST_API_KEY", **kwargs)
+
+
+class TestAcquire:
+    """Tests for KeyRotationManager.acquire."""
+
+    def test_round_robin_and_usage_recorded(self, test_keys):
+        """Test acquire rotates keys and counts the request and its tokens."""
+        manager = _manager()
+
+        names = [manager.acquire(tokens=100).key_name for _ in range(4)]
+
+        assert names == ["TEST_API_KEY_1", "TEST_API_KEY_2"] * 2
+        assert [k.requests_today for k in manager.keys] == [2, 2]
+        assert [k.tokens_today for k in manager.keys] == [200, 200]
+
+    def test_rpm_window(self, test_keys):
+        """Test a key with a full RPM window is skipped until requests age out."""
+        manager = _manager(quota_rpm=2, window_seconds=0.2)
+
+        for _ in range(4):
+            manager.acquire()
+        key, wait = manager.try_acquire()
+
+        assert key is None
+        assert 0 < wait <= 0.2
+        start = time.monotonic()
+        manager.acquire()
+        assert time.monotonic() - start >= 0.15
+
+    def test_tpm_window(self, test_keys):
+        """Test a request is only handed a key whose TPM window has room for it."""
+        manager = _manager(quota_tpm=1000, window_seconds=10)
+
+        assert manager.acquire(tokens=800).key_name == "TEST_API_KEY_1"
+        assert manager.acquire(tokens=800).key_name == "TEST_API_KEY_2"
+        assert manager.acquire(tokens=150).key_name == "TEST_API_KEY_1"
+        key, wait = manager.try_acquire(tokens=300)
+        assert key is None
+        assert wait == pytest.approx(10, abs=0.5)
+
+    def test_oversized_request_runs_on_empty_window(self, test_keys):
+        """Test a request above the whole TPM budget is not blocked forever."""
+        manager = _manager(quota_tpm=1000)
+
+        assert manager.acquire(tokens=5000, timeout=0.1).key_name == "TEST_API_KEY_1"
+
+    def test_cooldown_after_rate_limit(self, test_keys):
+        """Test a key reported as rate limited is not handed out during its cooldown."""
+        manager = _manager()
+
+        manager.report_rate_limited("TEST_API_KEY_1", retry_after=0.2)
+        names = [manager.acquire().key_name for _ in range(3)]
+
+        assert names == ["TEST_API_KEY_2"] * 3
+        time.sleep(0.25)
+        assert "TEST_API_KEY_1" in {manager.acquire().key_name for _ in range(2)}
+
+    def test_daily_quota_exhausted(self, test_keys):
+        """Test acquire raises once every key is out of daily quota."""
+        manager = _manager(quota_rpd=2)  # 95% safety margin: 1 request per key
+
+        manager.acquire()
+        manager.acquire()
+        with pytest.raises(RuntimeError, match="exhausted"):
+            manager.acquire()
+
+    def test_timeout(self, test_keys):
+        """Test acquire gives up when no key frees up within the timeout."""
+        manager = _manager(quota_rpm=1, window_seconds=60)
+        manager.acquire()
+        manager.acquire()
+
+        with pytest.raises(TimeoutError):
+            manager.acquire(timeout=0.05)
+
+    def test_least_used_strategy(self, test_keys):
+        """Test LEAST_USED hands out the key with the fewest requests today."""
+        manager = _manager(strategy=RotationStrategy.LEAST_USED)
+        manager.record_usage("TEST_API_KEY_1", requests=3)
+
+        assert manager.acquire().key_name == "TEST_API_KEY_2"
+
+
+class TestConcurrency:
+    """Tests for concurrent use of KeyRotationManager."""
+
+    def test_threads_respect_rpm(self, test_keys):
+        """Test concurrent threads never exceed a key's RPM window together."""
+        manager = _manager(quota_rpm=3, window_seconds=0.3)
+        grants = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(3):
+                key = manager.acquire()
+                with lock:
+                    grants.append((time.monotonic(), key.key_name))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(grants) == 18
+        assert manager.total_requests == 18
+        for name in ("TEST_API_KEY_1", "TEST_API_KEY_2"):
+            stamps = sorted(t for t, key_name in grants if key_name == name)
+            # Any 4 consecutive grants of one key span at least one window
+            for i in range(len(stamps) - 3):
+                assert stamps[i + 3] - stamps[i] >= 0.3 - 0.02
+
+    def test_acquire_async(self, test_keys):
+        """Test coroutines share the budget and all keys are used."""
+        manager = _manager(quota_rpm=2, window_seconds=0.2)
+
+        async def run():
+            return await asyncio.gather(*(manager.acquire_async() for _ in range(8)))
+
+        start = time.monotonic()
+        keys = asyncio.run(run())
+
+        # 8 requests at 2 keys x 2 per window: the last ones wait one window
+        assert time.monotonic() - start >= 0.18
+        assert {key.key_name for key in keys} == {"TEST_API_KEY_1", "TEST_API_KEY_2"}
+
+
+class TestPersistentUsage:
+    """Tests for daily usage shared through the key usage store."""
+
+    def test_usage_survives_restart(self, test_keys, tmp_path):
+        """Test a new manager starts from the day's persisted counters."""
+        store_path = tmp_path / "key_usage.sqlite"
+        first = _manager(quota_rpd=100, usage_store_path=store_path)
+        for _ in range(3):
+            first.acquire(tokens=10)
+        first.record_usage("TEST_API_KEY_1", requests=0, tokens=5)
+        first.close()
+
+        second = _manager(quota_rpd=100, usage_store_path=store_path)
+
+        assert second.remaining_quota() == {"TEST_API_KEY_1": 93, "TEST_API_KEY_2": 94}
+        stats = {k["key_name"]: k for k in second.get_stats()["keys"]}
+        assert stats["TEST_API_KEY_1"]["tokens_today"] == 25
+
+    def test_daily_quota_shared_between_processes(self, test_keys, tmp_path):
+        """Test concurrent managers together never exceed the daily quota."""
+        store_path = tmp_path / "key_usage.sqlite"
+        managers = [_manager(quota_rpd=22, usage_store_path=store_path) for _ in range(4)]  # 20 per key
+        granted = []
+        lock = threading.Lock()
+
+        def worker(manager):
+            while True:
+                try:
+                    key = manager.acquire()
+                except RuntimeError:
+                    return
+                with lock:
+                    granted.append(key.key_name)
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert granted.count("TEST_API_KEY_1") == 20
+        assert granted.count("TEST_API_KEY_2") == 20
+        assert managers[0].remaining_quota() == {"TEST_API_KEY_1": 0, "TEST_API_KEY_2": 0}
+
+    def test_acquire_async_keeps_store_off_event_loop(self, test_keys, tmp_path):
+        """Test store transactions of acquire_async run outside the event loop thread."""
+        manager = _manager(quota_rpd=100, usage_store_path=tmp_path / "key_usage.sqlite")
+        threads = []
+        try_consume = manager._store.try_consume
+
+        def recording_try_consume(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return try_consume(*args, **kwargs)
+
+        manager._store.try_consume = recording_try_consume
+
+        async def run():
+            loop_thread = threading.get_ident()
+            keys = await asyncio.gather(*(manager.acquire_async() for _ in range(4)))
+            return loop_thread, keys
+
+        loop_thread, keys = asyncio.run(run())
+
+        assert len(keys) == 4
+        assert threads and loop_thread not in threads
+        assert manager.remaining_quota() == {"TEST_API_KEY_1": 93, "TEST_API_KEY_2": 93}
+        manager.close()
+
+    def test_key_value_never_stored(self, test_keys, tmp_path):
+        """Test the store holds key names and fingerprints but not key values."""
+        store_path = tmp_path / "key_usage.sqlite"
+        manager = _manager(usage_store_path=store_path)
+        manager.acquire()
+        manager.close()
+
+        store = KeyUsageStore(store_path)
+        rows = store._conn.execute("SELECT fingerprint, key_name FROM key_usage").fetchall()
+        store.close()
+
+        assert rows == [(key_fingerprint("key1"), "TEST_API_KEY_1")]
+        contents = b"".join(p.read_bytes() for p in tmp_path.iterdir())
+        assert b"key1" not in contents.replace(b"TEST_API_KEY_1", b"")
+
+    def test_default_location(self, test_keys, tmp_path, monkeypatch):
+        """Test persist_usage stores under ORBIT_DATA_DIR/state/."""
+        monkeypatch.setenv("ORBIT_DATA_DIR", str(tmp_path))
+
+        manager = _manager(persist_usage=True)
+        manager.acquire()
+        manager.close()
+
+        assert (tmp_path / "state" / "key_usage.sqlite").exists()
+
+    def test_remaining_quota_without_rpd(self, test_keys):
+        """Test keys without a daily quota report None."""
+        assert _manager().remaining_quota() == {"TEST_API_KEY_1": None, "TEST_API_KEY_2": None}
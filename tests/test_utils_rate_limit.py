@@ -0,0 +1,63 @@
+"""Unit tests for orbit.utils.rate_limit module.
+
+Tests token-bucket pacing, burst capacity and thread safety.
+"""
+
+import threading
+import time
+
+import pytest
+
+from orbit.utils.rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_first_acquire_is_immediate(self):
+        """Test a fresh bucket serves its capacity without waiting."""
+        limiter = TokenBucket(rate=1.0, capacity=2)
+
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(1.0, abs=0.05)
+
+    def test_reservations_queue_in_order(self):
+        """Test successive reservations wait one interval more each."""
+        limiter = TokenBucket(rate=10.0)
+
+        waits = [limiter.reserve() for _ in range(4)]
+
+        assert waits[0] == 0
+        assert waits[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+
+    def test_threads_share_rate(self):
+        """Test concurrent acquirers together stay under the rate."""
+        limiter = TokenBucket(rate=50.0)
+        stamps = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                limiter.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 acquisitions: the first is free, the other 19 need 19 / 50 s
+        assert len(stamps) == 20
+        assert max(stamps) - min(stamps) >= 19 / 50 - 0.02
+
+    def test_invalid_rate(self):
+        """Test non-positive rates are rejected."""
+        with pytest.raises(ValueError, match="rate must be positive"):
+            TokenBucket(rate=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])